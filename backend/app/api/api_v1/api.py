@@ -1,10 +1,13 @@
 from fastapi import APIRouter
-from app.api.api_v1.endpoints import auth, users, surveys, evaluations
+from app.api.api_v1.endpoints import auth, users, departments, surveys, question_bank, evaluations, batch
 
 api_router = APIRouter()
 
 # Incluir todas las rutas de endpoints
 api_router.include_router(auth.router, prefix="/auth", tags=["autenticacion"])
 api_router.include_router(users.router, prefix="/users", tags=["usuarios"])
+api_router.include_router(departments.router, prefix="/departments", tags=["departamentos"])
 api_router.include_router(surveys.router, prefix="/surveys", tags=["encuestas"])
-api_router.include_router(evaluations.router, prefix="/evaluations", tags=["evaluaciones"])
\ No newline at end of file
+api_router.include_router(question_bank.router, prefix="/question-bank", tags=["banco de preguntas"])
+api_router.include_router(evaluations.router, prefix="/evaluations", tags=["evaluaciones"])
+api_router.include_router(batch.router, prefix="/batch", tags=["batch"])
\ No newline at end of file
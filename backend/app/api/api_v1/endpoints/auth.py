@@ -1,49 +1,80 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from datetime import datetime, timedelta
 from typing import Optional
 
 from app.core.config import settings
 from app.core.database import get_db
-from app.core.security import verify_password, get_password_hash, create_access_token
+from app.core.permissions import Permission, Principal, auth_versions, build_claims
+from app.core.security import verify_password, get_password_hash, create_access_token, decode_access_token
 from app.models.user import User
+from app.services.last_login import last_login_buffer
+from app.services.revocations import token_revocations
 from app.schemas.auth import Token, UserResponse
 
 router = APIRouter()
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
-# Dependency para obtener usuario actual
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
+# Dependency para obtener la identidad del token (sin consultar la base)
+async def get_current_principal(
+    request: Request,
+    token: str = Depends(oauth2_scheme)
+) -> Principal:
     """
-    Dependency para obtener el usuario actual desde el JWT token
+    Dependency que valida el JWT y retorna rol, departamento y permisos del token
     """
+    # Dentro de /batch el token ya se validó una vez para todo el lote
+    batch_principal = getattr(request.state, "principal", None)
+    if batch_principal is not None:
+        return batch_principal
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="No se pudieron validar las credenciales",
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    try:
-        from jose import JWTError, jwt
-        
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        user_id: str = payload.get("sub")
-        
-        if user_id is None:
-            raise credentials_exception
-            
-    except JWTError:
+    payload = decode_access_token(token)
+    principal = Principal.from_claims(payload) if payload else None
+    if principal is None:
         raise credentials_exception
     
-    user = db.query(User).filter(User.id == user_id).first()
+    # Un cambio de rol, departamento o estado incrementa la versión del usuario
+    if principal.version < auth_versions.current(principal.id):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Tus permisos cambiaron, inicia sesión nuevamente",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    # Logout o cierre de todas las sesiones (lista en memoria, sin consultar la base)
+    if token_revocations.is_revoked(principal):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="La sesión fue cerrada, inicia sesión nuevamente",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    return principal
+
+# Dependency para obtener usuario actual
+async def get_current_user(
+    principal: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_db)
+) -> User:
+    """
+    Dependency para obtener el usuario actual desde el JWT token
+    """
+    user = db.query(User).filter(User.id == principal.id).first()
     
     if user is None:
-        raise credentials_exception
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="No se pudieron validar las credenciales",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
         
     return user
 
@@ -60,31 +91,37 @@ async def get_current_active_user(
         )
     return current_user
 
+def require_permission(permission: Permission, detail: str):
+    """
+    Dependency que decide solo con los permisos del token; si falla, la
+    petición se rechaza antes de cargar el usuario
+    """
+    async def dependency(principal: Principal = Depends(get_current_principal)) -> Principal:
+        if not principal.has(permission):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
+        return principal
+    return dependency
+
+require_admin = require_permission(Permission.ADMIN, "No tienes permisos de administrador")
+require_coordinator = require_permission(Permission.COORDINATE, "No tienes permisos de coordinador")
+
 # Dependencies para roles específicos
 async def get_current_admin_user(
+    principal: Principal = Depends(require_admin),
     current_user: User = Depends(get_current_active_user)
 ) -> User:
     """
     Dependency que requiere rol de administrador
     """
-    if current_user.role.name != "admin":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes permisos de administrador"
-        )
     return current_user
 
 async def get_current_coordinator_user(
+    principal: Principal = Depends(require_coordinator),
     current_user: User = Depends(get_current_active_user)
 ) -> User:
     """
     Dependency que requiere rol de coordinador o admin
     """
-    if current_user.role.name not in ["admin", "coordinador"]:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes permisos de coordinador"
-        )
     return current_user
 
 # Endpoints
@@ -97,8 +134,10 @@ async def login(
     Endpoint de login con email/password
     Retorna JWT token para autenticación
     """
-    # Buscar usuario por email
-    user = db.query(User).filter(
+    # Buscar usuario por email (departamento en la misma consulta; el rol sale del registro)
+    user = db.query(User).options(
+        joinedload(User.department)
+    ).filter(
         User.email == form_data.username,
         User.is_active == True
     ).first()
@@ -118,14 +157,13 @@ async def login(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Actualizar último login
-    user.last_login = datetime.utcnow()
-    db.commit()
+    # Actualizar último login (se escribe en lote, fuera del camino del login)
+    last_login_buffer.record(user.id, datetime.utcnow())
     
     # Crear token
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": str(user.id), "email": user.email, "role": user.role.name},
+        data=build_claims(user),
         expires_delta=access_token_expires
     )
     
@@ -138,19 +176,44 @@ async def login(
             "email": user.email,
             "first_name": user.first_name,
             "last_name": user.last_name,
-            "role": user.role.name,
+            "role": user.role_name,
             "department": user.department.name if user.department else None
         }
     }
 
 @router.post("/logout")
-async def logout():
+async def logout(
+    db: Session = Depends(get_db),
+    principal: Principal = Depends(get_current_principal)
+):
     """
     Endpoint de logout
-    En JWT no hay invalidación server-side, el cliente debe eliminar el token
+    Revoca el token actual en todos los workers
     """
+    if principal.jti:
+        revocation = token_revocations.revoke_token(db, principal)
+    else:
+        # Token emitido antes de que existiera jti: se revocan todos los del usuario
+        revocation = token_revocations.revoke_user(db, principal.id)
+    db.commit()
+    token_revocations.apply(revocation)
+    
     return {"message": "Logout exitoso"}
 
+@router.post("/logout-all")
+async def logout_all(
+    db: Session = Depends(get_db),
+    principal: Principal = Depends(get_current_principal)
+):
+    """
+    Cerrar todas las sesiones del usuario actual (todos sus tokens emitidos)
+    """
+    revocation = token_revocations.revoke_user(db, principal.id)
+    db.commit()
+    token_revocations.apply(revocation)
+    
+    return {"message": "Todas las sesiones fueron cerradas"}
+
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(
     current_user: User = Depends(get_current_active_user)
@@ -165,10 +228,10 @@ async def get_current_user_info(
         "last_name": current_user.last_name,
         "employee_code": current_user.employee_code,
         "phone": current_user.phone,
-        "role": current_user.role.name,
+        "role": current_user.role_name,
         "department": current_user.department.name if current_user.department else None,
         "is_active": current_user.is_active,
-        "last_login": current_user.last_login,
+        "last_login": last_login_buffer.pending(current_user.id) or current_user.last_login,
         "created_at": current_user.created_at
     }
 
@@ -203,13 +266,13 @@ async def change_password(
     return {"message": "Password actualizado exitosamente"}
 
 @router.get("/verify-token")
-async def verify_token(current_user: User = Depends(get_current_active_user)):
+async def verify_token(principal: Principal = Depends(get_current_principal)):
     """
-    Verificar si el token es válido
+    Verificar si el token es válido (solo con los claims, sin consultar la base)
     """
     return {
         "valid": True,
-        "user_id": str(current_user.id),
-        "email": current_user.email,
-        "role": current_user.role.name
+        "user_id": principal.id,
+        "email": principal.email,
+        "role": principal.role
     }
\ No newline at end of file
@@ -0,0 +1,122 @@
+# backend/app/api/api_v1/endpoints/batch.py
+
+import asyncio
+import json
+from urllib.parse import urlsplit
+
+import anyio
+from fastapi import APIRouter, Depends, Request
+
+from app.core.config import settings
+from app.api.api_v1.endpoints.auth import get_current_principal
+from app.core.permissions import Principal
+from app.schemas.batch import BatchRequest, BatchRequestItem, BatchResponse
+
+router = APIRouter()
+
+# Rutas que no pueden ir dentro de un lote (recursión y streams sin fin)
+EXCLUDED_PATHS = (
+    f"{settings.API_V1_STR}/batch",
+    f"{settings.API_V1_STR}/evaluations/progress/stream",
+)
+
+SUBREQUEST_TIMEOUT = 10  # Segundos por sub-petición
+
+async def run_subrequest(request: Request, item: BatchRequestItem, state: dict) -> dict:
+    """
+    Ejecutar una sub-petición GET a través de la propia aplicación ASGI, sin red.
+    Hereda el token y recibe el principal ya resuelto vía scope["state"].
+    """
+    url = urlsplit(item.path)
+    if url.path.rstrip("/").startswith(EXCLUDED_PATHS):
+        return {"id": item.id, "path": item.path, "status": 400,
+                "body": {"detail": "Esta ruta no se permite dentro de un lote"}}
+
+    headers = [(b"accept", b"application/json")]
+    authorization = request.headers.get("authorization")
+    if authorization:
+        headers.append((b"authorization", authorization.encode("latin-1")))
+
+    scope = {
+        "type": "http",
+        "asgi": request.scope.get("asgi", {"version": "3.0"}),
+        "http_version": request.scope.get("http_version", "1.1"),
+        "method": "GET",
+        "scheme": request.scope.get("scheme", "http"),
+        "server": request.scope.get("server"),
+        "client": request.scope.get("client"),
+        "root_path": request.scope.get("root_path", ""),
+        "path": url.path,
+        "raw_path": url.path.encode("utf-8"),
+        "query_string": url.query.encode("utf-8"),
+        "headers": headers,
+        "state": state,
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    status_code = 500
+    content_type = ""
+    chunks = []
+
+    async def send(message):
+        nonlocal status_code, content_type
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+            for key, value in message.get("headers", []):
+                if key.lower() == b"content-type":
+                    content_type = value.decode("latin-1")
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    try:
+        await asyncio.wait_for(request.app(scope, receive, send), timeout=SUBREQUEST_TIMEOUT)
+    except asyncio.TimeoutError:
+        return {"id": item.id, "path": item.path, "status": 504,
+                "body": {"detail": "La sub-petición excedió el tiempo límite"}}
+    except Exception:
+        return {"id": item.id, "path": item.path, "status": 500,
+                "body": {"detail": "Error interno del servidor"}}
+
+    raw = b"".join(chunks)
+    if content_type.startswith("application/json"):
+        body = json.loads(raw) if raw else None
+    else:
+        body = raw.decode("utf-8", errors="replace")
+
+    return {"id": item.id, "path": item.path, "status": status_code, "body": body}
+
+def run_in_own_loop(request: Request, item: BatchRequestItem, state: dict) -> dict:
+    """
+    Sub-petición en un hilo del threadpool con su propio event loop. Los
+    endpoints hacen consultas síncronas que bloquean el loop: solo en hilos
+    distintos avanzan de verdad en paralelo.
+    """
+    return asyncio.run(run_subrequest(request, item, state))
+
+@router.post("/", response_model=BatchResponse)
+async def batch(
+    batch_data: BatchRequest,
+    request: Request,
+    principal: Principal = Depends(get_current_principal)
+):
+    """
+    Ejecutar varias peticiones GET en una sola llamada (arranque del dashboard).
+
+    El token se valida una sola vez y el principal se comparte con todas las
+    sub-peticiones. Se ejecutan en paralelo, cada una en su hilo y con su propia
+    sesión de base (get_db abre una por sub-petición): un error de base en una
+    no afecta a las demás. A lo sumo DB_POOL_SIZE a la vez, para no agotar el
+    pool de conexiones del worker.
+    """
+    limiter = anyio.CapacityLimiter(settings.DB_POOL_SIZE)
+    base_state = {**request.scope.get("state", {}), "principal": principal}
+
+    # Cada sub-petición recibe su propia copia del state
+    responses = await asyncio.gather(*(
+        anyio.to_thread.run_sync(run_in_own_loop, request, item, dict(base_state), limiter=limiter)
+        for item in batch_data.requests
+    ))
+
+    return {"responses": list(responses)}
@@ -0,0 +1,120 @@
+# backend/app/api/api_v1/endpoints/departments.py
+
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.http_cache import not_modified
+from app.api.api_v1.endpoints.auth import get_current_principal, require_admin
+from app.core.permissions import Principal
+from app.models.user import Department
+from app.schemas.user import DepartmentCreate, DepartmentUpdate, DepartmentSchema
+from app.services.reference_data import reference_data
+
+router = APIRouter()
+
+def check_unique_name(name: str, department_id: int = None):
+    """Nombre único (sin distinguir mayúsculas) contra la caché de referencia"""
+    existing = reference_data.snapshot.departments_by_name.get(name.lower())
+    if existing and existing["id"] != department_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Ya existe un departamento con este nombre"
+        )
+
+@router.get("/", response_model=List[DepartmentSchema])
+async def get_departments(
+    request: Request,
+    response: Response,
+    include_inactive: bool = Query(False, description="Incluir departamentos inactivos (solo admin)"),
+    principal: Principal = Depends(get_current_principal)
+):
+    """
+    Obtener departamentos desde la caché de referencia (sin consultar la base)
+    """
+    snapshot = reference_data.snapshot
+    cached = not_modified(request, response, snapshot.etag)
+    if cached:
+        return cached
+
+    departments = snapshot.departments_by_id.values()
+    if not (include_inactive and principal.is_admin):
+        departments = [dept for dept in departments if dept["is_active"]]
+    return sorted(departments, key=lambda dept: dept["name"])
+
+@router.post("/", response_model=DepartmentSchema)
+async def create_department(
+    department_data: DepartmentCreate,
+    db: Session = Depends(get_db),
+    principal: Principal = Depends(require_admin)
+):
+    """
+    Crear un departamento
+    """
+    check_unique_name(department_data.name)
+
+    department = Department(**department_data.model_dump())
+    db.add(department)
+    reference_data.bump(db)
+    db.commit()
+    db.refresh(department)
+
+    # Este worker recarga de inmediato; los demás al recibir el NOTIFY
+    reference_data.load()
+
+    return department
+
+@router.put("/{department_id}", response_model=DepartmentSchema)
+async def update_department(
+    department_id: int,
+    department_data: DepartmentUpdate,
+    db: Session = Depends(get_db),
+    principal: Principal = Depends(require_admin)
+):
+    """
+    Actualizar un departamento
+    """
+    department = db.query(Department).filter(Department.id == department_id).first()
+    if not department:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Departamento no encontrado"
+        )
+
+    update_data = department_data.model_dump(exclude_unset=True)
+    if update_data.get("name"):
+        check_unique_name(update_data["name"], department_id)
+
+    for field, value in update_data.items():
+        setattr(department, field, value)
+
+    reference_data.bump(db)
+    db.commit()
+    db.refresh(department)
+    reference_data.load()
+
+    return department
+
+@router.delete("/{department_id}")
+async def delete_department(
+    department_id: int,
+    db: Session = Depends(get_db),
+    principal: Principal = Depends(require_admin)
+):
+    """
+    Eliminar un departamento (soft delete - desactivar)
+    """
+    department = db.query(Department).filter(Department.id == department_id).first()
+    if not department:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Departamento no encontrado"
+        )
+
+    department.is_active = False
+    reference_data.bump(db)
+    db.commit()
+    reference_data.load()
+
+    return {"message": "Departamento desactivado exitosamente"}
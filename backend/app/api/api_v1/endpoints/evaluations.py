@@ -1,4 +1,23 @@
-from fastapi import APIRouter
+# backend/app/api/api_v1/endpoints/evaluations.py
+
+import asyncio
+import json
+from datetime import datetime
+from typing import Callable, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.api.api_v1.endpoints.auth import get_current_active_user, require_coordinator
+from app.core.permissions import Principal
+from app.core.scale import SCALE_MAX, SCALE_MIN
+from app.models.user import User, Survey, Question, SurveyAssignment, Evaluation, Answer
+from app.schemas.evaluation import EvaluationSubmit, EvaluationResponse
+from app.services.events import PROGRESS_CHANNEL, event_broker, notify
+from app.services.score_rollups import record_evaluation
+from app.services.survey_versions import ensure_version
 
 router = APIRouter()
 
@@ -8,4 +27,217 @@ async def get_evaluations():
 
 @router.get("/test")
 async def test_evaluations():
-    return {"status": "OK", "endpoint": "evaluations"}
\ No newline at end of file
+    return {"status": "OK", "endpoint": "evaluations"}
+
+def progress_filter(principal: Principal, survey_id: Optional[str], department_id: Optional[int]) -> Callable[[dict], bool]:
+    """
+    Predicado de los eventos que recibe un stream de avance. Un coordinador
+    queda fijo a su departamento aunque sea None (solo evaluados sin
+    departamento), igual que user_view_rule; el admin filtra si lo pide.
+    """
+    scoped = department_id is not None or not principal.is_admin
+    if not principal.is_admin:
+        department_id = principal.department_id
+
+    def matches(event: dict) -> bool:
+        if survey_id and event.get("survey_id") != survey_id:
+            return False
+        return not scoped or event.get("department_id") == department_id
+
+    return matches
+
+@router.get("/progress/stream")
+async def stream_progress(
+    request: Request,
+    survey_id: Optional[str] = Query(None, description="Filtrar por encuesta"),
+    department_id: Optional[int] = Query(None, description="Filtrar por departamento (solo admin)"),
+    principal: Principal = Depends(require_coordinator)
+):
+    """
+    Stream SSE con los incrementos de evaluaciones completadas por departamento
+    y encuesta. Los coordinadores solo reciben los de su departamento.
+    """
+    # Autorización solo con el token: el stream no usa la base en ningún momento
+    matches = progress_filter(principal, survey_id, department_id)
+
+    subscription = event_broker.subscribe(PROGRESS_CHANNEL)
+
+    async def events():
+        try:
+            yield "retry: 5000\n\n"
+            while not subscription.overflowed:
+                try:
+                    event = await asyncio.wait_for(
+                        subscription.queue.get(), timeout=settings.SSE_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keep-alive\n\n"
+                    continue
+                if not matches(event):
+                    continue
+                yield f"event: progress\ndata: {json.dumps(event)}\n\n"
+        finally:
+            event_broker.unsubscribe(PROGRESS_CHANNEL, subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/", response_model=EvaluationResponse)
+async def submit_evaluation(
+    evaluation_data: EvaluationSubmit,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Enviar una evaluación completa (todas las respuestas en una sola petición)
+    """
+    survey = db.query(Survey).filter(Survey.id == evaluation_data.survey_id).first()
+    if not survey or not survey.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Encuesta no encontrada o inactiva"
+        )
+
+    # Determinar a quién se evalúa (por defecto autoevaluación)
+    evaluatee = current_user
+    if evaluation_data.evaluatee_id and evaluation_data.evaluatee_id != str(current_user.id):
+        evaluatee = db.query(User).filter(User.id == evaluation_data.evaluatee_id).first()
+        if not evaluatee:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Usuario evaluado no encontrado"
+            )
+
+    if not current_user.can_evaluate_user(evaluatee):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No tienes permisos para evaluar a este usuario"
+        )
+
+    # Verificar asignación si se proporciona
+    assignment = None
+    if evaluation_data.assignment_id:
+        assignment = db.query(SurveyAssignment).filter(
+            SurveyAssignment.id == evaluation_data.assignment_id,
+            SurveyAssignment.evaluator_id == current_user.id,
+            SurveyAssignment.survey_id == survey.id
+        ).first()
+        if not assignment:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Asignación no encontrada"
+            )
+        if assignment.status == "completed":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Esta asignación ya fue completada"
+            )
+
+    # La evaluación queda ligada a la versión que se responde (se crea si la
+    # encuesta cambió desde el último envío)
+    version_id = ensure_version(db, survey)
+
+    # Validar preguntas contra la encuesta
+    questions = {
+        str(question_id): (question_type, is_required, min_value, max_value)
+        for question_id, question_type, is_required, min_value, max_value in db.query(
+            Question.id, Question.question_type, Question.is_required,
+            Question.min_value, Question.max_value
+        ).filter(Question.survey_id == survey.id)
+    }
+
+    answered = {answer.question_id for answer in evaluation_data.answers}
+    if not answered.issubset(questions):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Hay respuestas a preguntas que no pertenecen a esta encuesta"
+        )
+
+    missing = [qid for qid, (_, is_required, _, _) in questions.items() if is_required and qid not in answered]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Faltan {len(missing)} preguntas obligatorias por responder"
+        )
+
+    # Valores numéricos: solo en preguntas que los admiten y dentro de su rango
+    # (la escala sin límites propios usa 1-10)
+    for answer in evaluation_data.answers:
+        if answer.answer_value is None:
+            continue
+        question_type, _, min_value, max_value = questions[answer.question_id]
+        if question_type == "text":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Las preguntas de texto no admiten respuestas numéricas"
+            )
+        if question_type == "scale":
+            min_value = SCALE_MIN if min_value is None else min_value
+            max_value = SCALE_MAX if max_value is None else max_value
+        if (min_value is not None and answer.answer_value < min_value) or (
+            max_value is not None and answer.answer_value > max_value
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Respuesta fuera del rango permitido en la pregunta {answer.question_id}"
+            )
+
+    # Calificación total: promedio de las respuestas de escala
+    scale_values = [
+        answer.answer_value for answer in evaluation_data.answers
+        if answer.answer_value is not None and questions[answer.question_id][0] == "scale"
+    ]
+    total_score = round(sum(scale_values) / len(scale_values), 2) if scale_values else None
+
+    now = datetime.utcnow()
+    db_evaluation = Evaluation(
+        assignment_id=assignment.id if assignment else None,
+        evaluator_id=current_user.id,
+        evaluatee_id=evaluatee.id,
+        survey_id=survey.id,
+        survey_version_id=version_id,
+        status="completed",
+        started_at=evaluation_data.started_at or now,
+        completed_at=now,
+        total_score=total_score,
+        comments=evaluation_data.comments
+    )
+    db.add(db_evaluation)
+    db.flush()
+
+    db.add_all([
+        Answer(
+            evaluation_id=db_evaluation.id,
+            question_id=answer.question_id,
+            answer_value=answer.answer_value,
+            answer_text=answer.answer_text
+        )
+        for answer in evaluation_data.answers
+    ])
+
+    # Tendencias históricas: se suman en la misma transacción
+    record_evaluation(db, db_evaluation)
+
+    if assignment:
+        assignment.status = "completed"
+        assignment.survey_version_id = assignment.survey_version_id or version_id
+        assignment.started_at = assignment.started_at or db_evaluation.started_at
+        assignment.completed_at = now
+
+    # Avance para los dashboards en vivo; se entrega solo si el commit tiene éxito
+    notify(db, PROGRESS_CHANNEL, {
+        "survey_id": str(survey.id),
+        "department_id": evaluatee.department_id,
+        "assignment_id": str(assignment.id) if assignment else None,
+        "completed": 1,
+    })
+
+    db.commit()
+    db.refresh(db_evaluation)
+
+    return db_evaluation
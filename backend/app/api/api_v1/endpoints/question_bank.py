@@ -0,0 +1,58 @@
+# backend/app/api/api_v1/endpoints/question_bank.py
+
+import re
+from typing import List
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from sqlalchemy import func
+
+from app.core.database import get_db
+from app.api.api_v1.endpoints.auth import require_coordinator
+from app.core.permissions import Principal
+from app.models.user import Question, QuestionBank
+from app.schemas.survey import QuestionBankItem
+
+router = APIRouter()
+
+def prefix_tsquery(search: str):
+    """
+    tsquery en español con cada palabra como prefijo ("domin conten" encuentra
+    "Dominio del contenido"), para buscar mientras se escribe
+    """
+    words = re.findall(r"\w+", search.lower())
+    if not words:
+        return None
+    return func.to_tsquery("spanish", " & ".join(f"{word}:*" for word in words))
+
+@router.get("/", response_model=List[QuestionBankItem])
+async def search_question_bank(
+    q: str = Query(..., min_length=2, description="Texto a buscar en las preguntas existentes"),
+    limit: int = Query(20, ge=1, le=50, description="Límite de resultados"),
+    db: Session = Depends(get_db),
+    principal: Principal = Depends(require_coordinator)
+):
+    """
+    Buscar preguntas ya redactadas en el banco (índice GIN sobre el tsvector
+    en español), ordenadas por relevancia y por cuántas encuestas las usan
+    """
+    query = prefix_tsquery(q)
+    if query is None:
+        return []
+    
+    survey_count = func.count(func.distinct(Question.survey_id))
+    rows = db.query(
+        QuestionBank.id,
+        QuestionBank.question_text,
+        survey_count.label("survey_count")
+    ).outerjoin(
+        Question, Question.bank_id == QuestionBank.id
+    ).filter(
+        QuestionBank.search_vector.op("@@")(query)
+    ).group_by(
+        QuestionBank.id
+    ).order_by(
+        func.ts_rank(QuestionBank.search_vector, query).desc(),
+        survey_count.desc()
+    ).limit(limit).all()
+    
+    return rows
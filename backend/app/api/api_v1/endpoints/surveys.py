@@ -1,20 +1,95 @@
 # backend/app/api/api_v1/endpoints/surveys.py
 
+import uuid
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func, or_
+from sqlalchemy import func, insert, literal, or_, select
 
+from app.core.cycles import CYCLE_PATTERN
 from app.core.database import get_db
-from app.api.api_v1.endpoints.auth import get_current_active_user, get_current_admin_user, get_current_coordinator_user
-from app.models.user import User, Survey, Question
+from app.core.fieldsets import FieldSet, rows_to_dicts
+from app.core.http_cache import IMMUTABLE_CACHE_CONTROL, make_etag, not_modified
+from app.api.api_v1.endpoints.auth import get_current_principal, require_admin, require_coordinator
+from app.core.permissions import Principal
+from app.core.policies import fetch_authorized, survey_edit_rule, survey_view_rule
+from app.models.user import Survey, Question, SurveyVersion
 from app.schemas.survey import (
-    SurveyCreate, SurveyUpdate, SurveyResponse, SurveyList, SurveyWithQuestions,
-    QuestionCreate, QuestionUpdate, QuestionResponse
+    SurveyCreate, SurveyUpdate, SurveyResponse, SurveyList, SurveyWithQuestions, SurveyDuplicate,
+    SurveyVersionResponse,
+    QuestionCreate, QuestionUpdate, QuestionResponse,
+    SurveyTemplate, SurveyTemplateResponse, SurveyFromTemplate, SurveyPreview, QuestionStats,
+    DepartmentHeatmap
 )
+from app.services.heatmap import heatmap_cache
+from app.services.question_stats import question_stats_cache
+from app.services.reference_data import reference_data
+from app.services.survey_preview import preview_cache
+from app.services.survey_templates import template_library
+from app.services.survey_versions import thaw_question, version_payloads
+from app.services.survey_writer import insert_survey
 
 router = APIRouter()
 
+# Campos permitidos en ?fields=
+SURVEY_FIELDS = FieldSet({
+    "id": Survey.id,
+    "title": Survey.title,
+    "description": Survey.description,
+    "instructions": Survey.instructions,
+    "is_active": Survey.is_active,
+    "created_by": Survey.created_by,
+    "created_at": Survey.created_at,
+    "updated_at": Survey.updated_at,
+})
+
+# Campos de la encuesta que forman parte de su versión
+VERSIONED_SURVEY_FIELDS = ("title", "description", "instructions")
+
+QUESTION_FIELDS = FieldSet({
+    "id": Question.id,
+    "question_text": Question.question_text,
+    "question_type": Question.question_type,
+    "order_number": Question.order_number,
+    "is_required": Question.is_required,
+    "min_value": Question.min_value,
+    "max_value": Question.max_value,
+    "options": Question.options,
+    "bank_id": Question.bank_id,
+    "created_at": Question.created_at,
+})
+
+def touch_survey(db: Session, survey_id: str):
+    """
+    Marcar la encuesta como modificada (updated_at) cuando cambian sus preguntas,
+    para que su ETag cambie también. La versión vigente deja de serlo: el
+    próximo envío crea una nueva.
+    """
+    db.query(Survey).filter(Survey.id == survey_id).update(
+        {Survey.updated_at: func.now(), Survey.current_version_id: None}, synchronize_session=False
+    )
+
+def fetch_visible_survey(db: Session, survey_id: str, principal: Principal) -> Survey:
+    """Encuesta que el usuario puede ver, en una sola consulta"""
+    return fetch_authorized(
+        db.query(Survey).filter(Survey.id == survey_id),
+        survey_view_rule(principal),
+        not_found="Encuesta no encontrada",
+        # Maestros solo ven encuestas activas (para responder)
+        forbidden="Esta encuesta no está disponible" if principal.is_teacher
+        else "No tienes permisos para ver esta encuesta"
+    )
+
+def fetch_editable_survey(db: Session, survey_id: str, principal: Principal, forbidden: str) -> Survey:
+    """Encuesta que el usuario puede modificar, en una sola consulta"""
+    return fetch_authorized(
+        db.query(Survey).filter(Survey.id == survey_id),
+        survey_edit_rule(principal),
+        not_found="Encuesta no encontrada",
+        forbidden=forbidden
+    )
+
 @router.get("/", response_model=SurveyList)
 async def get_surveys(
     skip: int = Query(0, ge=0, description="Número de registros a saltar"),
@@ -22,24 +97,17 @@ async def get_surveys(
     search: Optional[str] = Query(None, description="Buscar por título o descripción"),
     is_active: Optional[bool] = Query(None, description="Filtrar por estado activo"),
     created_by: Optional[str] = Query(None, description="Filtrar por creador"),
+    fields: Optional[str] = Query(None, description="Campos a incluir separados por coma (ej. id,title)"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_coordinator_user)  # Coordinador+ puede ver encuestas
+    principal: Principal = Depends(require_coordinator)  # Coordinador+ puede ver encuestas
 ):
     """
     Obtener lista de encuestas con filtros, búsqueda y paginación
     """
-    # Query base
-    query = db.query(Survey)
-    
-    # Filtros por rol del usuario actual
-    if not current_user.is_admin:
-        # Coordinadores solo ven encuestas que crearon ellos o las públicas
-        query = query.filter(
-            or_(
-                Survey.created_by == current_user.id,
-                Survey.created_by.is_(None)  # Encuestas públicas/del sistema
-            )
-        )
+    selected = SURVEY_FIELDS.parse(fields)
+
+    # Query base con la regla de visibilidad (coordinadores: propias o públicas)
+    query = db.query(Survey).filter(survey_view_rule(principal))
     
     # Búsqueda por texto
     if search:
@@ -62,66 +130,320 @@ async def get_surveys(
     total = query.count()
     
     # Aplicar paginación y ordenamiento
-    surveys = query.order_by(Survey.created_at.desc()).offset(skip).limit(limit).all()
+    query = query.order_by(Survey.created_at.desc()).offset(skip).limit(limit)
+    
+    # Subconjunto de campos: solo esas columnas y filas planas sin schema
+    if selected:
+        return ORJSONResponse({
+            "surveys": rows_to_dicts(query.with_entities(*SURVEY_FIELDS.select(selected))),
+            "total": total,
+            "skip": skip,
+            "limit": limit,
+            "has_more": (skip + limit) < total
+        })
+    
+    surveys = query.all()
     
     return {
         "surveys": surveys,
         "total": total,
         "skip": skip,
-        "limit": limit,
-        "has_more": (skip + limit) < total
+        "limit": limit
     }
 
+# ===== ENDPOINTS DE TEMPLATES =====
+
+@router.get("/templates", response_model=List[SurveyTemplateResponse])
+async def get_survey_templates(
+    request: Request,
+    response: Response,
+    category: Optional[str] = Query(None, description="Filtrar por categoría (docente, coordinacion, autoevaluacion...)"),
+    principal: Principal = Depends(require_coordinator)
+):
+    """
+    Obtener templates de encuestas desde el índice en memoria (sin consultar la base)
+    """
+    cached = not_modified(request, response, make_etag(template_library.etag, principal.id, category))
+    if cached:
+        return cached
+    
+    return template_library.list(principal, category)
+
+@router.post("/templates", response_model=SurveyTemplateResponse)
+async def create_survey_template(
+    template_data: SurveyTemplate,
+    db: Session = Depends(get_db),
+    principal: Principal = Depends(require_coordinator)
+):
+    """
+    Guardar una encuesta como template
+    """
+    template = template_library.create(
+        db,
+        name=template_data.name,
+        description=template_data.description,
+        category=template_data.category,
+        template_data=template_data.template_data,
+        is_public=template_data.is_public,
+        created_by=principal.id
+    )
+    db.commit()
+    db.refresh(template)
+    
+    # Este worker recarga de inmediato; los demás al recibir el NOTIFY
+    template_library.load()
+    
+    return template
+
+@router.post("/from-template/{template_id}", response_model=SurveyResponse)
+async def create_survey_from_template(
+    template_id: str,
+    survey_data: Optional[SurveyFromTemplate] = None,
+    db: Session = Depends(get_db),
+    principal: Principal = Depends(require_coordinator)  # Coordinador+ puede crear
+):
+    """
+    Crear una encuesta con todas las preguntas de un template, en una sola
+    sentencia y una sola transacción
+    """
+    template = template_library.get(template_id)
+    if template is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Template no encontrado"
+        )
+    if not template.visible_to(principal):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No tienes permisos para usar este template"
+        )
+    
+    survey_data = survey_data or SurveyFromTemplate()
+    title = survey_data.title or template.survey["title"]
+    is_active = template.survey["is_active"] if survey_data.is_active is None else survey_data.is_active
+    
+    existing_survey = db.query(Survey.id).filter(
+        Survey.title == title,
+        Survey.created_by == principal.id
+    ).first()
+    
+    if existing_survey:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Ya tienes una encuesta con este título"
+        )
+    
+    new_survey = template_library.instantiate(db, template, title, is_active, principal.id)
+    db.commit()
+    
+    return new_survey
+
 @router.get("/{survey_id}", response_model=SurveyWithQuestions)
 async def get_survey(
     survey_id: str,
+    request: Request,
+    response: Response,
     include_questions: bool = Query(True, description="Incluir preguntas de la encuesta"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    principal: Principal = Depends(get_current_principal)
 ):
     """
     Obtener una encuesta específica por ID con sus preguntas
     """
-    survey = db.query(Survey).filter(Survey.id == survey_id).first()
-    
-    if not survey:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Encuesta no encontrada"
-        )
+    survey = fetch_visible_survey(db, survey_id, principal)
     
-    # Verificar permisos
-    if not current_user.is_admin:
-        if current_user.is_coordinator:
-            # Coordinador solo puede ver encuestas que creó o públicas
-            if survey.created_by != current_user.id and survey.created_by is not None:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="No tienes permisos para ver esta encuesta"
-                )
-        elif current_user.is_teacher:
-            # Maestros solo pueden ver encuestas activas (para responder)
-            if not survey.is_active:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="Esta encuesta no está disponible"
-                )
+    # Si el cliente ya tiene esta versión no se cargan ni serializan las preguntas
+    cached = not_modified(request, response, make_etag("survey", survey.id, survey.updated_at))
+    if cached:
+        return cached
     
     return survey
 
-@router.post("/", response_model=SurveyResponse)
+@router.get("/{survey_id}/preview", response_model=SurveyPreview)
+async def get_survey_preview(
+    survey_id: str,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    principal: Principal = Depends(get_current_principal)
+):
+    """
+    Vista previa de una encuesta con el tiempo estimado de respuesta.
+    Se arma una vez por versión de la encuesta; el modelo de tiempo se
+    calibra en segundo plano con las evaluaciones completadas.
+    """
+    survey = fetch_visible_survey(db, survey_id, principal)
+    model = preview_cache.model
+    
+    cached = not_modified(request, response, make_etag("preview", survey.id, survey.updated_at, model.scale))
+    if cached:
+        return cached
+    
+    # Con versión vigente las preguntas y la estimación quedan ligadas a su
+    # contenido (hash); los datos de la encuesta (is_active, updated_at) no
+    version = survey.current_version.content_hash if survey.current_version_id else survey.updated_at
+    preview = preview_cache.get(str(survey.id), version)
+    if preview is None:
+        questions = db.query(Question).filter(
+            Question.survey_id == survey.id
+        ).order_by(Question.order_number).all()
+        
+        preview = {
+            "questions": [QuestionResponse.model_validate(q).model_dump() for q in questions],
+            "estimated_time": model.estimate_minutes(
+                survey.instructions, [(q.question_type, len(q.question_text)) for q in questions]
+            ),
+            "total_questions": len(questions),
+            "required_questions": sum(1 for q in questions if q.is_required),
+        }
+        preview_cache.put(str(survey.id), version, preview)
+    
+    return {"survey": SurveyResponse.model_validate(survey).model_dump(), **preview}
+
+@router.get("/{survey_id}/versions", response_model=List[SurveyVersionResponse])
+async def get_survey_versions(
+    survey_id: str,
+    db: Session = Depends(get_db),
+    principal: Principal = Depends(get_current_principal)
+):
+    """
+    Versiones inmutables de una encuesta (las que tienen evaluaciones)
+    """
+    fetch_visible_survey(db, survey_id, principal)
+    
+    return db.query(SurveyVersion).filter(
+        SurveyVersion.survey_id == survey_id
+    ).order_by(SurveyVersion.version_number).all()
+
+@router.get("/{survey_id}/versions/{version_number}")
+async def get_survey_version(
+    survey_id: str,
+    version_number: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    principal: Principal = Depends(get_current_principal)
+):
+    """
+    Contenido de una versión tal como se respondió.
+
+    El hash del contenido es el ETag y la versión no cambia nunca: el cliente
+    puede guardarla indefinidamente y el servidor solo lee el contenido de la
+    base la primera vez que ve ese hash.
+    """
+    digest = fetch_authorized(
+        db.query(SurveyVersion.content_hash).join(Survey, SurveyVersion.survey_id == Survey.id).filter(
+            SurveyVersion.survey_id == survey_id,
+            SurveyVersion.version_number == version_number
+        ),
+        survey_view_rule(principal),
+        not_found="Versión no encontrada",
+        forbidden="No tienes permisos para ver esta encuesta"
+    )
+    
+    cached = not_modified(request, response, f'"{digest}"', IMMUTABLE_CACHE_CONTROL)
+    if cached:
+        return cached
+    
+    payload = version_payloads.get(digest, lambda: db.query(SurveyVersion.content).filter(
+        SurveyVersion.survey_id == survey_id,
+        SurveyVersion.version_number == version_number
+    ).scalar())
+    return Response(payload, media_type="application/json", headers=dict(response.headers))
+
+@router.get("/{survey_id}/question-stats", response_model=List[QuestionStats])
+async def get_question_stats(
+    survey_id: str,
+    department_id: Optional[int] = Query(None, description="Filtrar por departamento del evaluado (solo admin)"),
+    cycle: Optional[str] = Query(None, pattern=CYCLE_PATTERN, description="Ciclo escolar (ej. 2026-1)"),
+    assignment_type: Optional[str] = Query(None, description="Filtrar por tipo de asignación"),
+    db: Session = Depends(get_db),
+    principal: Principal = Depends(require_coordinator)
+):
+    """
+    Estadísticas de cada pregunta: respuestas, promedio, desviación estándar
+    y distribución 1-10. Los coordinadores solo ven su departamento (o los
+    evaluados sin departamento, si ellos no tienen uno).
+
+    Se recalcula solo cuando la encuesta recibe evaluaciones nuevas. La caché
+    es por worker: la primera consulta de cada combinación de filtros en cada
+    worker paga el GROUP BY completo (~0.5 s con un millón de respuestas); las
+    siguientes, solo la marca de agua.
+    """
+    survey = fetch_visible_survey(db, survey_id, principal)
+    
+    scope_department = department_id is not None
+    if not principal.is_admin:
+        department_id = principal.department_id
+        scope_department = True
+    
+    return question_stats_cache.get(
+        db, survey,
+        department_id=department_id,
+        scope_department=scope_department,
+        cycle=cycle,
+        assignment_type=assignment_type
+    )
+
+@router.get("/{survey_id}/heatmap", response_model=DepartmentHeatmap)
+async def get_department_heatmap(
+    survey_id: str,
+    version: Optional[int] = Query(None, ge=1, description="Número de versión de la encuesta"),
+    cycle: Optional[str] = Query(None, pattern=CYCLE_PATTERN, description="Ciclo escolar (ej. 2026-1)"),
+    db: Session = Depends(get_db),
+    principal: Principal = Depends(require_admin)
+):
+    """
+    Promedio de cada pregunta por departamento, como matriz: etiquetas de
+    filas (departamentos), de columnas (preguntas) y valores
+    """
+    survey = fetch_visible_survey(db, survey_id, principal)
+    
+    survey_version = None
+    if version is not None:
+        survey_version = db.query(SurveyVersion).filter(
+            SurveyVersion.survey_id == survey.id,
+            SurveyVersion.version_number == version
+        ).first()
+        if not survey_version:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Versión no encontrada"
+            )
+    
+    heatmap = heatmap_cache.get(db, survey, survey_version, cycle)
+    
+    # Nombres desde la caché de referencia: un cambio de nombre no invalida el heatmap
+    snapshot = reference_data.snapshot
+    return {
+        "survey_id": survey.id,
+        "version_number": version,
+        "cycle": cycle,
+        "rows": [
+            {"id": str(department_id), "label": (snapshot.department(department_id) or {}).get("name", str(department_id))}
+            for department_id in heatmap["department_ids"]
+        ],
+        "columns": [{"id": question_id, "label": text} for question_id, text in heatmap["columns"]],
+        "values": heatmap["values"],
+        "counts": heatmap["counts"],
+    }
+
+@router.post("/", response_model=SurveyWithQuestions)
 async def create_survey(
     survey_data: SurveyCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_coordinator_user)  # Coordinador+ puede crear
+    principal: Principal = Depends(require_coordinator)  # Coordinador+ puede crear
 ):
     """
-    Crear una nueva encuesta
+    Crear una nueva encuesta con sus preguntas.
+
+    Encuesta y preguntas se insertan en una sola sentencia y una sola
+    transacción; la respuesta sale del RETURNING, sin SELECTs adicionales.
     """
     # Verificar que no existe una encuesta con el mismo título del mismo creador
-    existing_survey = db.query(Survey).filter(
+    existing_survey = db.query(Survey.id).filter(
         Survey.title == survey_data.title,
-        Survey.created_by == current_user.id
+        Survey.created_by == principal.id
     ).first()
     
     if existing_survey:
@@ -130,71 +452,48 @@ async def create_survey(
             detail="Ya tienes una encuesta con este título"
         )
     
-    # Crear la encuesta
-    db_survey = Survey(
-        title=survey_data.title,
-        description=survey_data.description,
-        instructions=survey_data.instructions,
-        is_active=survey_data.is_active,
-        created_by=current_user.id
+    questions = [
+        {
+            "question_text": question_data.question_text,
+            "question_type": question_data.question_type,
+            "order_number": i + 1,
+            "is_required": question_data.is_required,
+            "min_value": question_data.min_value,
+            "max_value": question_data.max_value,
+            "options": question_data.options,
+        }
+        for i, question_data in enumerate(survey_data.questions or [])
+    ]
+    
+    new_survey = insert_survey(
+        db,
+        {
+            "title": survey_data.title,
+            "description": survey_data.description,
+            "instructions": survey_data.instructions,
+            "is_active": survey_data.is_active,
+            "created_by": uuid.UUID(principal.id),
+        },
+        questions,
     )
-    
-    db.add(db_survey)
     db.commit()
-    db.refresh(db_survey)
-    
-    # Crear preguntas si se proporcionaron
-    if survey_data.questions:
-        for i, question_data in enumerate(survey_data.questions):
-            db_question = Question(
-                survey_id=db_survey.id,
-                question_text=question_data.question_text,
-                question_type=question_data.question_type,
-                order_number=i + 1,
-                is_required=question_data.is_required,
-                min_value=question_data.min_value,
-                max_value=question_data.max_value,
-                # options=question_data.options
-            )
-            db.add(db_question)
-        
-        db.commit()
     
-    return db_survey
+    return new_survey
 
 @router.put("/{survey_id}", response_model=SurveyResponse)
 async def update_survey(
     survey_id: str,
     survey_data: SurveyUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    principal: Principal = Depends(get_current_principal)
 ):
     """
     Actualizar una encuesta existente
     """
-    survey = db.query(Survey).filter(Survey.id == survey_id).first()
-    
-    if not survey:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Encuesta no encontrada"
-        )
-    
-    # Verificar permisos
-    can_edit = False
-    if current_user.is_admin:
-        can_edit = True
-    elif current_user.is_coordinator and survey.created_by == current_user.id:
-        can_edit = True
-    
-    if not can_edit:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes permisos para editar esta encuesta"
-        )
+    survey = fetch_editable_survey(db, survey_id, principal, "No tienes permisos para editar esta encuesta")
     
     # Actualizar campos
-    update_data = survey_data.dict(exclude_unset=True)
+    update_data = survey_data.model_dump(exclude_unset=True)
     
     # Verificar título único si se está cambiando
     if "title" in update_data and update_data["title"] != survey.title:
@@ -215,6 +514,10 @@ async def update_survey(
         if field != "questions":  # Las preguntas se manejan por separado
             setattr(survey, field, value)
     
+    # Los textos forman parte de la versión; is_active no
+    if any(field in VERSIONED_SURVEY_FIELDS for field in update_data):
+        survey.current_version_id = None
+    
     db.commit()
     db.refresh(survey)
     
@@ -224,31 +527,12 @@ async def update_survey(
 async def delete_survey(
     survey_id: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    principal: Principal = Depends(get_current_principal)
 ):
     """
     Eliminar una encuesta (soft delete - desactivar)
     """
-    survey = db.query(Survey).filter(Survey.id == survey_id).first()
-    
-    if not survey:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Encuesta no encontrada"
-        )
-    
-    # Verificar permisos
-    can_delete = False
-    if current_user.is_admin:
-        can_delete = True
-    elif current_user.is_coordinator and survey.created_by == current_user.id:
-        can_delete = True
-    
-    if not can_delete:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes permisos para eliminar esta encuesta"
-        )
+    survey = fetch_editable_survey(db, survey_id, principal, "No tienes permisos para eliminar esta encuesta")
     
     # Verificar que no esté siendo usada en evaluaciones
     # TODO: Agregar verificación cuando implementemos evaluaciones
@@ -263,108 +547,160 @@ async def delete_survey(
 async def toggle_survey_status(
     survey_id: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    principal: Principal = Depends(get_current_principal)
 ):
     """
     Activar/desactivar una encuesta
     """
-    survey = db.query(Survey).filter(Survey.id == survey_id).first()
+    survey = fetch_editable_survey(
+        db, survey_id, principal, "No tienes permisos para cambiar el estado de esta encuesta"
+    )
     
-    if not survey:
+    survey.is_active = not survey.is_active
+    db.commit()
+    
+    status_text = "activada" if survey.is_active else "desactivada"
+    return {"message": f"Encuesta {status_text} exitosamente", "is_active": survey.is_active}
+
+@router.post("/{survey_id}/duplicate", response_model=SurveyResponse)
+async def duplicate_survey(
+    survey_id: str,
+    duplicate_data: SurveyDuplicate,
+    db: Session = Depends(get_db),
+    principal: Principal = Depends(require_coordinator)  # Coordinador+ puede duplicar
+):
+    """
+    Duplicar una encuesta visible (p. ej. la evaluación estándar de cada ciclo).
+
+    La copia se hace dentro de la base con un INSERT ... SELECT por tabla: ni la
+    encuesta ni sus preguntas pasan por Python.
+    """
+    existing_survey = db.query(Survey.id).filter(
+        Survey.title == duplicate_data.new_title,
+        Survey.created_by == principal.id
+    ).first()
+    
+    if existing_survey:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Encuesta no encontrada"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Ya tienes una encuesta con este título"
         )
     
-    # Verificar permisos
-    can_toggle = False
-    if current_user.is_admin:
-        can_toggle = True
-    elif current_user.is_coordinator and survey.created_by == current_user.id:
-        can_toggle = True
+    # Encuesta: la regla de visibilidad va en el WHERE del SELECT
+    new_survey = db.execute(
+        insert(Survey).from_select(
+            ["id", "title", "description", "instructions", "is_active", "created_by"],
+            select(
+                literal(uuid.uuid4(), Survey.id.type),
+                literal(duplicate_data.new_title, Survey.title.type),
+                Survey.description,
+                Survey.instructions,
+                literal(duplicate_data.set_active, Survey.is_active.type),
+                literal(uuid.UUID(principal.id), Survey.created_by.type),
+            ).where(Survey.id == survey_id, survey_view_rule(principal)),
+            include_defaults=False
+        ).returning(
+            Survey.id, Survey.title, Survey.description, Survey.instructions,
+            Survey.is_active, Survey.created_by, Survey.created_at, Survey.updated_at
+        )
+    ).first()
     
-    if not can_toggle:
+    if new_survey is None:
+        # Sin fila copiada: distinguir "no existe" de "no autorizado"
+        if db.query(Survey.id).filter(Survey.id == survey_id).first() is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Encuesta no encontrada"
+            )
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes permisos para cambiar el estado de esta encuesta"
+            detail="No tienes permisos para ver esta encuesta"
+        )
+    
+    # Preguntas: una sola sentencia sin importar cuántas sean
+    if duplicate_data.copy_questions:
+        db.execute(
+            insert(Question).from_select(
+                ["id", "survey_id", "question_text", "question_type", "order_number",
+                 "is_required", "min_value", "max_value", "options"],
+                select(
+                    func.uuid_generate_v4(),
+                    literal(new_survey.id, Question.survey_id.type),
+                    Question.question_text,
+                    Question.question_type,
+                    Question.order_number,
+                    Question.is_required,
+                    Question.min_value,
+                    Question.max_value,
+                    Question.options,
+                ).where(Question.survey_id == survey_id),
+                include_defaults=False
+            )
         )
     
-    survey.is_active = not survey.is_active
     db.commit()
     
-    status_text = "activada" if survey.is_active else "desactivada"
-    return {"message": f"Encuesta {status_text} exitosamente", "is_active": survey.is_active}
+    return new_survey
 
 # ===== ENDPOINTS DE PREGUNTAS =====
 
+def fetch_editable_question(
+    db: Session, survey_id: str, question_id: str, principal: Principal, forbidden: str
+) -> Question:
+    """Pregunta y permiso de edición sobre su encuesta en una sola consulta"""
+    return fetch_authorized(
+        db.query(Question).join(Survey, Question.survey_id == Survey.id).filter(
+            Question.id == question_id,
+            Question.survey_id == survey_id
+        ),
+        survey_edit_rule(principal),
+        not_found="Pregunta no encontrada",
+        forbidden=forbidden
+    )
+
 @router.get("/{survey_id}/questions", response_model=List[QuestionResponse])
 async def get_survey_questions(
     survey_id: str,
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(None, description="Campos a incluir separados por coma (ej. id,question_text)"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    principal: Principal = Depends(get_current_principal)
 ):
     """
     Obtener todas las preguntas de una encuesta
     """
-    # Verificar que la encuesta existe y el usuario tiene permisos
-    survey = db.query(Survey).filter(Survey.id == survey_id).first()
-    if not survey:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Encuesta no encontrada"
-        )
+    selected = QUESTION_FIELDS.parse(fields)
+    
+    survey = fetch_visible_survey(db, survey_id, principal)
     
-    # Verificar permisos (mismo que get_survey)
-    if not current_user.is_admin:
-        if current_user.is_coordinator:
-            if survey.created_by != current_user.id and survey.created_by is not None:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="No tienes permisos para ver esta encuesta"
-                )
-        elif current_user.is_teacher:
-            if not survey.is_active:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="Esta encuesta no está disponible"
-                )
-    
-    questions = db.query(Question).filter(
+    cached = not_modified(request, response, make_etag("questions", survey.id, survey.updated_at, selected))
+    if cached:
+        return cached
+    
+    query = db.query(Question).filter(
         Question.survey_id == survey_id
-    ).order_by(Question.order_number).all()
+    ).order_by(Question.order_number)
+    
+    if selected:
+        return ORJSONResponse(
+            rows_to_dicts(query.with_entities(*QUESTION_FIELDS.select(selected))),
+            headers=dict(response.headers)
+        )
     
-    return questions
+    return query.all()
 
 @router.post("/{survey_id}/questions", response_model=QuestionResponse)
 async def create_question(
     survey_id: str,
     question_data: QuestionCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    principal: Principal = Depends(get_current_principal)
 ):
     """
     Agregar una pregunta a una encuesta
     """
-    # Verificar que la encuesta existe y permisos
-    survey = db.query(Survey).filter(Survey.id == survey_id).first()
-    if not survey:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Encuesta no encontrada"
-        )
-    
-    # Verificar permisos de edición
-    can_edit = False
-    if current_user.is_admin:
-        can_edit = True
-    elif current_user.is_coordinator and survey.created_by == current_user.id:
-        can_edit = True
-    
-    if not can_edit:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes permisos para editar esta encuesta"
-        )
+    fetch_editable_survey(db, survey_id, principal, "No tienes permisos para editar esta encuesta")
     
     # Obtener el siguiente número de orden
     max_order = db.query(func.max(Question.order_number)).filter(
@@ -381,10 +717,11 @@ async def create_question(
         is_required=question_data.is_required,
         min_value=question_data.min_value,
         max_value=question_data.max_value,
-        # options=question_data.options
+        options=question_data.options
     )
     
     db.add(db_question)
+    touch_survey(db, survey_id)
     db.commit()
     db.refresh(db_question)
     
@@ -396,42 +733,22 @@ async def update_question(
     question_id: str,
     question_data: QuestionUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    principal: Principal = Depends(get_current_principal)
 ):
     """
     Actualizar una pregunta específica
     """
-    # Verificar encuesta y pregunta
-    question = db.query(Question).filter(
-        Question.id == question_id,
-        Question.survey_id == survey_id
-    ).first()
+    question = fetch_editable_question(db, survey_id, question_id, principal, "No tienes permisos para editar esta pregunta")
     
-    if not question:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Pregunta no encontrada"
-        )
-    
-    # Verificar permisos
-    survey = db.query(Survey).filter(Survey.id == survey_id).first()
-    can_edit = False
-    if current_user.is_admin:
-        can_edit = True
-    elif current_user.is_coordinator and survey.created_by == current_user.id:
-        can_edit = True
-    
-    if not can_edit:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes permisos para editar esta pregunta"
-        )
+    # Una pregunta ya respondida no se modifica: se edita una copia
+    question = thaw_question(db, question)
     
     # Actualizar campos
-    update_data = question_data.dict(exclude_unset=True)
+    update_data = question_data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(question, field, value)
     
+    touch_survey(db, survey_id)
     db.commit()
     db.refresh(question)
     
@@ -442,39 +759,19 @@ async def delete_question(
     survey_id: str,
     question_id: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    principal: Principal = Depends(get_current_principal)
 ):
     """
     Eliminar una pregunta de una encuesta
     """
-    # Verificar encuesta y pregunta
-    question = db.query(Question).filter(
-        Question.id == question_id,
-        Question.survey_id == survey_id
-    ).first()
-    
-    if not question:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Pregunta no encontrada"
-        )
-    
-    # Verificar permisos
-    survey = db.query(Survey).filter(Survey.id == survey_id).first()
-    can_edit = False
-    if current_user.is_admin:
-        can_edit = True
-    elif current_user.is_coordinator and survey.created_by == current_user.id:
-        can_edit = True
-    
-    if not can_edit:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes permisos para eliminar esta pregunta"
-        )
-    
-    # Eliminar la pregunta
-    db.delete(question)
+    question = fetch_editable_question(db, survey_id, question_id, principal, "No tienes permisos para eliminar esta pregunta")
+    
+    # Eliminar la pregunta; si ya fue respondida solo se separa de la encuesta
+    if question.survey_version_id is None:
+        db.delete(question)
+    else:
+        question.survey_id = None
+    touch_survey(db, survey_id)
     db.commit()
     
     return {"message": "Pregunta eliminada exitosamente"}
@@ -484,30 +781,12 @@ async def reorder_questions(
     survey_id: str,
     question_orders: List[dict],  # [{"question_id": "uuid", "order_number": 1}, ...]
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    principal: Principal = Depends(get_current_principal)
 ):
     """
     Reordenar preguntas de una encuesta
     """
-    # Verificar encuesta y permisos
-    survey = db.query(Survey).filter(Survey.id == survey_id).first()
-    if not survey:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Encuesta no encontrada"
-        )
-    
-    can_edit = False
-    if current_user.is_admin:
-        can_edit = True
-    elif current_user.is_coordinator and survey.created_by == current_user.id:
-        can_edit = True
-    
-    if not can_edit:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes permisos para reordenar las preguntas"
-        )
+    fetch_editable_survey(db, survey_id, principal, "No tienes permisos para reordenar las preguntas")
     
     # Actualizar orden de preguntas
     for item in question_orders:
@@ -516,9 +795,12 @@ async def reorder_questions(
             Question.survey_id == survey_id
         ).first()
         
+        # El orden no cambia el significado de las respuestas: se actualiza en
+        # el lugar y la próxima versión registra el orden nuevo
         if question:
             question.order_number = item["order_number"]
     
+    touch_survey(db, survey_id)
     db.commit()
     
     return {"message": "Preguntas reordenadas exitosamente"}
\ No newline at end of file
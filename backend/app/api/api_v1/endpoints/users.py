@@ -1,18 +1,42 @@
 # backend/app/api/api_v1/endpoints/users.py
 
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func, or_
+from sqlalchemy import or_
 
 from app.core.database import get_db
+from app.core.fieldsets import FieldSet, rows_to_dicts
+from app.core.http_cache import make_etag, not_modified
+from app.core.permissions import bump_auth_version
 from app.core.security import get_password_hash
-from app.api.api_v1.endpoints.auth import get_current_active_user, get_current_admin_user, get_current_coordinator_user
+from app.api.api_v1.endpoints.auth import get_current_admin_user, get_current_principal, require_coordinator
+from app.core.permissions import Principal
+from app.core.policies import fetch_authorized, user_edit_rule, user_view_rule
 from app.models.user import User, Role, Department
+from app.schemas.evaluation import ScoreTrend
 from app.schemas.user import UserCreate, UserUpdate, UserResponse, UserList
+from app.services.reference_data import reference_data
+from app.services.score_rollups import score_trend
 
 router = APIRouter()
 
+# Campos permitidos en ?fields= (selects y pickers del frontend)
+USER_FIELDS = FieldSet({
+    "id": User.id,
+    "email": User.email,
+    "first_name": User.first_name,
+    "last_name": User.last_name,
+    "employee_code": User.employee_code,
+    "phone": User.phone,
+    "role": Role.name,
+    "department": Department.name,
+    "is_active": User.is_active,
+    "last_login": User.last_login,
+    "created_at": User.created_at,
+})
+
 @router.get("/", response_model=UserList)
 async def get_users(
     skip: int = Query(0, ge=0, description="Número de registros a saltar"),
@@ -21,20 +45,17 @@ async def get_users(
     role: Optional[str] = Query(None, description="Filtrar por rol"),
     department_id: Optional[int] = Query(None, description="Filtrar por departamento"),
     is_active: Optional[bool] = Query(None, description="Filtrar por estado activo"),
+    fields: Optional[str] = Query(None, description="Campos a incluir separados por coma (ej. id,first_name,last_name)"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_coordinator_user)  # Coordinador+ puede ver usuarios
+    principal: Principal = Depends(require_coordinator)  # Coordinador+ puede ver usuarios
 ):
     """
     Obtener lista de usuarios con filtros, búsqueda y paginación
     """
-    # Query base
-    query = db.query(User).join(Role).outerjoin(Department)
-    
-    # Filtros por rol del usuario actual
-    if not current_user.is_admin:
-        # Coordinadores solo ven usuarios de su departamento
-        if current_user.is_coordinator:
-            query = query.filter(User.department_id == current_user.department_id)
+    selected = USER_FIELDS.parse(fields)
+
+    # Query base con la regla de visibilidad (coordinadores: su departamento)
+    query = db.query(User).join(Role).outerjoin(Department).filter(user_view_rule(principal))
     
     # Búsqueda por texto
     if search:
@@ -62,50 +83,69 @@ async def get_users(
     total = query.count()
     
     # Aplicar paginación y ordenamiento
-    users = query.order_by(User.first_name, User.last_name).offset(skip).limit(limit).all()
+    query = query.order_by(User.first_name, User.last_name).offset(skip).limit(limit)
+    
+    # Subconjunto de campos: solo esas columnas y filas planas sin schema
+    if selected:
+        return ORJSONResponse({
+            "users": rows_to_dicts(query.with_entities(*USER_FIELDS.select(selected))),
+            "total": total,
+            "skip": skip,
+            "limit": limit,
+            "has_more": (skip + limit) < total
+        })
+    
+    users = query.all()
     
     return {
         "users": users,
         "total": total,
         "skip": skip,
-        "limit": limit,
-        "has_more": (skip + limit) < total
+        "limit": limit
     }
 
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user(
     user_id: str,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    principal: Principal = Depends(get_current_principal)
 ):
     """
     Obtener un usuario específico por ID
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    user = fetch_authorized(
+        db.query(User).filter(User.id == user_id),
+        user_view_rule(principal),
+        not_found="Usuario no encontrado",
+        forbidden="No tienes permisos para ver este usuario"
+    )
     
-    if not user:
+    cached = not_modified(
+        request, response,
+        make_etag("user", user.id, user.updated_at, user.role_id, user.department_id)
+    )
+    if cached:
+        return cached
+    
+    return user
+
+def check_reference_ids(role_id: Optional[int], department_id: Optional[int]):
+    """Validar rol y departamento con la caché de referencia, sin consultar la base"""
+    snapshot = reference_data.snapshot
+    if role_id is not None and snapshot.role(role_id) is None:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Usuario no encontrado"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Rol no válido"
         )
-    
-    # Verificar permisos
-    if not current_user.is_admin:
-        if current_user.is_coordinator:
-            # Coordinador solo puede ver usuarios de su departamento
-            if user.department_id != current_user.department_id:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="No tienes permisos para ver este usuario"
-                )
-        elif current_user.id != user.id:
-            # Maestros solo pueden verse a sí mismos
+    if department_id:
+        department = snapshot.department(department_id)
+        if department is None or not department["is_active"]:
             raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="No tienes permisos para ver este usuario"
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Departamento no válido"
             )
-    
-    return user
 
 @router.post("/", response_model=UserResponse)
 async def create_user(
@@ -133,22 +173,8 @@ async def create_user(
                 detail="Ya existe un usuario con este código de empleado"
             )
     
-    # Verificar que el rol existe
-    role = db.query(Role).filter(Role.id == user_data.role_id).first()
-    if not role:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Rol no válido"
-        )
-    
-    # Verificar que el departamento existe (si se proporciona)
-    if user_data.department_id:
-        department = db.query(Department).filter(Department.id == user_data.department_id).first()
-        if not department:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Departamento no válido"
-            )
+    # Verificar rol y departamento contra la caché de referencia
+    check_reference_ids(user_data.role_id, user_data.department_id)
     
     # Crear el usuario
     hashed_password = get_password_hash(user_data.password)
@@ -176,44 +202,28 @@ async def update_user(
     user_id: str,
     user_data: UserUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    principal: Principal = Depends(get_current_principal)
 ):
     """
     Actualizar un usuario existente
     """
-    user = db.query(User).filter(User.id == user_id).first()
-    
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Usuario no encontrado"
-        )
-    
-    # Verificar permisos
-    can_edit = False
-    if current_user.is_admin:
-        can_edit = True
-    elif current_user.is_coordinator and user.department_id == current_user.department_id:
-        can_edit = True
-    elif current_user.id == user.id:
-        # Los usuarios pueden editar algunos de sus propios datos
-        can_edit = True
-    
-    if not can_edit:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes permisos para editar este usuario"
-        )
+    # Los usuarios pueden editar algunos de sus propios datos
+    user = fetch_authorized(
+        db.query(User).filter(User.id == user_id),
+        user_edit_rule(principal),
+        not_found="Usuario no encontrado",
+        forbidden="No tienes permisos para editar este usuario"
+    )
     
     # Actualizar campos permitidos según rol
-    update_data = user_data.dict(exclude_unset=True)
+    update_data = user_data.model_dump(exclude_unset=True)
     
     # Solo admin puede cambiar rol y estado activo
-    if not current_user.is_admin:
+    if not principal.is_admin:
         update_data.pop("role_id", None)
         update_data.pop("is_active", None)
         # Solo admin y coordinador pueden cambiar departamento
-        if not current_user.is_coordinator:
+        if not principal.is_coordinator:
             update_data.pop("department_id", None)
     
     # Verificar email único si se está cambiando
@@ -239,12 +249,20 @@ async def update_user(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Ya existe un usuario con este código de empleado"
             )
-    
+
+    # Verificar rol y departamento si se están cambiando
+    check_reference_ids(update_data.get("role_id"), update_data.get("department_id"))
+
     # Hashear nueva contraseña si se proporciona
     if "password" in update_data:
         update_data["hashed_password"] = get_password_hash(update_data["password"])
         del update_data["password"]
     
+    # Cambios que alteran la autorización invalidan los tokens vigentes del usuario
+    if any(field in update_data and update_data[field] != getattr(user, field)
+           for field in ("role_id", "department_id", "is_active")):
+        bump_auth_version(db, user)
+    
     # Aplicar actualizaciones
     for field, value in update_data.items():
         setattr(user, field, value)
@@ -280,6 +298,7 @@ async def delete_user(
     
     # Soft delete - desactivar en lugar de eliminar
     user.is_active = False
+    bump_auth_version(db, user)
     db.commit()
     
     return {"message": "Usuario desactivado exitosamente"}
@@ -309,29 +328,60 @@ async def toggle_user_status(
         )
     
     user.is_active = not user.is_active
+    bump_auth_version(db, user)
     db.commit()
     
     status_text = "activado" if user.is_active else "desactivado"
     return {"message": f"Usuario {status_text} exitosamente", "is_active": user.is_active}
 
+@router.get("/{user_id}/score-trend", response_model=ScoreTrend)
+async def get_score_trend(
+    user_id: str,
+    survey_id: Optional[str] = Query(None, description="Filtrar por encuesta"),
+    db: Session = Depends(get_db),
+    principal: Principal = Depends(get_current_principal)
+):
+    """
+    Evolución por ciclo del total_score y de cada pregunta (por entrada del
+    banco) de un usuario evaluado. Lee solo las tablas de rollups.
+    """
+    fetch_authorized(
+        db.query(User.id).filter(User.id == user_id),
+        user_view_rule(principal),
+        not_found="Usuario no encontrado",
+        forbidden="No tienes permisos para ver este usuario"
+    )
+    
+    return score_trend(db, user_id, survey_id)
+
 @router.get("/roles/", response_model=List[dict])
 async def get_roles(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_coordinator_user)
+    request: Request,
+    response: Response,
+    principal: Principal = Depends(require_coordinator)
 ):
     """
     Obtener lista de roles disponibles
     """
-    roles = db.query(Role).all()
-    return [{"id": role.id, "name": role.name, "description": role.description} for role in roles]
+    snapshot = reference_data.snapshot
+    cached = not_modified(request, response, snapshot.etag)
+    if cached:
+        return cached
+    
+    return snapshot.role_list
 
 @router.get("/departments/", response_model=List[dict])
 async def get_departments(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    request: Request,
+    response: Response,
+    principal: Principal = Depends(get_current_principal)
 ):
     """
     Obtener lista de departamentos disponibles
     """
-    departments = db.query(Department).filter(Department.is_active == True).all()
-    return [{"id": dept.id, "name": dept.name, "description": dept.description} for dept in departments]
\ No newline at end of file
+    snapshot = reference_data.snapshot
+    cached = not_modified(request, response, snapshot.etag)
+    if cached:
+        return cached
+    
+    return snapshot.department_list
\ No newline at end of file
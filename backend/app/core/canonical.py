@@ -0,0 +1,13 @@
+import hashlib
+import json
+
+
+def content_hash(content: dict) -> str:
+    """
+    sha256 de la forma canónica del contenido (claves ordenadas, sin espacios).
+
+    Solo biblioteca estándar: lo usan tanto la aplicación como el bootstrap de
+    la base, y ambos deben producir el mismo hash para el mismo contenido.
+    """
+    canonical = json.dumps(content, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
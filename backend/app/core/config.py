@@ -18,11 +18,18 @@ class Settings(BaseSettings):
     DB_USER: str = "postgres"
     DB_PASSWORD: str = "ABC123"
     DB_NAME: str = "evaluacion_eduardoaguirrepequeno"
+    DB_POOL_SIZE: int = 5  # Conexiones por worker (se abren al iniciar)
+    DB_MAX_OVERFLOW: int = 10
     
     # JWT
     SECRET_KEY: str = "tu_clave_super_secreta_aqui_cambiar_en_produccion"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 480  # 8 horas para uso local
+    LAST_LOGIN_FLUSH_SECONDS: float = 5.0  # Intervalo de escritura en lote de last_login
+    SSE_HEARTBEAT_SECONDS: float = 15.0  # Comentario keep-alive en streams de eventos
+    REVOCATION_PURGE_SECONDS: float = 3600.0  # Purga de revocaciones de tokens ya expirados
+    REVOCATION_BLOOM_CAPACITY: int = 10000  # Tamaño inicial del filtro de Bloom de revocaciones
+    PREVIEW_CALIBRATION_SECONDS: float = 3600.0  # Recalibración del tiempo estimado de encuestas
     
     # CORS - Configuración para local/híbrido
     BACKEND_CORS_ORIGINS: List[str] = [
@@ -38,6 +45,17 @@ class Settings(BaseSettings):
     ADMIN_FIRST_NAME: str = "Admin"
     ADMIN_LAST_NAME: str = "Sistema"
     
+    # Compresión de respuestas (bytes mínimos para comprimir)
+    COMPRESSION_MIN_SIZE: int = 1024
+    
+    # Servidor de producción (serve.py, solo Linux)
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    WEB_WORKERS: int = 0  # 0 = un worker por núcleo de CPU
+    WORKER_MAX_REQUESTS: int = 10000  # Reciclar el worker tras N peticiones (0 = nunca)
+    WORKER_MAX_REQUESTS_JITTER: int = 1000  # Evita que todos se reciclen a la vez
+    WORKER_GRACEFUL_TIMEOUT: int = 30  # Segundos para terminar peticiones en curso
+    
     # Entorno
     ENVIRONMENT: str = "production"
     
@@ -0,0 +1,19 @@
+from datetime import datetime
+from typing import Tuple
+
+# Ciclos escolares semestrales: "2026-1" (enero-junio) y "2026-2" (julio-diciembre)
+CYCLE_PATTERN = r"^\d{4}-[12]$"
+CYCLE_MONTHS = 6
+
+
+def cycle_of(moment: datetime) -> str:
+    """Ciclo al que pertenece una fecha"""
+    return f"{moment.year}-{(moment.month - 1) // CYCLE_MONTHS + 1}"
+
+
+def cycle_bounds(cycle: str) -> Tuple[datetime, datetime]:
+    """Inicio (inclusive) y fin (exclusivo) de un ciclo, en UTC sin zona como completed_at"""
+    year, half = (int(part) for part in cycle.split("-"))
+    start = datetime(year, (half - 1) * CYCLE_MONTHS + 1, 1)
+    end = datetime(year + 1, 1, 1) if half == 2 else datetime(year, CYCLE_MONTHS + 1, 1)
+    return start, end
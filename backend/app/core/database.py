@@ -2,10 +2,14 @@ from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core.metrics import InstrumentedQueuePool
 
 # Crear engine de base de datos
 engine = create_engine(
     settings.database_url,
+    poolclass=InstrumentedQueuePool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
     pool_pre_ping=True,
     echo=settings.ENVIRONMENT == "development"
 )
@@ -16,6 +20,12 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # Base para modelos
 Base = declarative_base()
 
+def warm_pool(size: int = settings.DB_POOL_SIZE) -> None:
+    """Abrir de antemano las conexiones del pool para que las primeras peticiones no esperen el handshake"""
+    connections = [engine.connect() for _ in range(size)]
+    for connection in connections:
+        connection.close()
+
 # Dependency para obtener session de BD
 def get_db():
     db = SessionLocal()
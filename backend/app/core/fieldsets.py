@@ -0,0 +1,38 @@
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException, status
+
+
+class FieldSet:
+    """
+    Campos que un cliente puede pedir con ?fields= para un recurso, cada uno
+    con la columna SQL que lo produce. Con un subconjunto se seleccionan solo
+    esas columnas y se responde con filas planas, sin pasar por el schema.
+    """
+
+    def __init__(self, columns: Dict[str, object], always: tuple = ("id",)):
+        self.columns = columns
+        self.always = always
+
+    def parse(self, fields: Optional[str]) -> Optional[List[str]]:
+        """Validar ?fields=a,b,c contra la whitelist. None = respuesta completa"""
+        if not fields:
+            return None
+        requested = [name.strip() for name in fields.split(",") if name.strip()]
+        invalid = [name for name in requested if name not in self.columns]
+        if invalid:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Campos no válidos: {', '.join(invalid)}. Permitidos: {', '.join(self.columns)}"
+            )
+        selected = list(self.always)
+        selected.extend(name for name in requested if name not in selected)
+        return selected
+
+    def select(self, names: List[str]) -> list:
+        """Columnas etiquetadas para Query.with_entities()"""
+        return [self.columns[name].label(name) for name in names]
+
+
+def rows_to_dicts(rows) -> List[dict]:
+    return [dict(row._mapping) for row in rows]
@@ -0,0 +1,56 @@
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response
+
+# Sufijos que agrega CompressionMiddleware al ETag según la codificación
+ENCODING_SUFFIXES = ("-gzip", "-br")
+
+CACHE_CONTROL = "private, no-cache"
+
+# Para contenido direccionado por hash, que nunca cambia
+IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+
+
+def make_etag(*parts) -> str:
+    """
+    ETag fuerte derivado de la versión de las filas (updated_at, ids, conteos)
+    """
+    raw = "|".join("" if part is None else str(part) for part in parts)
+    return '"' + hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest() + '"'
+
+
+def _normalize(tag: str) -> str:
+    tag = tag.strip()
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    for suffix in ENCODING_SUFFIXES:
+        if tag.endswith(suffix + '"'):
+            return tag[: -len(suffix) - 1] + '"'
+    return tag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Comparar el header If-None-Match contra el ETag actual"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(_normalize(tag) == etag for tag in if_none_match.split(","))
+
+
+def not_modified(
+    request: Request, response: Response, etag: str, cache_control: str = CACHE_CONTROL
+) -> Optional[Response]:
+    """
+    Agregar el ETag a la respuesta y, si el cliente ya tiene esa versión,
+    retornar un 304 para que el endpoint no serialice nada más
+    """
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(
+            status_code=304,
+            headers={"ETag": etag, "Cache-Control": cache_control}
+        )
+    return None
@@ -0,0 +1,199 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.pool import QueuePool
+
+# Buckets fijos (segundos) para histogramas de latencia
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+# Buckets fijos (segundos) para la espera de conexiones del pool
+POOL_WAIT_BUCKETS: Tuple[float, ...] = (
+    0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0
+)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class Histogram:
+    """
+    Histograma con buckets fijos; cada observacion es un bisect y un incremento
+    """
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name: str, labels: str) -> List[str]:
+        """Lineas en formato de texto de Prometheus (buckets acumulados)"""
+        sep = "," if labels else ""
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, self.counts):
+            cumulative += bucket_count
+            lines.append(f'{name}_bucket{{{labels}{sep}le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels}{sep}le="+Inf"}} {self.count}')
+        suffix = f"{{{labels}}}" if labels else ""
+        lines.append(f"{name}_sum{suffix} {self.sum}")
+        lines.append(f"{name}_count{suffix} {self.count}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Registro en memoria de metricas HTTP y del pool de conexiones.
+
+    Es por proceso: con varios workers (serve.py) cada uno tiene el suyo y un
+    scrape solo ve el worker que lo atiende. Todas las series llevan la
+    etiqueta worker (pid) para no mezclar contadores de workers distintos.
+    """
+
+    def __init__(self):
+        self.requests: Dict[Tuple[str, str, str], int] = {}
+        self.latency: Dict[Tuple[str, str], Histogram] = {}
+        self.in_flight = 0
+        self.pool_wait = Histogram(POOL_WAIT_BUCKETS)
+        self.pool_timeouts = 0
+        # La espera del pool se mide en los hilos del threadpool
+        self._pool_lock = threading.Lock()
+
+    def observe_request(self, method: str, route: str, status_code: int, elapsed: float) -> None:
+        status_class = f"{status_code // 100}xx"
+        key = (method, route, status_class)
+        self.requests[key] = self.requests.get(key, 0) + 1
+
+        histogram = self.latency.get((method, route))
+        if histogram is None:
+            histogram = self.latency[(method, route)] = Histogram(LATENCY_BUCKETS)
+        histogram.observe(elapsed)
+
+    def observe_pool_wait(self, elapsed: float, timed_out: bool = False) -> None:
+        with self._pool_lock:
+            self.pool_wait.observe(elapsed)
+            if timed_out:
+                self.pool_timeouts += 1
+
+    def render(self, pool=None) -> str:
+        """
+        Exportar todas las metricas en formato de texto de Prometheus
+        """
+        # pid al momento del scrape: el registro se hereda por fork()
+        worker = f'worker="{os.getpid()}"'
+        lines = [
+            "# HELP http_requests_total Total de peticiones HTTP por ruta y clase de estado",
+            "# TYPE http_requests_total counter",
+        ]
+        for (method, route, status_class), value in sorted(self.requests.items()):
+            lines.append(
+                f'http_requests_total{{{worker},method="{method}",route="{route}",status="{status_class}"}} {value}'
+            )
+
+        lines += [
+            "# HELP http_requests_in_progress Peticiones HTTP en curso",
+            "# TYPE http_requests_in_progress gauge",
+            f"http_requests_in_progress{{{worker}}} {self.in_flight}",
+            "# HELP http_request_duration_seconds Latencia de peticiones HTTP por ruta",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route), histogram in sorted(self.latency.items()):
+            lines += histogram.render(
+                "http_request_duration_seconds", f'{worker},method="{method}",route="{route}"'
+            )
+
+        with self._pool_lock:
+            lines += [
+                "# HELP db_pool_checkout_wait_seconds Espera para obtener una conexion del pool",
+                "# TYPE db_pool_checkout_wait_seconds histogram",
+            ]
+            lines += self.pool_wait.render("db_pool_checkout_wait_seconds", worker)
+            lines += [
+                "# HELP db_pool_checkout_timeouts_total Checkouts del pool que agotaron el timeout",
+                "# TYPE db_pool_checkout_timeouts_total counter",
+                f"db_pool_checkout_timeouts_total{{{worker}}} {self.pool_timeouts}",
+            ]
+
+        if pool is not None and isinstance(pool, QueuePool):
+            for name, help_text, value in (
+                ("db_pool_size", "Tamano configurado del pool", pool.size()),
+                ("db_pool_checked_out", "Conexiones en uso", pool.checkedout()),
+                ("db_pool_checked_in", "Conexiones libres en el pool", pool.checkedin()),
+                ("db_pool_overflow", "Conexiones de overflow abiertas", pool.overflow()),
+            ):
+                lines += [
+                    f"# HELP {name} {help_text}",
+                    f"# TYPE {name} gauge",
+                    f"{name}{{{worker}}} {value}",
+                ]
+
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool que mide el tiempo de espera de cada checkout
+    """
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except Exception:
+            registry.observe_pool_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        registry.observe_pool_wait(time.perf_counter() - start)
+        return connection
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI que registra conteo, clase de estado y latencia por ruta.
+    La ruta se etiqueta con su plantilla (p. ej. /api/v1/users/{user_id})
+    para mantener baja la cardinalidad.
+    """
+
+    def __init__(self, app, metrics: Optional[MetricsRegistry] = None):
+        self.app = app
+        self.metrics = metrics or registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        metrics = self.metrics
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        metrics.in_flight += 1
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            metrics.in_flight -= 1
+            route = scope.get("route")
+            route_path = getattr(route, "path_format", None) or getattr(route, "path", None)
+            metrics.observe_request(
+                scope["method"], route_path or UNMATCHED_ROUTE, status_code, elapsed
+            )
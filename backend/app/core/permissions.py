@@ -0,0 +1,177 @@
+import logging
+from enum import IntFlag
+from typing import Dict, Optional
+
+from app.core.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Canal de NOTIFY con los cambios de versión de autorización de un usuario
+AUTH_CHANNEL = "auth_version"
+
+
+class Permission(IntFlag):
+    """Permisos que viajan en el token como máscara de bits (claim "perm")"""
+    ADMIN = 1 << 0              # Administración del sistema
+    COORDINATE = 1 << 1         # Gestionar usuarios y encuestas del departamento
+    EVALUATE_TEACHERS = 1 << 2  # Evaluar a maestros del departamento
+    SELF_EVALUATE = 1 << 3      # Responder autoevaluaciones
+
+
+ROLE_PERMISSIONS = {
+    "admin": Permission.ADMIN | Permission.COORDINATE | Permission.EVALUATE_TEACHERS | Permission.SELF_EVALUATE,
+    "coordinador": Permission.COORDINATE | Permission.EVALUATE_TEACHERS | Permission.SELF_EVALUATE,
+    "maestro": Permission.SELF_EVALUATE,
+}
+
+
+class RoleRegistry:
+    """
+    Mapa role_id -> (nombre, permisos) leído una vez de la tabla roles, para que
+    las verificaciones de rol no tengan que cargar la relación User.role.
+    """
+
+    def __init__(self):
+        self._names: Dict[int, str] = {}
+        self._masks: Dict[int, int] = {}
+
+    def load(self, db=None) -> None:
+        from app.models.user import Role
+
+        session = db or SessionLocal()
+        try:
+            rows = session.query(Role.id, Role.name).all()
+        finally:
+            if db is None:
+                session.close()
+        self.update(rows)
+
+    def update(self, rows) -> None:
+        """Reemplazar el mapa con pares (role_id, nombre) ya leídos"""
+        rows = list(rows)
+        self._names = {role_id: name for role_id, name in rows}
+        self._masks = {role_id: int(ROLE_PERMISSIONS.get(name, 0)) for role_id, name in rows}
+
+    def name(self, role_id: int) -> Optional[str]:
+        if role_id not in self._names:
+            # Rol creado después del arranque (o registro aún no cargado)
+            self.load()
+        return self._names.get(role_id)
+
+    def mask(self, role_id: int) -> int:
+        if role_id not in self._masks:
+            self.load()
+        return self._masks.get(role_id, 0)
+
+
+class AuthVersions:
+    """
+    Versión de autorización vigente por usuario. Solo se guardan los usuarios
+    cuya versión ya cambió (> 1); se carga al conectar el puente LISTEN y se
+    actualiza con cada NOTIFY, así la validación del token no consulta la base.
+
+    epoch cuenta los cambios vistos por este worker (rol, departamento o
+    estado de cualquier usuario): las cachés que agrupan por el departamento
+    del evaluado lo incluyen en su marca de agua.
+    """
+
+    def __init__(self):
+        self._versions: Dict[str, int] = {}
+        self.epoch = 0
+
+    def load(self) -> None:
+        from app.models.user import User
+
+        db = SessionLocal()
+        try:
+            rows = db.query(User.id, User.auth_version).filter(User.auth_version > 1).all()
+        finally:
+            db.close()
+        self._versions = {str(user_id): version for user_id, version in rows}
+        # Al reconectar pudo perderse algún NOTIFY
+        self.epoch += 1
+
+    def apply(self, data: dict) -> None:
+        user_id = data["user_id"]
+        self._versions[user_id] = max(self._versions.get(user_id, 1), data["version"])
+        self.epoch += 1
+
+    def current(self, user_id: str) -> int:
+        return self._versions.get(user_id, 1)
+
+
+class Principal:
+    """Identidad y permisos tomados del token, sin consultar la base"""
+
+    __slots__ = ("id", "email", "role", "department_id", "permissions", "version", "jti", "issued_at", "expires_at")
+
+    def __init__(self, id: str, email: str, role: str, department_id: Optional[int], permissions: int, version: int,
+                 jti: Optional[str] = None, issued_at: float = 0, expires_at: int = 0):
+        self.id = id
+        self.email = email
+        self.role = role
+        self.department_id = department_id
+        self.permissions = permissions
+        self.version = version
+        self.jti = jti
+        self.issued_at = issued_at
+        self.expires_at = expires_at
+
+    @classmethod
+    def from_claims(cls, payload: dict) -> Optional["Principal"]:
+        """None si el token no trae los claims de permisos (tokens anteriores)"""
+        if payload.get("sub") is None or "perm" not in payload or "ver" not in payload:
+            return None
+        return cls(
+            id=payload["sub"],
+            email=payload.get("email"),
+            role=payload.get("role"),
+            department_id=payload.get("dept"),
+            permissions=payload["perm"],
+            version=payload["ver"],
+            jti=payload.get("jti"),
+            issued_at=payload.get("iat", 0),
+            expires_at=payload.get("exp", 0),
+        )
+
+    def has(self, permission: Permission) -> bool:
+        return (self.permissions & permission) == permission
+
+    @property
+    def is_admin(self) -> bool:
+        return self.has(Permission.ADMIN)
+
+    @property
+    def is_coordinator(self) -> bool:
+        return self.role == "coordinador"
+
+    @property
+    def is_teacher(self) -> bool:
+        return self.role == "maestro"
+
+
+def build_claims(user) -> dict:
+    """Claims de autorización para create_access_token"""
+    return {
+        "sub": str(user.id),
+        "email": user.email,
+        "role": role_registry.name(user.role_id),
+        "dept": user.department_id,
+        "perm": role_registry.mask(user.role_id),
+        "ver": user.auth_version or 1,
+    }
+
+
+def bump_auth_version(db, user) -> None:
+    """
+    Invalidar los tokens emitidos de un usuario (cambio de rol, departamento o
+    estado). Los workers se enteran por NOTIFY al confirmar la transacción.
+    """
+    from app.services.events import notify
+
+    user.auth_version = (user.auth_version or 1) + 1
+    notify(db, AUTH_CHANNEL, {"user_id": str(user.id), "version": user.auth_version})
+
+
+role_registry = RoleRegistry()
+auth_versions = AuthVersions()
@@ -0,0 +1,65 @@
+from fastapi import HTTPException, status
+from sqlalchemy import false, or_, true
+from sqlalchemy.orm import Query
+
+from app.core.permissions import Principal
+from app.models.user import Survey, User
+
+# Reglas de visibilidad y edición como expresiones SQL: se usan como filtro en
+# las listas y como columna "allowed" al traer una sola fila, de modo que una
+# consulta basta para distinguir "no existe" (404) de "no autorizado" (403).
+
+
+def survey_view_rule(principal: Principal):
+    """Admin: todas. Coordinador: propias o públicas. Maestro: solo activas"""
+    if principal.is_admin:
+        return true()
+    if principal.is_coordinator:
+        return or_(Survey.created_by == principal.id, Survey.created_by.is_(None))
+    if principal.is_teacher:
+        return Survey.is_active.is_(True)
+    return false()
+
+
+def survey_edit_rule(principal: Principal):
+    """Admin: todas. Coordinador: solo las que creó"""
+    if principal.is_admin:
+        return true()
+    if principal.is_coordinator:
+        return Survey.created_by == principal.id
+    return false()
+
+
+def user_view_rule(principal: Principal):
+    """Admin: todos. Coordinador: su departamento. Resto: solo a sí mismo"""
+    if principal.is_admin:
+        return true()
+    if principal.is_coordinator:
+        return User.department_id.is_not_distinct_from(principal.department_id)
+    return User.id == principal.id
+
+
+def user_edit_rule(principal: Principal):
+    """Admin: todos. Coordinador: su departamento y él mismo. Resto: solo a sí mismo"""
+    if principal.is_admin:
+        return true()
+    if principal.is_coordinator:
+        return or_(
+            User.department_id.is_not_distinct_from(principal.department_id),
+            User.id == principal.id
+        )
+    return User.id == principal.id
+
+
+def fetch_authorized(query: Query, rule, not_found: str, forbidden: str):
+    """
+    Traer la fila y evaluar la regla en la misma consulta. 404 si no existe,
+    403 si existe pero la regla no la permite
+    """
+    row = query.add_columns(rule.label("allowed")).first()
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=not_found)
+    entity, allowed = row
+    if not allowed:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=forbidden)
+    return entity
@@ -0,0 +1,4 @@
+# Escala de las preguntas tipo "scale": valores válidos de una respuesta cuando
+# la pregunta no define min_value/max_value propios
+SCALE_MIN = 1
+SCALE_MAX = 10
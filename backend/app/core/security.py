@@ -1,3 +1,5 @@
+import calendar
+import uuid
 from datetime import datetime, timedelta
 from typing import Optional, Union
 from jose import JWTError, jwt
@@ -27,13 +29,18 @@ def create_access_token(
     Crear JWT access token
     """
     to_encode = data.copy()
+    now = datetime.utcnow()
     
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = now + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(minutes=15)
+        expire = now + timedelta(minutes=15)
     
-    to_encode.update({"exp": expire})
+    # jti identifica el token para poder revocarlo; iat para revocar por usuario.
+    # iat con microsegundos: un login en el mismo segundo que un logout-all no
+    # debe quedar revocado
+    issued_at = calendar.timegm(now.utctimetuple()) + now.microsecond / 1_000_000
+    to_encode.update({"exp": expire, "iat": issued_at, "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(
         to_encode, 
         settings.SECRET_KEY, 
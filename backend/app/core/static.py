@@ -0,0 +1,143 @@
+import hashlib
+import mimetypes
+import os
+import re
+from typing import Dict, Optional
+
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.exception_handlers import http_exception_handler
+from starlette.exceptions import HTTPException as StarletteHTTPException
+
+from app.core.compression import COMPRESSIBLE_TYPES, brotli, choose_encoding, compress
+from app.core.http_cache import etag_matches, make_etag
+
+# Nombres con hash de contenido del build de React: main.3f2a1b4c.js, 787.1a2b3c4d.chunk.css
+HASHED_NAME = re.compile(r"\.[0-9a-f]{8,}\.")
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "public, no-cache"
+
+# Variantes que puede traer el build ya comprimidas (p. ej. compression-webpack-plugin)
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+
+class StaticAsset:
+    """Archivo del build en memoria con sus variantes comprimidas"""
+
+    __slots__ = ("body", "content_type", "etag", "cache_control", "variants")
+
+    def __init__(self, body: bytes, content_type: str, cache_control: str, variants: Dict[str, bytes]):
+        self.body = body
+        self.content_type = content_type
+        self.etag = make_etag(hashlib.blake2b(body, digest_size=16).hexdigest())
+        self.cache_control = cache_control
+        self.variants = variants
+
+
+def load_asset(path: str, cache_control: str, minimum_size: int) -> StaticAsset:
+    with open(path, "rb") as f:
+        body = f.read()
+
+    content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    if content_type.startswith("text/") or content_type == "application/javascript":
+        content_type += "; charset=utf-8"
+
+    variants = {}
+    compressible = len(body) >= minimum_size and content_type.startswith(COMPRESSIBLE_TYPES)
+    for encoding, extension in PRECOMPRESSED:
+        if os.path.exists(path + extension):
+            with open(path + extension, "rb") as f:
+                variants[encoding] = f.read()
+        elif compressible and (encoding != "br" or brotli is not None):
+            # Se comprime una sola vez al iniciar, así que se usa el nivel máximo
+            variants[encoding] = compress(body, encoding, gzip_level=9, brotli_quality=11)
+        if encoding in variants and len(variants[encoding]) >= len(body):
+            del variants[encoding]
+
+    return StaticAsset(body, content_type, cache_control, variants)
+
+
+class StaticAssets:
+    """
+    Archivos del build de React precargados en memoria al iniciar.
+
+    Los archivos con hash en el nombre se sirven con Cache-Control immutable;
+    el resto (index.html, manifest.json, favicon) se revalida con ETag.
+    """
+
+    def __init__(self, build_path: str, minimum_size: int = 1024):
+        self.assets: Dict[str, StaticAsset] = {}
+        self.minimum_size = minimum_size
+
+        for root, _, files in os.walk(build_path):
+            for name in files:
+                if name.endswith((".gz", ".br", ".map")):
+                    continue
+                path = os.path.join(root, name)
+                key = os.path.relpath(path, build_path).replace(os.sep, "/")
+                cache_control = IMMUTABLE if HASHED_NAME.search(name) else REVALIDATE
+                self.assets[key] = load_asset(path, cache_control, minimum_size)
+
+        self.index = self.assets.get("index.html")
+
+    def get(self, key: str) -> Optional[StaticAsset]:
+        return self.assets.get(key)
+
+    def respond(self, request: Request, asset: StaticAsset) -> Response:
+        headers = {"Cache-Control": asset.cache_control, "ETag": asset.etag}
+        if asset.variants:
+            headers["Vary"] = "Accept-Encoding"
+
+        if etag_matches(request.headers.get("if-none-match"), asset.etag):
+            return Response(status_code=304, headers=headers)
+
+        body = asset.body
+        encoding = choose_encoding(request.headers.get("accept-encoding", ""))
+        if encoding in asset.variants:
+            body = asset.variants[encoding]
+            headers["Content-Encoding"] = encoding
+            # Mismo criterio de ETag por representación que CompressionMiddleware
+            headers["ETag"] = f'{asset.etag[:-1]}-{encoding}"'
+
+        if request.method == "HEAD":
+            headers["Content-Length"] = str(len(body))
+            body = b""
+        # Content-Type ya trae el charset; con media_type Starlette agregaría otro
+        headers["Content-Type"] = asset.content_type
+        return Response(content=body, headers=headers)
+
+
+def mount_frontend(app: FastAPI, build_path: str, api_prefix: str, minimum_size: int = 1024) -> StaticAssets:
+    """
+    Registrar /static/* y el fallback de la SPA.
+
+    El fallback no es una ruta: es el manejador de 404 y solo actúa cuando
+    ninguna ruta coincidió. Así el router conserva su redirección de la barra
+    final (/api/v1/users -> /api/v1/users/) y los 405 de la API.
+    """
+    frontend = StaticAssets(build_path, minimum_size)
+
+    @app.api_route("/static/{asset_path:path}", methods=["GET", "HEAD"], include_in_schema=False)
+    async def static_asset(asset_path: str, request: Request):
+        asset = frontend.get(f"static/{asset_path}")
+        if asset is None:
+            raise HTTPException(status_code=404, detail="Archivo no encontrado")
+        return frontend.respond(request, asset)
+
+    async def spa_fallback(request: Request, exc: StarletteHTTPException) -> Response:
+        path = request.url.path
+        # Un 404 lanzado por una ruta que sí coincidió (p. ej. "Usuario no encontrado") sigue igual
+        unmatched = "route" not in request.scope and request.method in ("GET", "HEAD")
+        if unmatched and frontend.index is not None and not path.startswith(api_prefix):
+            # Archivos de la raíz del build (favicon.ico, manifest.json); otro
+            # nombre con extensión es un archivo inexistente, no una ruta de la SPA
+            asset = frontend.get(path.lstrip("/"))
+            if asset is None and "." not in path.rsplit("/", 1)[-1]:
+                asset = frontend.index
+            if asset is not None:
+                return frontend.respond(request, asset)
+        return await http_exception_handler(request, exc)
+
+    app.add_exception_handler(404, spa_fallback)
+
+    return frontend
@@ -1,15 +1,30 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from app.core.config import settings
+from app.core.database import engine
+from app.core.metrics import MetricsMiddleware, registry as metrics_registry
+from app.core.compression import CompressionMiddleware
+from app.core.static import mount_frontend
 from app.api.api_v1.api import api_router
+from app.services.last_login import last_login_buffer
+from app.services.events import event_broker
+from app.core.permissions import AUTH_CHANNEL, auth_versions
+from app.services.reference_data import REFERENCE_CHANNEL, reference_data
+from app.services.revocations import REVOCATION_CHANNEL, token_revocations
+from app.services.survey_preview import preview_cache
+from app.services.survey_templates import TEMPLATE_CHANNEL, template_library
+import logging
 import os
 
+logger = logging.getLogger(__name__)
+
 # Crear aplicacion FastAPI
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version="1.0.0",
     description=f"Sistema de Evaluacion Docente - {settings.INSTITUTION_NAME}",
+    default_response_class=ORJSONResponse,
 )
 
 # Configurar CORS para modo local/híbrido
@@ -21,17 +36,56 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Servir archivos estáticos del frontend en modo local
-if settings.is_local_only:
-    frontend_build_path = os.path.join(os.path.dirname(__file__), "..", "..", "frontend", "build")
-    if os.path.exists(frontend_build_path):
-        app.mount("/static", StaticFiles(directory=os.path.join(frontend_build_path, "static")), name="static")
+# Compresión brotli/gzip de respuestas grandes (listas de usuarios, encuestas)
+app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MIN_SIZE)
+
+# Métricas de latencia y throughput por ruta (expuestas en /metrics)
+app.add_middleware(MetricsMiddleware)
 
 # Incluir rutas de la API
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+# Versiones de autorización: NOTIFY por cambio y recarga completa al (re)conectar
+event_broker.add_handler(AUTH_CHANNEL, auth_versions.apply)
+event_broker.add_connect_handler(auth_versions.load)
+
+# Roles y departamentos: snapshot versionado, recargado por NOTIFY o al (re)conectar
+event_broker.add_handler(REFERENCE_CHANNEL, reference_data.on_notify)
+event_broker.add_connect_handler(reference_data.load)
+
+# Tokens revocados: una entrada por NOTIFY y recarga completa al (re)conectar
+event_broker.add_handler(REVOCATION_CHANNEL, token_revocations.apply)
+event_broker.add_connect_handler(token_revocations.load)
+
+# Templates de encuestas: índice por categoría, recargado con cada alta
+event_broker.add_handler(TEMPLATE_CHANNEL, template_library.on_notify)
+event_broker.add_connect_handler(template_library.load)
+
+@app.on_event("startup")
+async def start_background_jobs():
+    try:
+        reference_data.load()
+        template_library.load()
+    except Exception:
+        # Sin base al arrancar: los datos se cargan en la primera consulta
+        logger.exception("No se pudieron cargar los datos de referencia")
+    last_login_buffer.start(settings.LAST_LOGIN_FLUSH_SECONDS)
+    token_revocations.start(settings.REVOCATION_PURGE_SECONDS)
+    preview_cache.start(settings.PREVIEW_CALIBRATION_SECONDS)
+    event_broker.start()
+
+@app.on_event("shutdown")
+async def stop_background_jobs():
+    event_broker.stop()
+    await token_revocations.stop()
+    await preview_cache.stop()
+    await last_login_buffer.stop()
+
 @app.get("/")
-async def root():
+async def root(request: Request):
+    # Un navegador recibe la SPA; los clientes de la API, la información del sistema
+    if frontend is not None and frontend.index is not None and "text/html" in request.headers.get("accept", ""):
+        return frontend.respond(request, frontend.index)
     return {
         "message": f"Sistema de Evaluacion Docente - {settings.INSTITUTION_NAME}",
         "version": "1.0.0",
@@ -49,6 +103,18 @@ async def health_check():
         "database": "connected"
     }
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """
+    Métricas en formato de texto de Prometheus, del worker que atiende la
+    petición (etiqueta worker con su pid). Con serve.py --workers N cada scrape
+    ve un solo worker: el total es la suma de las series de todos los pids.
+    """
+    return PlainTextResponse(
+        metrics_registry.render(pool=engine.pool),
+        media_type="text/plain; version=0.0.4"
+    )
+
 @app.get("/config")
 async def get_public_config():
     """Configuración pública para el frontend"""
@@ -56,4 +122,16 @@ async def get_public_config():
         "institution_name": settings.INSTITUTION_NAME,
         "network_mode": settings.NETWORK_MODE,
         "enable_web_access": settings.ENABLE_WEB_ACCESS
-    }
\ No newline at end of file
+    }
+
+# Servir el frontend compilado en modo local (el fallback de la SPA responde los 404)
+frontend = None
+if settings.is_local_only:
+    frontend_build_path = os.path.join(os.path.dirname(__file__), "..", "..", "frontend", "build")
+    if os.path.exists(frontend_build_path):
+        frontend = mount_frontend(
+            app,
+            frontend_build_path,
+            api_prefix=settings.API_V1_STR,
+            minimum_size=settings.COMPRESSION_MIN_SIZE,
+        )
@@ -1,10 +1,11 @@
-from sqlalchemy import Column, String, Boolean, DateTime, Integer, ForeignKey, Text, DECIMAL
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Boolean, DateTime, Integer, BigInteger, ForeignKey, Text, DECIMAL, UniqueConstraint, Computed, FetchedValue
+from sqlalchemy.dialects.postgresql import UUID, JSONB, TSVECTOR
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import uuid
 
 from app.core.database import Base
+from app.core.permissions import role_registry
 
 class Role(Base):
     __tablename__ = "roles"
@@ -31,6 +32,12 @@ class Department(Base):
     # Relaciones
     users = relationship("User", back_populates="department")
 
+class ReferenceDataVersion(Base):
+    __tablename__ = "reference_data_version"
+    
+    id = Column(Integer, primary_key=True, default=1)
+    version = Column(BigInteger, nullable=False, default=1)
+
 class User(Base):
     __tablename__ = "users"
     
@@ -48,6 +55,7 @@ class User(Base):
     
     # Estados y timestamps
     is_active = Column(Boolean, default=True)
+    auth_version = Column(Integer, nullable=False, default=1, server_default="1")  # Invalida tokens al cambiar rol
     last_login = Column(DateTime(timezone=True))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -90,20 +98,25 @@ class User(Base):
         """Nombre completo del usuario"""
         return f"{self.first_name} {self.last_name}"
     
+    @property
+    def role_name(self) -> str:
+        """Nombre del rol desde el registro en memoria (sin cargar User.role)"""
+        return role_registry.name(self.role_id)
+    
     @property
     def is_admin(self) -> bool:
         """Verificar si el usuario es administrador"""
-        return self.role.name == "admin"
+        return self.role_name == "admin"
     
     @property
     def is_coordinator(self) -> bool:
         """Verificar si el usuario es coordinador"""
-        return self.role.name == "coordinador"
+        return self.role_name == "coordinador"
     
     @property
     def is_teacher(self) -> bool:
         """Verificar si el usuario es maestro"""
-        return self.role.name == "maestro"
+        return self.role_name == "maestro"
     
     def can_evaluate_user(self, other_user) -> bool:
         """
@@ -150,12 +163,52 @@ class Survey(Base):
     created_by = Column(UUID(as_uuid=True), ForeignKey("users.id"))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # Versión vigente; NULL mientras haya cambios sin versionar
+    current_version_id = Column(UUID(as_uuid=True), ForeignKey("survey_versions.id", use_alter=True, name="surveys_current_version_id_fkey"))
 
     # Relaciones
+    current_version = relationship("SurveyVersion", foreign_keys=[current_version_id], post_update=True)
     questions = relationship("Question", back_populates="survey")
     assignments = relationship("SurveyAssignment", back_populates="survey")
     evaluations = relationship("Evaluation", back_populates="survey")
 
+class SurveyVersion(Base):
+    __tablename__ = "survey_versions"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    survey_id = Column(UUID(as_uuid=True), ForeignKey("surveys.id", ondelete="CASCADE"), nullable=False)
+    version_number = Column(Integer, nullable=False)
+    content_hash = Column(String(64), nullable=False, index=True)  # sha256 del contenido
+    content = Column(JSONB, nullable=False)  # Textos y preguntas tal como se respondieron
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (UniqueConstraint("survey_id", "version_number"),)
+
+class SurveyTemplate(Base):
+    __tablename__ = "survey_templates"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    name = Column(String(255), nullable=False)
+    description = Column(Text, nullable=False)
+    category = Column(String(50), nullable=False, index=True)
+    template_data = Column(JSONB, nullable=False)  # Encuesta completa (SurveyCreate)
+    is_public = Column(Boolean, nullable=False, default=True)
+    created_by = Column(UUID(as_uuid=True), ForeignKey("users.id"))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class QuestionBank(Base):
+    __tablename__ = "question_bank"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    question_text = Column(Text, nullable=False)  # Primera redacción registrada
+    # Clave de deduplicación y búsqueda, calculadas por la base
+    text_hash = Column(String(32), Computed("md5(normalize_question_text(question_text))", persisted=True), unique=True)
+    search_vector = Column(TSVECTOR, Computed("to_tsvector('spanish', question_text)", persisted=True))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Relaciones
+    questions = relationship("Question", back_populates="bank_entry")
+
 class Question(Base):
     __tablename__ = "questions"
 
@@ -167,10 +220,17 @@ class Question(Base):
     is_required = Column(Boolean, default=True)
     min_value = Column(Integer, default=1)
     max_value = Column(Integer, default=10)
+    options = Column(JSONB(none_as_null=True))  # Opciones de multiple choice, etiquetas de escala, etc.
+    # Versión que congeló la pregunta; si no es NULL ya no se modifica
+    survey_version_id = Column(UUID(as_uuid=True), ForeignKey("survey_versions.id"))
+    # Entrada del banco; la asigna el trigger questions_link_bank según el texto
+    bank_id = Column(UUID(as_uuid=True), ForeignKey("question_bank.id"), index=True,
+                     server_default=FetchedValue(), server_onupdate=FetchedValue())
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relaciones
     survey = relationship("Survey", back_populates="questions")
+    bank_entry = relationship("QuestionBank", back_populates="questions")
     answers = relationship("Answer", back_populates="question")
 
 class SurveyAssignment(Base):
@@ -182,6 +242,7 @@ class SurveyAssignment(Base):
     evaluatee_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
     assignment_type = Column(String(20), nullable=False)
     status = Column(String(20), default='pending')
+    survey_version_id = Column(UUID(as_uuid=True), ForeignKey("survey_versions.id"))
     due_date = Column(DateTime(timezone=True))
     assigned_by = Column(UUID(as_uuid=True), ForeignKey("users.id"))
     assigned_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -203,6 +264,7 @@ class Evaluation(Base):
     evaluator_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
     evaluatee_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
     survey_id = Column(UUID(as_uuid=True), ForeignKey("surveys.id"))
+    survey_version_id = Column(UUID(as_uuid=True), ForeignKey("survey_versions.id"), index=True)
     status = Column(String(20), default='in_progress')
     started_at = Column(DateTime(timezone=True), server_default=func.now())
     completed_at = Column(DateTime(timezone=True))
@@ -216,6 +278,33 @@ class Evaluation(Base):
     survey = relationship("Survey", back_populates="evaluations")
     answers = relationship("Answer", back_populates="evaluation")
 
+class ScoreRollup(Base):
+    __tablename__ = "score_rollups"
+
+    # Resumen por evaluado, ciclo y encuesta; se actualiza al completar cada evaluación
+    evaluatee_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    cycle = Column(String(7), primary_key=True)  # "2026-1", ver app/core/cycles.py
+    survey_id = Column(UUID(as_uuid=True), ForeignKey("surveys.id", ondelete="CASCADE"), primary_key=True)
+    evaluation_count = Column(Integer, nullable=False, default=0)
+    score_count = Column(Integer, nullable=False, default=0)  # Evaluaciones con total_score
+    score_sum = Column(DECIMAL(14,2), nullable=False, default=0)
+    score_sq_sum = Column(DECIMAL(18,4), nullable=False, default=0)
+    min_score = Column(DECIMAL(5,2))
+    max_score = Column(DECIMAL(5,2))
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class QuestionScoreRollup(Base):
+    __tablename__ = "question_score_rollups"
+
+    # Resumen de respuestas 1-10 por evaluado, ciclo, encuesta y pregunta del banco
+    evaluatee_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    cycle = Column(String(7), primary_key=True)
+    survey_id = Column(UUID(as_uuid=True), ForeignKey("surveys.id", ondelete="CASCADE"), primary_key=True)
+    bank_id = Column(UUID(as_uuid=True), ForeignKey("question_bank.id"), primary_key=True)
+    answer_count = Column(Integer, nullable=False, default=0)
+    answer_sum = Column(BigInteger, nullable=False, default=0)
+    answer_sq_sum = Column(BigInteger, nullable=False, default=0)
+
 class Answer(Base):
     __tablename__ = "answers"
 
@@ -228,4 +317,14 @@ class Answer(Base):
 
     # Relaciones
     evaluation = relationship("Evaluation", back_populates="answers")
-    question = relationship("Question", back_populates="answers")
\ No newline at end of file
+    question = relationship("Question", back_populates="answers")
+
+
+class TokenRevocation(Base):
+    __tablename__ = "token_revocations"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    jti = Column(String(64), unique=True)  # NULL = revoca todos los tokens del usuario emitidos antes de created_at
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr
 from typing import Optional
 from datetime import datetime
 from uuid import UUID
@@ -8,25 +8,27 @@ class UserLogin(BaseModel):
     email: EmailStr
     password: str
 
-class Token(BaseModel):
-    """Schema para respuesta de token JWT"""
-    access_token: str
-    token_type: str
-    expires_in: int
-    user: "UserBasic"
-
 class UserBasic(BaseModel):
     """Schema básico de usuario para respuestas de auth"""
-    id: str
+    id: UUID
     email: str
     first_name: str
     last_name: str
     role: str
     department: Optional[str] = None
 
+class Token(BaseModel):
+    """Schema para respuesta de token JWT"""
+    access_token: str
+    token_type: str
+    expires_in: int
+    user: UserBasic
+
 class UserResponse(BaseModel):
     """Schema completo de usuario para respuesta"""
-    id: str
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
     email: str
     first_name: str
     last_name: str
@@ -38,21 +40,17 @@ class UserResponse(BaseModel):
     last_login: Optional[datetime] = None
     created_at: datetime
 
-    class Config:
-        from_attributes = True
-
 class ChangePassword(BaseModel):
     """Schema para cambio de password"""
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "current_password": "password_actual",
+            "new_password": "nuevo_password_seguro"
+        }
+    })
+
     current_password: str
     new_password: str
-    
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "current_password": "password_actual",
-                "new_password": "nuevo_password_seguro"
-            }
-        }
 
 class TokenData(BaseModel):
     """Schema para datos del token"""
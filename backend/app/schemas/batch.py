@@ -0,0 +1,42 @@
+# backend/app/schemas/batch.py
+
+from pydantic import BaseModel, Field, field_validator
+from typing import Any, Optional, List
+
+MAX_BATCH_REQUESTS = 20
+
+class BatchRequestItem(BaseModel):
+    """Sub-petición GET dentro de un lote"""
+    id: Optional[str] = None  # Identificador libre para correlacionar la respuesta
+    path: str = Field(..., description="Ruta con query string, p. ej. /api/v1/users/roles/")
+
+    @field_validator('path')
+    @classmethod
+    def validate_path(cls, v):
+        if not v.startswith('/') or '://' in v:
+            raise ValueError('La ruta debe ser relativa al servidor (iniciar con /)')
+        return v
+
+class BatchRequest(BaseModel):
+    """Schema para ejecutar varias peticiones GET en una sola llamada"""
+    requests: List[BatchRequestItem]
+
+    @field_validator('requests')
+    @classmethod
+    def validate_requests(cls, v):
+        if not v:
+            raise ValueError('El lote debe incluir al menos una petición')
+        if len(v) > MAX_BATCH_REQUESTS:
+            raise ValueError(f'El lote admite como máximo {MAX_BATCH_REQUESTS} peticiones')
+        return v
+
+class BatchResponseItem(BaseModel):
+    """Resultado de una sub-petición"""
+    id: Optional[str] = None
+    path: str
+    status: int
+    body: Any = None
+
+class BatchResponse(BaseModel):
+    """Schema de respuesta del lote (en el mismo orden que las peticiones)"""
+    responses: List[BatchResponseItem]
@@ -0,0 +1,82 @@
+# backend/app/schemas/evaluation.py
+
+from pydantic import BaseModel, ConfigDict, field_validator
+from typing import Optional, List
+from datetime import datetime
+from uuid import UUID
+
+# ===== SCHEMAS DE RESPUESTAS =====
+
+class AnswerSubmit(BaseModel):
+    """Schema para una respuesta individual"""
+    question_id: str
+    answer_value: Optional[int] = None
+    answer_text: Optional[str] = None
+
+# ===== SCHEMAS DE EVALUACIONES =====
+
+class EvaluationSubmit(BaseModel):
+    """Schema para enviar una evaluación completa"""
+    survey_id: str
+    evaluatee_id: Optional[str] = None  # Si se omite es autoevaluación
+    assignment_id: Optional[str] = None
+    started_at: Optional[datetime] = None
+    comments: Optional[str] = None
+    answers: List[AnswerSubmit]
+
+    @field_validator('answers')
+    @classmethod
+    def validate_answers(cls, v):
+        if not v:
+            raise ValueError('La evaluación debe incluir al menos una respuesta')
+        question_ids = [answer.question_id for answer in v]
+        if len(question_ids) != len(set(question_ids)):
+            raise ValueError('Cada pregunta solo puede responderse una vez')
+        return v
+
+class EvaluationResponse(BaseModel):
+    """Schema para respuesta de evaluación"""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    survey_id: UUID
+    evaluator_id: UUID
+    evaluatee_id: UUID
+    assignment_id: Optional[UUID] = None
+    status: str
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    total_score: Optional[float] = None
+    comments: Optional[str] = None
+
+# ===== SCHEMAS DE TENDENCIAS =====
+
+class CycleScore(BaseModel):
+    """Resumen de calificaciones de un ciclo en una encuesta"""
+    cycle: str
+    survey_id: UUID
+    survey_title: str
+    evaluation_count: int
+    average_score: Optional[float] = None
+    std_deviation: Optional[float] = None
+    min_score: Optional[float] = None
+    max_score: Optional[float] = None
+
+class QuestionTrendPoint(BaseModel):
+    """Promedio de una pregunta del banco en un ciclo"""
+    cycle: str
+    response_count: int
+    average_score: Optional[float] = None
+    std_deviation: Optional[float] = None
+
+class QuestionTrend(BaseModel):
+    """Serie por ciclo de una pregunta del banco"""
+    bank_id: UUID
+    question_text: str
+    points: List[QuestionTrendPoint]
+
+class ScoreTrend(BaseModel):
+    """Tendencia histórica de un evaluado"""
+    user_id: UUID
+    cycles: List[CycleScore]
+    questions: List[QuestionTrend]
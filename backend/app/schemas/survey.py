@@ -1,6 +1,6 @@
 
 
-from pydantic import BaseModel, validator
+from pydantic import BaseModel, ConfigDict, computed_field, field_validator, ValidationInfo
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from uuid import UUID
@@ -20,22 +20,25 @@ class QuestionBase(BaseModel):
 class QuestionCreate(QuestionBase):
     """Schema para crear pregunta"""
     
-    @validator('question_text')
+    @field_validator('question_text')
+    @classmethod
     def validate_question_text(cls, v):
         if not v or len(v.strip()) < 5:
             raise ValueError('La pregunta debe tener al menos 5 caracteres')
         return v.strip()
     
-    @validator('question_type')
+    @field_validator('question_type')
+    @classmethod
     def validate_question_type(cls, v):
         valid_types = ['scale', 'text', 'multiple_choice', 'yes_no', 'rating']
         if v not in valid_types:
             raise ValueError(f'Tipo de pregunta debe ser uno de: {", ".join(valid_types)}')
         return v
     
-    @validator('min_value', 'max_value')
-    def validate_scale_values(cls, v, values):
-        if values.get('question_type') == 'scale' and v is not None:
+    @field_validator('min_value', 'max_value')
+    @classmethod
+    def validate_scale_values(cls, v, info: ValidationInfo):
+        if info.data.get('question_type') == 'scale' and v is not None:
             if v < 1 or v > 10:
                 raise ValueError('Los valores de escala deben estar entre 1 y 10')
         return v
@@ -50,13 +53,15 @@ class QuestionUpdate(BaseModel):
     max_value: Optional[int] = None
     options: Optional[Dict[str, Any]] = None
     
-    @validator('question_text')
+    @field_validator('question_text')
+    @classmethod
     def validate_question_text(cls, v):
         if v and len(v.strip()) < 5:
             raise ValueError('La pregunta debe tener al menos 5 caracteres')
         return v.strip() if v else None
     
-    @validator('question_type')
+    @field_validator('question_type')
+    @classmethod
     def validate_question_type(cls, v):
         if v:
             valid_types = ['scale', 'text', 'multiple_choice', 'yes_no', 'rating']
@@ -66,7 +71,9 @@ class QuestionUpdate(BaseModel):
 
 class QuestionResponse(BaseModel):
     """Schema para respuesta de pregunta"""
-    id: str
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
     question_text: str
     question_type: str
     order_number: int
@@ -74,16 +81,8 @@ class QuestionResponse(BaseModel):
     min_value: Optional[int] = None
     max_value: Optional[int] = None
     options: Optional[Dict[str, Any]] = None
+    bank_id: Optional[UUID] = None
     created_at: datetime
-    
-    class Config:
-        from_attributes = True
-        
-    @validator('id', pre=True)
-    def convert_uuid_to_string(cls, v):
-        if isinstance(v, UUID):
-            return str(v)
-        return v
 
 # ===== SCHEMAS DE ENCUESTAS =====
 
@@ -98,7 +97,8 @@ class SurveyCreate(SurveyBase):
     """Schema para crear encuesta"""
     questions: Optional[List[QuestionCreate]] = []
     
-    @validator('title')
+    @field_validator('title')
+    @classmethod
     def validate_title(cls, v):
         if not v or len(v.strip()) < 3:
             raise ValueError('El título debe tener al menos 3 caracteres')
@@ -106,13 +106,15 @@ class SurveyCreate(SurveyBase):
             raise ValueError('El título no puede exceder 255 caracteres')
         return v.strip()
     
-    @validator('description')
+    @field_validator('description')
+    @classmethod
     def validate_description(cls, v):
         if v and len(v.strip()) > 1000:
             raise ValueError('La descripción no puede exceder 1000 caracteres')
         return v.strip() if v else None
     
-    @validator('instructions')
+    @field_validator('instructions')
+    @classmethod
     def validate_instructions(cls, v):
         if v and len(v.strip()) > 2000:
             raise ValueError('Las instrucciones no pueden exceder 2000 caracteres')
@@ -125,7 +127,8 @@ class SurveyUpdate(BaseModel):
     instructions: Optional[str] = None
     is_active: Optional[bool] = None
     
-    @validator('title')
+    @field_validator('title')
+    @classmethod
     def validate_title(cls, v):
         if v and (not v or len(v.strip()) < 3):
             raise ValueError('El título debe tener al menos 3 caracteres')
@@ -133,13 +136,15 @@ class SurveyUpdate(BaseModel):
             raise ValueError('El título no puede exceder 255 caracteres')
         return v.strip() if v else None
     
-    @validator('description')
+    @field_validator('description')
+    @classmethod
     def validate_description(cls, v):
         if v and len(v.strip()) > 1000:
             raise ValueError('La descripción no puede exceder 1000 caracteres')
         return v.strip() if v else None
     
-    @validator('instructions')
+    @field_validator('instructions')
+    @classmethod
     def validate_instructions(cls, v):
         if v and len(v.strip()) > 2000:
             raise ValueError('Las instrucciones no pueden exceder 2000 caracteres')
@@ -147,48 +152,40 @@ class SurveyUpdate(BaseModel):
 
 class SurveyResponse(BaseModel):
     """Schema para respuesta de encuesta"""
-    id: str
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
     title: str
     description: Optional[str] = None
     instructions: Optional[str] = None
     is_active: bool
-    created_by: Optional[str] = None
+    created_by: Optional[UUID] = None
     created_at: datetime
     updated_at: datetime
-    
-    class Config:
-        from_attributes = True
-        
-    @validator('id', 'created_by', pre=True)
-    def convert_uuids_to_string(cls, v):
-        if isinstance(v, UUID):
-            return str(v)
-        return v
 
 class SurveyWithQuestions(SurveyResponse):
     """Schema de encuesta con preguntas incluidas"""
     questions: List[QuestionResponse] = []
-    
-    class Config:
-        from_attributes = True
+
+class SurveyVersionResponse(BaseModel):
+    """Schema de una versión inmutable de encuesta (sin el contenido)"""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    version_number: int
+    content_hash: str
+    created_at: datetime
 
 class SurveySummary(BaseModel):
     """Schema resumido de encuesta para listas"""
-    id: str
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
     title: str
     description: Optional[str] = None
     is_active: bool
     question_count: int
     created_at: datetime
-    
-    class Config:
-        from_attributes = True
-        
-    @validator('id', pre=True)
-    def convert_uuid_to_string(cls, v):
-        if isinstance(v, UUID):
-            return str(v)
-        return v
 
 class SurveyList(BaseModel):
     """Schema para lista paginada de encuestas"""
@@ -196,7 +193,11 @@ class SurveyList(BaseModel):
     total: int
     skip: int
     limit: int
-    has_more: bool
+
+    @computed_field
+    @property
+    def has_more(self) -> bool:
+        return (self.skip + self.limit) < self.total
 
 # ===== SCHEMAS PARA TEMPLATES =====
 
@@ -210,15 +211,26 @@ class SurveyTemplate(BaseModel):
 
 class SurveyTemplateResponse(BaseModel):
     """Schema de respuesta para template"""
-    id: str
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
     name: str
     description: str
     category: str
     is_public: bool
     created_at: datetime
+
+class SurveyFromTemplate(BaseModel):
+    """Schema para crear una encuesta a partir de un template"""
+    title: Optional[str] = None  # Por defecto, el título del template
+    is_active: Optional[bool] = None
     
-    class Config:
-        from_attributes = True
+    @field_validator('title')
+    @classmethod
+    def validate_title(cls, v):
+        if v is not None and len(v.strip()) < 3:
+            raise ValueError('El título debe tener al menos 3 caracteres')
+        return v.strip() if v else None
 
 # ===== SCHEMAS PARA ESTADÍSTICAS =====
 
@@ -238,8 +250,34 @@ class QuestionStats(BaseModel):
     question_type: str
     response_count: int
     average_score: Optional[float] = None
+    std_deviation: Optional[float] = None
     response_distribution: Optional[Dict[str, int]] = None
 
+class HeatmapLabel(BaseModel):
+    """Etiqueta de fila o columna del heatmap"""
+    id: str
+    label: str
+
+class DepartmentHeatmap(BaseModel):
+    """Heatmap departamento x pregunta en forma de matriz"""
+    survey_id: UUID
+    version_number: Optional[int] = None
+    cycle: Optional[str] = None
+    rows: List[HeatmapLabel]  # Departamentos
+    columns: List[HeatmapLabel]  # Preguntas
+    values: List[List[Optional[float]]]  # Promedio; None sin respuestas
+    counts: List[List[int]]
+
+# ===== SCHEMAS PARA BANCO DE PREGUNTAS =====
+
+class QuestionBankItem(BaseModel):
+    """Schema de una pregunta del banco en resultados de búsqueda"""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    question_text: str
+    survey_count: int  # Encuestas que la usan actualmente
+
 # ===== SCHEMAS PARA DUPLICAR/COPIAR =====
 
 class SurveyDuplicate(BaseModel):
@@ -248,7 +286,8 @@ class SurveyDuplicate(BaseModel):
     copy_questions: bool = True
     set_active: bool = False
     
-    @validator('new_title')
+    @field_validator('new_title')
+    @classmethod
     def validate_new_title(cls, v):
         if not v or len(v.strip()) < 3:
             raise ValueError('El nuevo título debe tener al menos 3 caracteres')
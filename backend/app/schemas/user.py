@@ -1,10 +1,15 @@
 # backend/app/schemas/user.py
 
-from pydantic import BaseModel, EmailStr, validator
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, AliasChoices, AliasPath, computed_field, field_validator
 from typing import Optional, List
 from datetime import datetime
 from uuid import UUID
 
+# Nombre del rol/departamento: desde la relación ORM (role.name) o desde un dict plano.
+# Se resuelve en pydantic-core, sin validadores Python por fila.
+ROLE_NAME = AliasChoices(AliasPath("role", "name"), "role")
+DEPARTMENT_NAME = AliasChoices(AliasPath("department", "name"), "department")
+
 class UserBase(BaseModel):
     """Schema base de usuario"""
     email: EmailStr
@@ -19,20 +24,23 @@ class UserBase(BaseModel):
 class UserCreate(UserBase):
     """Schema para crear usuario"""
     password: str
-    
-    @validator('password')
+
+    @field_validator('password')
+    @classmethod
     def validate_password(cls, v):
         if len(v) < 6:
             raise ValueError('La contraseña debe tener al menos 6 caracteres')
         return v
-    
-    @validator('first_name', 'last_name')
+
+    @field_validator('first_name', 'last_name')
+    @classmethod
     def validate_names(cls, v):
         if not v or len(v.strip()) < 2:
             raise ValueError('Nombre y apellido deben tener al menos 2 caracteres')
         return v.strip().title()
-    
-    @validator('employee_code')
+
+    @field_validator('employee_code')
+    @classmethod
     def validate_employee_code(cls, v):
         if v and len(v.strip()) < 3:
             raise ValueError('Código de empleado debe tener al menos 3 caracteres')
@@ -49,20 +57,23 @@ class UserUpdate(BaseModel):
     department_id: Optional[int] = None
     is_active: Optional[bool] = None
     password: Optional[str] = None
-    
-    @validator('password')
+
+    @field_validator('password')
+    @classmethod
     def validate_password(cls, v):
         if v and len(v) < 6:
             raise ValueError('La contraseña debe tener al menos 6 caracteres')
         return v
-    
-    @validator('first_name', 'last_name')
+
+    @field_validator('first_name', 'last_name')
+    @classmethod
     def validate_names(cls, v):
         if v and len(v.strip()) < 2:
             raise ValueError('Nombre y apellido deben tener al menos 2 caracteres')
         return v.strip().title() if v else None
-    
-    @validator('employee_code')
+
+    @field_validator('employee_code')
+    @classmethod
     def validate_employee_code(cls, v):
         if v and len(v.strip()) < 3:
             raise ValueError('Código de empleado debe tener al menos 3 caracteres')
@@ -70,69 +81,31 @@ class UserUpdate(BaseModel):
 
 class UserResponse(BaseModel):
     """Schema para respuesta de usuario"""
-    id: str
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
     email: str
     first_name: str
     last_name: str
     employee_code: Optional[str] = None
     phone: Optional[str] = None
-    role: str
-    department: Optional[str] = None
+    role: str = Field(validation_alias=ROLE_NAME)
+    department: Optional[str] = Field(None, validation_alias=DEPARTMENT_NAME)
     is_active: bool
     last_login: Optional[datetime] = None
     created_at: datetime
-    
-    class Config:
-        from_attributes = True
-        
-    @validator('id', pre=True)
-    def convert_uuid_to_string(cls, v):
-        if isinstance(v, UUID):
-            return str(v)
-        return v
-    
-    @validator('role', pre=True)
-    def extract_role_name(cls, v):
-        if hasattr(v, 'name'):
-            return v.name
-        return v
-    
-    @validator('department', pre=True)
-    def extract_department_name(cls, v):
-        if v and hasattr(v, 'name'):
-            return v.name
-        return v
 
 class UserSummary(BaseModel):
     """Schema resumido de usuario para listas"""
-    id: str
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
     email: str
     first_name: str
     last_name: str
-    role: str
-    department: Optional[str] = None
+    role: str = Field(validation_alias=ROLE_NAME)
+    department: Optional[str] = Field(None, validation_alias=DEPARTMENT_NAME)
     is_active: bool
-    
-    class Config:
-        from_attributes = True
-        
-    @validator('id', pre=True)
-    def convert_uuid_to_string(cls, v):
-        if isinstance(v, UUID):
-            return str(v)
-        return v
-    
-    @validator('role', pre=True)
-    def extract_role_name(cls, v):
-        if hasattr(v, 'name'):
-            return v.name
-        return v
-    
-    @validator('department', pre=True)
-    def extract_department_name(cls, v):
-        if v and hasattr(v, 'name'):
-            return v.name
-        return v
 
 class UserList(BaseModel):
     """Schema para lista paginada de usuarios"""
@@ -140,7 +113,11 @@ class UserList(BaseModel):
     total: int
     skip: int
     limit: int
-    has_more: bool
+
+    @computed_field
+    @property
+    def has_more(self) -> bool:
+        return (self.skip + self.limit) < self.total
 
 class RoleSchema(BaseModel):
     """Schema de rol"""
@@ -155,6 +132,32 @@ class DepartmentSchema(BaseModel):
     description: Optional[str] = None
     is_active: bool
 
+class DepartmentCreate(BaseModel):
+    """Schema para crear departamento"""
+    name: str
+    description: Optional[str] = None
+    is_active: bool = True
+
+    @field_validator('name')
+    @classmethod
+    def validate_name(cls, v):
+        if not v or len(v.strip()) < 2:
+            raise ValueError('El nombre del departamento debe tener al menos 2 caracteres')
+        return v.strip()
+
+class DepartmentUpdate(BaseModel):
+    """Schema para actualizar departamento"""
+    name: Optional[str] = None
+    description: Optional[str] = None
+    is_active: Optional[bool] = None
+
+    @field_validator('name')
+    @classmethod
+    def validate_name(cls, v):
+        if v is not None and len(v.strip()) < 2:
+            raise ValueError('El nombre del departamento debe tener al menos 2 caracteres')
+        return v.strip() if v else None
+
 class UserStats(BaseModel):
     """Schema para estadísticas de usuarios"""
     total_users: int
@@ -162,4 +165,4 @@ class UserStats(BaseModel):
     inactive_users: int
     users_by_role: dict
     users_by_department: dict
-    recent_registrations: int
\ No newline at end of file
+    recent_registrations: int
@@ -0,0 +1,149 @@
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List, Set
+
+import psycopg2
+from sqlalchemy import func, select as sql_select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Canal de avance de evaluaciones (una evaluación completada por mensaje)
+PROGRESS_CHANNEL = "evaluation_progress"
+
+
+def notify(db: Session, channel: str, data: dict) -> None:
+    """
+    Encolar un evento en la transacción actual con pg_notify. Postgres solo lo
+    entrega al hacer commit, así que un rollback no publica nada.
+    """
+    db.execute(sql_select(func.pg_notify(channel, json.dumps(data, default=str))))
+
+
+class Subscription:
+    """Cola de eventos de un cliente conectado (p. ej. un stream SSE)"""
+
+    def __init__(self, maxsize: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.overflowed = False
+
+    def put(self, data: dict) -> None:
+        try:
+            self.queue.put_nowait(data)
+        except asyncio.QueueFull:
+            # Cliente lento: se corta su stream para que reconecte y recargue el estado
+            self.overflowed = True
+
+
+class EventBroker:
+    """
+    Pub/sub en proceso alimentado por LISTEN/NOTIFY de Postgres.
+
+    Cada worker mantiene una sola conexión dedicada escuchando los canales; los
+    eventos se reparten en memoria a los suscriptores, así que los clientes
+    conectados no consultan la base.
+    """
+
+    def __init__(self):
+        self._subscriptions: Dict[str, Set[Subscription]] = defaultdict(set)
+        self._handlers: Dict[str, List[Callable[[dict], None]]] = defaultdict(list)
+        self._channels: Set[str] = {PROGRESS_CHANNEL}
+        self._connect_handlers: List[Callable[[], None]] = []
+        self._loop = None
+        self._thread = None
+        self._stopping = threading.Event()
+
+    # ----- Suscripción -----
+
+    def subscribe(self, channel: str, maxsize: int = 100) -> Subscription:
+        subscription = Subscription(maxsize)
+        self._subscriptions[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, channel: str, subscription: Subscription) -> None:
+        self._subscriptions[channel].discard(subscription)
+
+    def add_handler(self, channel: str, handler: Callable[[dict], None]) -> None:
+        """Registrar un callback interno (invalidación de cachés, etc.). Antes de start()"""
+        self._channels.add(channel)
+        self._handlers[channel].append(handler)
+
+    def add_connect_handler(self, handler: Callable[[], None]) -> None:
+        """
+        Callback al (re)conectar el LISTEN, en el hilo del puente. Sirve para
+        recargar estado cuyos NOTIFY pudieron perderse mientras no había conexión.
+        """
+        self._connect_handlers.append(handler)
+
+    def dispatch(self, channel: str, data: dict) -> None:
+        """Repartir un evento a los suscriptores locales (en el event loop)"""
+        for handler in self._handlers.get(channel, ()):
+            try:
+                handler(data)
+            except Exception:
+                logger.exception("Error en el handler del canal %s", channel)
+        for subscription in list(self._subscriptions.get(channel, ())):
+            subscription.put(data)
+
+    # ----- Puente LISTEN/NOTIFY -----
+
+    def _listen(self) -> None:
+        """Hilo dedicado: escucha los canales y reenvía al event loop"""
+        while not self._stopping.is_set():
+            try:
+                conn = psycopg2.connect(settings.database_url)
+            except psycopg2.Error:
+                logger.warning("No se pudo conectar para LISTEN; reintentando")
+                self._stopping.wait(5)
+                continue
+            try:
+                conn.autocommit = True
+                with conn.cursor() as cursor:
+                    for channel in self._channels:
+                        cursor.execute(f'LISTEN "{channel}"')
+                for handler in self._connect_handlers:
+                    try:
+                        handler()
+                    except Exception:
+                        logger.exception("Error recargando estado tras conectar LISTEN")
+                while not self._stopping.is_set():
+                    if select.select([conn], [], [], 1.0) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        message = conn.notifies.pop(0)
+                        try:
+                            data = json.loads(message.payload)
+                        except ValueError:
+                            logger.warning("Evento inválido en %s", message.channel)
+                            continue
+                        self._loop.call_soon_threadsafe(self.dispatch, message.channel, data)
+            except (psycopg2.Error, OSError):
+                logger.exception("Conexión LISTEN perdida; reconectando")
+                time.sleep(1)
+            finally:
+                conn.close()
+
+    def start(self) -> None:
+        """Iniciar el hilo de escucha"""
+        if self._thread is None:
+            self._loop = asyncio.get_running_loop()
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._listen, name="pg-listen", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._stopping.set()
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+event_broker = EventBroker()
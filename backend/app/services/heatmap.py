@@ -0,0 +1,125 @@
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.cycles import cycle_bounds
+from app.core.permissions import auth_versions
+from app.core.scale import SCALE_MAX, SCALE_MIN
+from app.models.user import Answer, Evaluation, Survey, SurveyVersion, User
+from app.services.question_stats import answered_questions, survey_watermark
+
+
+def assemble_matrix(rows: Sequence[tuple], column_index: dict) -> Tuple[list, np.ndarray, np.ndarray]:
+    """
+    Matrices densas departamentos x columnas a partir de las filas
+    (department_id, question_id, promedio, conteo): ids de departamento en
+    orden, promedios (NaN sin respuestas) y conteos. column_index va del id de
+    pregunta (str) a su columna; las filas de otras preguntas se descartan.
+    """
+    rows = [row for row in rows if str(row[1]) in column_index]
+    if not rows:
+        return [], np.full((0, len(column_index)), np.nan), np.zeros((0, len(column_index)), dtype=np.int64)
+
+    departments, question_ids, averages, totals = zip(*rows)
+    department_ids, row_idx = np.unique(np.fromiter(departments, dtype=np.int64, count=len(rows)), return_inverse=True)
+    col_idx = np.fromiter((column_index[str(q)] for q in question_ids), dtype=np.int64, count=len(rows))
+    means = np.full((len(department_ids), len(column_index)), np.nan)
+    counts = np.zeros((len(department_ids), len(column_index)), dtype=np.int64)
+    means[row_idx, col_idx] = np.fromiter(averages, dtype=np.float64, count=len(rows))
+    counts[row_idx, col_idx] = np.fromiter(totals, dtype=np.int64, count=len(rows))
+    return department_ids.tolist(), means, counts
+
+
+def department_heatmap(
+    db: Session,
+    survey_id: str,
+    version: Optional[SurveyVersion] = None,
+    cycle: Optional[str] = None,
+) -> dict:
+    """
+    Promedio por departamento (del evaluado) y pregunta, con su conteo.
+
+    Una sola consulta agrupada (department_id, question_id); la matriz densa
+    departamentos x preguntas se arma con NumPy y las celdas sin respuestas
+    quedan en None. Con versión, las columnas son las preguntas de esa versión.
+    """
+    cells = select(
+        User.department_id, Answer.question_id, func.avg(Answer.answer_value), func.count()
+    ).join(
+        Evaluation, Answer.evaluation_id == Evaluation.id
+    ).join(
+        User, Evaluation.evaluatee_id == User.id
+    ).where(
+        Evaluation.survey_id == survey_id,
+        Evaluation.status == "completed",
+        Answer.answer_value.between(SCALE_MIN, SCALE_MAX),
+        User.department_id.isnot(None),
+    ).group_by(User.department_id, Answer.question_id)
+
+    if version is not None:
+        cells = cells.where(Evaluation.survey_version_id == version.id)
+    if cycle:
+        start, end = cycle_bounds(cycle)
+        cells = cells.where(Evaluation.completed_at >= start, Evaluation.completed_at < end)
+
+    rows = db.execute(cells).all()
+
+    if version is not None:
+        columns = [(q["id"], q["question_text"]) for q in version.content["questions"]]
+    else:
+        answered = {question_id for _, question_id, _, _ in rows}
+        columns = [(str(q_id), text) for q_id, text, _ in answered_questions(db, survey_id, answered)]
+
+    column_index = {question_id: i for i, (question_id, _) in enumerate(columns)}
+    department_ids, means, counts = assemble_matrix(rows, column_index)
+
+    return {
+        "department_ids": department_ids,
+        "columns": columns,
+        "values": np.where(np.isnan(means), None, np.round(means, 2)).tolist(),
+        "counts": counts.tolist(),
+    }
+
+
+class HeatmapCache:
+    """
+    Heatmaps por encuesta, versión y ciclo. La versión fija las columnas; un
+    ciclo ya cerrado no recibe evaluaciones nuevas (completed_at es el momento
+    del envío y no hay borrado de evaluaciones), así que no consulta la marca
+    de agua de la encuesta. Todas las entradas se invalidan cuando algún
+    usuario cambia de departamento (las filas agrupan por el del evaluado).
+    """
+
+    def __init__(self, max_entries: int = 128):
+        self._entries: "OrderedDict[tuple, Tuple[tuple, dict]]" = OrderedDict()
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, survey: Survey, version: Optional[SurveyVersion], cycle: Optional[str]) -> dict:
+        survey_id = str(survey.id)
+        # Sin versión las columnas son las preguntas vigentes (cambian con updated_at)
+        key = (survey_id, version.content_hash if version is not None else survey.updated_at, cycle)
+        closed = cycle is not None and cycle_bounds(cycle)[1] <= datetime.utcnow()
+        watermark = (auth_versions.epoch, *(() if closed else survey_watermark(db, survey_id)))
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == watermark:
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        heatmap = department_heatmap(db, survey_id, version, cycle)
+        with self._lock:
+            self._entries[key] = (watermark, heatmap)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return heatmap
+
+
+heatmap_cache = HeatmapCache()
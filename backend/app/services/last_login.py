@@ -0,0 +1,99 @@
+import asyncio
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+from uuid import UUID
+
+from sqlalchemy import DateTime, column, update, values
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from starlette.concurrency import run_in_threadpool
+
+from app.core.database import SessionLocal
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+
+class LastLoginBuffer:
+    """
+    Buffer write-behind para users.last_login.
+
+    El login solo registra la marca en memoria; un flush periódico escribe todas
+    las marcas pendientes con un único UPDATE ... FROM (VALUES ...).
+    """
+
+    def __init__(self):
+        self._pending: Dict[UUID, datetime] = {}
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, user_id: UUID, when: datetime) -> None:
+        with self._lock:
+            self._pending[user_id] = when
+
+    def pending(self, user_id: UUID) -> Optional[datetime]:
+        """Último login aún no escrito en la base (si lo hay)"""
+        return self._pending.get(user_id)
+
+    def flush(self) -> int:
+        """Escribir las marcas pendientes. Retorna cuántos usuarios se actualizaron"""
+        with self._lock:
+            batch, self._pending = self._pending, {}
+        if not batch:
+            return 0
+
+        rows = values(
+            column("id", PGUUID(as_uuid=True)),
+            column("last_login", DateTime(timezone=True)),
+            name="v",
+        ).data(list(batch.items()))
+
+        db = SessionLocal()
+        try:
+            db.execute(
+                update(User)
+                .where(User.id == rows.c.id)
+                # updated_at se conserva: un login no es una edición del usuario
+                # (onupdate invalidaría los ETags de la lista y del detalle)
+                .values(last_login=rows.c.last_login, updated_at=User.updated_at)
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+        except Exception:
+            db.rollback()
+            # Reencolar sin pisar logins más recientes que llegaron mientras tanto
+            with self._lock:
+                for user_id, when in batch.items():
+                    if user_id not in self._pending:
+                        self._pending[user_id] = when
+            raise
+        finally:
+            db.close()
+        return len(batch)
+
+    async def _run(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await run_in_threadpool(self.flush)
+            except Exception:
+                logger.exception("Error escribiendo last_login en lote")
+
+    def start(self, interval: float) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run(interval))
+
+    async def stop(self) -> None:
+        """Detener el flush periódico y escribir lo pendiente"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await run_in_threadpool(self.flush)
+
+
+last_login_buffer = LastLoginBuffer()
@@ -0,0 +1,166 @@
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.cycles import cycle_bounds
+from app.core.permissions import auth_versions
+from app.core.scale import SCALE_MAX, SCALE_MIN
+from app.models.user import Answer, Evaluation, Question, Survey, SurveyAssignment, User
+
+# Valores de la escala, columnas del histograma
+SCALE_VALUES = np.arange(SCALE_MIN, SCALE_MAX + 1, dtype=np.float64)
+
+
+def answered_questions(db: Session, survey_id: str, answered) -> list:
+    """
+    (id, question_text, question_type) de las preguntas vigentes, en orden, y
+    después las ya separadas de la encuesta que tengan respuestas (answered)
+    """
+    return db.query(
+        Question.id, Question.question_text, Question.question_type
+    ).filter(
+        (Question.survey_id == survey_id) | Question.id.in_(answered)
+    ).order_by(Question.survey_id.is_(None), Question.order_number).all()
+
+
+def pivot_histogram(rows: Sequence[tuple], question_ids: Sequence) -> np.ndarray:
+    """
+    Matriz preguntas x valores (SCALE_MIN..SCALE_MAX) a partir de las filas
+    (question_id, answer_value, conteo) del GROUP BY, en el orden de question_ids
+    """
+    index = {question_id: i for i, question_id in enumerate(question_ids)}
+    counts = np.zeros((len(question_ids), SCALE_MAX - SCALE_MIN + 1), dtype=np.int64)
+    if not rows:
+        return counts
+    ids, values, totals = zip(*rows)
+    # Celda (pregunta, valor) aplanada; bincount suma los conteos en su lugar
+    cells = (
+        np.fromiter((index[q] for q in ids), dtype=np.int64, count=len(rows)) * counts.shape[1]
+        + np.fromiter(values, dtype=np.int64, count=len(rows)) - SCALE_MIN
+    )
+    return np.bincount(
+        cells, weights=np.fromiter(totals, dtype=np.float64, count=len(rows)), minlength=counts.size
+    ).astype(np.int64).reshape(counts.shape)
+
+
+def question_stats(
+    db: Session,
+    survey_id: str,
+    department_id: Optional[int] = None,
+    scope_department: bool = False,
+    cycle: Optional[str] = None,
+    assignment_type: Optional[str] = None,
+) -> List[dict]:
+    """
+    Conteo, promedio, desviación estándar y distribución 1-10 de cada pregunta.
+
+    La base solo entrega el histograma (GROUP BY question_id, answer_value:
+    a lo sumo diez filas por pregunta); el pivoteo y los momentos se calculan
+    con NumPy sobre la matriz preguntas x valores.
+
+    Con scope_department se filtra por department_id aunque sea None
+    (evaluados sin departamento), igual que user_view_rule.
+
+    Incluye las preguntas vigentes y las que ya se separaron de la encuesta
+    (ediciones posteriores) pero tienen respuestas en el filtro.
+    """
+    histogram = select(
+        Answer.question_id, Answer.answer_value, func.count()
+    ).join(
+        Evaluation, Answer.evaluation_id == Evaluation.id
+    ).where(
+        Evaluation.survey_id == survey_id,
+        Evaluation.status == "completed",
+        Answer.answer_value.between(SCALE_MIN, SCALE_MAX),
+    ).group_by(Answer.question_id, Answer.answer_value)
+
+    if scope_department or department_id is not None:
+        histogram = histogram.join(User, Evaluation.evaluatee_id == User.id).where(
+            User.department_id.is_not_distinct_from(department_id)
+        )
+    if cycle:
+        start, end = cycle_bounds(cycle)
+        histogram = histogram.where(Evaluation.completed_at >= start, Evaluation.completed_at < end)
+    if assignment_type:
+        histogram = histogram.join(SurveyAssignment, Evaluation.assignment_id == SurveyAssignment.id).where(
+            SurveyAssignment.assignment_type == assignment_type
+        )
+
+    rows = db.execute(histogram).all()
+    answered = {question_id for question_id, _, _ in rows}
+
+    questions = answered_questions(db, survey_id, answered)
+
+    counts = pivot_histogram(rows, [question_id for question_id, _, _ in questions])
+
+    n = counts.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = counts @ SCALE_VALUES / n
+        # Desviación estándar poblacional: sqrt(E[x²] - E[x]²)
+        std = np.sqrt(np.maximum(counts @ (SCALE_VALUES ** 2) / n - mean ** 2, 0.0))
+
+    labels = [str(value) for value in range(SCALE_MIN, SCALE_MAX + 1)]
+    return [
+        {
+            "question_id": str(question_id),
+            "question_text": question_text,
+            "question_type": question_type,
+            "response_count": int(n[i]),
+            "average_score": round(float(mean[i]), 2) if n[i] else None,
+            "std_deviation": round(float(std[i]), 2) if n[i] else None,
+            "response_distribution": dict(zip(labels, counts[i].tolist())),
+        }
+        for i, (question_id, question_text, question_type) in enumerate(questions)
+    ]
+
+
+def survey_watermark(db: Session, survey_id: str) -> Tuple[int, object]:
+    """
+    Marca de agua de las evaluaciones de una encuesta: conteo y último
+    completed_at (index-only scan). Cambia con cada evaluación nueva o borrada.
+    """
+    return tuple(db.query(func.count(Evaluation.id), func.max(Evaluation.completed_at)).filter(
+        Evaluation.survey_id == survey_id,
+        Evaluation.status == "completed"
+    ).one())
+
+
+class QuestionStatsCache:
+    """
+    Estadísticas ya calculadas por encuesta y filtros, válidas mientras no
+    cambien la marca de agua de la encuesta ni el departamento de algún
+    usuario. Los tableros piden lo mismo muchas veces entre una evaluación y
+    la siguiente.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self._entries: "OrderedDict[tuple, Tuple[tuple, List[dict]]]" = OrderedDict()
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, survey: Survey, **filters) -> List[dict]:
+        survey_id = str(survey.id)
+        key = (survey_id, *sorted(filters.items()))
+        # updated_at cubre las ediciones de preguntas (copias nuevas sin respuestas);
+        # epoch, los cambios de departamento de los evaluados (filtro department_id)
+        watermark = (survey.updated_at, auth_versions.epoch, *survey_watermark(db, survey_id))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == watermark:
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        stats = question_stats(db, survey_id, **filters)
+        with self._lock:
+            self._entries[key] = (watermark, stats)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return stats
+
+
+question_stats_cache = QuestionStatsCache()
@@ -0,0 +1,111 @@
+import asyncio
+import logging
+import threading
+from types import MappingProxyType
+from typing import Mapping, Optional, Tuple
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.core.http_cache import make_etag
+from app.core.permissions import role_registry
+from app.models.user import Role, Department, ReferenceDataVersion
+from app.services.events import notify
+
+logger = logging.getLogger(__name__)
+
+# Canal de NOTIFY con la nueva versión de los datos de referencia
+REFERENCE_CHANNEL = "reference_data"
+
+
+class ReferenceSnapshot:
+    """
+    Foto inmutable de roles y departamentos en una versión dada. Las
+    respuestas de las listas se arman una sola vez por versión.
+    """
+
+    def __init__(self, version: int, roles: Tuple[dict, ...], departments: Tuple[dict, ...]):
+        self.version = version
+        self.roles_by_id: Mapping[int, dict] = MappingProxyType({r["id"]: r for r in roles})
+        self.roles_by_name: Mapping[str, dict] = MappingProxyType({r["name"]: r for r in roles})
+        self.departments_by_id: Mapping[int, dict] = MappingProxyType({d["id"]: d for d in departments})
+        self.departments_by_name: Mapping[str, dict] = MappingProxyType(
+            {d["name"].lower(): d for d in departments}
+        )
+
+        self.role_list = tuple(
+            {"id": r["id"], "name": r["name"], "description": r["description"]} for r in roles
+        )
+        self.department_list = tuple(
+            {"id": d["id"], "name": d["name"], "description": d["description"]}
+            for d in departments if d["is_active"]
+        )
+        self.etag = make_etag("reference", version)
+
+    def role(self, role_id: int) -> Optional[dict]:
+        return self.roles_by_id.get(role_id)
+
+    def department(self, department_id: int) -> Optional[dict]:
+        return self.departments_by_id.get(department_id)
+
+
+class ReferenceData:
+    """
+    Caché de roles y departamentos por worker. Se recarga completa cuando la
+    versión en reference_data_version cambia (NOTIFY o reconexión del LISTEN).
+    """
+
+    def __init__(self):
+        self._snapshot: Optional[ReferenceSnapshot] = None
+        self._lock = threading.Lock()
+
+    @property
+    def snapshot(self) -> ReferenceSnapshot:
+        if self._snapshot is None:
+            self.load()
+        return self._snapshot
+
+    def load(self) -> ReferenceSnapshot:
+        db = SessionLocal()
+        try:
+            version = db.query(ReferenceDataVersion.version).scalar() or 1
+            roles = tuple(
+                {"id": r.id, "name": r.name, "description": r.description}
+                for r in db.query(Role).order_by(Role.id)
+            )
+            departments = tuple(
+                {"id": d.id, "name": d.name, "description": d.description, "is_active": d.is_active}
+                for d in db.query(Department).order_by(Department.name)
+            )
+        finally:
+            db.close()
+
+        snapshot = ReferenceSnapshot(version, roles, departments)
+        with self._lock:
+            # Un NOTIFY viejo que llegue tarde no debe pisar una versión más nueva
+            if self._snapshot is None or snapshot.version >= self._snapshot.version:
+                self._snapshot = snapshot
+                role_registry.update((r["id"], r["name"]) for r in roles)
+        return self._snapshot
+
+    def on_notify(self, data: dict) -> None:
+        """Handler del canal: recargar fuera del event loop si la versión es nueva"""
+        if self._snapshot is None or data.get("version", 0) > self._snapshot.version:
+            asyncio.get_running_loop().run_in_executor(None, self.load)
+
+    def bump(self, db: Session) -> int:
+        """
+        Incrementar la versión dentro de la transacción del cambio y avisar a
+        los demás workers al confirmar
+        """
+        version = db.execute(
+            update(ReferenceDataVersion)
+            .values(version=ReferenceDataVersion.version + 1)
+            .returning(ReferenceDataVersion.version)
+        ).scalar_one()
+        notify(db, REFERENCE_CHANNEL, {"version": version})
+        return version
+
+
+reference_data = ReferenceData()
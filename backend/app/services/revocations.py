@@ -0,0 +1,171 @@
+import asyncio
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.bloom import BloomFilter
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.permissions import Principal
+from app.models.user import TokenRevocation
+from app.services.events import notify
+
+logger = logging.getLogger(__name__)
+
+# Canal de NOTIFY con cada revocación nueva
+REVOCATION_CHANNEL = "token_revocation"
+
+
+class TokenRevocations:
+    """
+    Lista de revocación de tokens por worker, solo en memoria.
+
+    - Tokens revocados (logout): filtro de Bloom + conjunto exacto jti -> exp.
+      Casi todos los tokens no están revocados y el filtro los descarta sin
+      tocar el conjunto.
+    - Revocaciones por usuario: user_id -> (emitidos hasta, expira). Invalida
+      todos los tokens del usuario emitidos hasta ese instante (con
+      microsegundos, igual que el iat de los tokens).
+
+    Se carga completa al (re)conectar el LISTEN y después crece de a una
+    entrada con cada NOTIFY; la purga periódica descarta lo ya expirado.
+    """
+
+    def __init__(self):
+        self._tokens: Dict[str, float] = {}
+        self._users: Dict[str, Tuple[float, float]] = {}
+        self._bloom = BloomFilter(settings.REVOCATION_BLOOM_CAPACITY)
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    # ----- Consulta (camino de cada petición) -----
+
+    def is_revoked(self, principal: Principal) -> bool:
+        jti = principal.jti
+        if jti is not None and jti in self._bloom and jti in self._tokens:
+            return True
+        revoked = self._users.get(principal.id)
+        return revoked is not None and principal.issued_at <= revoked[0]
+
+    # ----- Estado en memoria -----
+
+    def _new_bloom(self, tokens) -> BloomFilter:
+        capacity = max(settings.REVOCATION_BLOOM_CAPACITY, 2 * len(tokens))
+        return BloomFilter.from_keys(tokens, capacity)
+
+    def load(self) -> None:
+        """Recarga completa de las revocaciones vigentes"""
+        db = SessionLocal()
+        try:
+            rows = db.query(TokenRevocation).filter(TokenRevocation.expires_at > func.now()).all()
+        finally:
+            db.close()
+
+        tokens: Dict[str, float] = {}
+        users: Dict[str, Tuple[float, float]] = {}
+        for row in rows:
+            expires = row.expires_at.timestamp()
+            if row.jti:
+                tokens[row.jti] = expires
+            else:
+                user_id = str(row.user_id)
+                before, until = users.get(user_id, (0.0, 0.0))
+                users[user_id] = (max(before, row.created_at.timestamp()), max(until, expires))
+
+        bloom = self._new_bloom(tokens)
+        with self._lock:
+            self._bloom, self._tokens, self._users = bloom, tokens, users
+
+    def apply(self, data: dict) -> None:
+        """Agregar una revocación (handler del canal y el propio worker al confirmar)"""
+        with self._lock:
+            jti = data.get("jti")
+            if jti:
+                if jti not in self._tokens:
+                    self._tokens[jti] = data["expires"]
+                    self._bloom.add(jti)
+                    if self._bloom.full:
+                        self._bloom = self._new_bloom(self._tokens)
+            else:
+                before, until = self._users.get(data["user_id"], (0.0, 0.0))
+                self._users[data["user_id"]] = (max(before, data["revoked_at"]), max(until, data["expires"]))
+
+    def prune(self, now: float) -> None:
+        """Descartar entradas expiradas; el filtro de Bloom se reconstruye (no admite borrados)"""
+        with self._lock:
+            tokens = {jti: expires for jti, expires in self._tokens.items() if expires > now}
+            users = {user_id: entry for user_id, entry in self._users.items() if entry[1] > now}
+            bloom = self._new_bloom(tokens) if len(tokens) < len(self._tokens) else self._bloom
+            self._bloom, self._tokens, self._users = bloom, tokens, users
+
+    # ----- Escritura -----
+
+    def revoke_token(self, db: Session, principal: Principal) -> dict:
+        """
+        Revocar el token del principal dentro de la transacción actual. El
+        llamador aplica el resultado con apply() después del commit.
+        """
+        expires_at = datetime.fromtimestamp(principal.expires_at, timezone.utc)
+        db.add(TokenRevocation(jti=principal.jti, user_id=UUID(principal.id), expires_at=expires_at))
+        data = {"jti": principal.jti, "user_id": principal.id, "expires": expires_at.timestamp()}
+        notify(db, REVOCATION_CHANNEL, data)
+        return data
+
+    def revoke_user(self, db: Session, user_id: str) -> dict:
+        """Revocar todos los tokens emitidos hasta ahora para el usuario"""
+        now = datetime.now(timezone.utc)
+        # Pasada la vida máxima de un token, la fila ya no cubre ninguno vigente
+        expires_at = now + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        db.add(TokenRevocation(user_id=UUID(user_id), expires_at=expires_at, created_at=now))
+        data = {"user_id": user_id, "revoked_at": now.timestamp(), "expires": expires_at.timestamp()}
+        notify(db, REVOCATION_CHANNEL, data)
+        return data
+
+    # ----- Purga periódica -----
+
+    def purge(self) -> int:
+        """Borrar de la tabla y de memoria las revocaciones expiradas"""
+        self.prune(time.time())
+        db = SessionLocal()
+        try:
+            deleted = db.query(TokenRevocation).filter(
+                TokenRevocation.expires_at <= func.now()
+            ).delete(synchronize_session=False)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+        return deleted
+
+    async def _run(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await run_in_threadpool(self.purge)
+            except Exception:
+                logger.exception("Error purgando revocaciones de tokens")
+
+    def start(self, interval: float) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run(interval))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+token_revocations = TokenRevocations()
@@ -0,0 +1,144 @@
+import math
+from typing import Optional
+
+from sqlalchemy import func, literal, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.cycles import cycle_of
+from app.core.scale import SCALE_MAX, SCALE_MIN
+from app.models.user import Answer, Evaluation, Question, QuestionBank, QuestionScoreRollup, ScoreRollup, Survey
+
+ROLLUP_KEY = ("evaluatee_id", "cycle", "survey_id")
+
+
+def record_evaluation(db: Session, evaluation: Evaluation) -> None:
+    """
+    Sumar una evaluación completada a las rollups, dentro de la transacción
+    que la guarda. Dos sentencias INSERT ... ON CONFLICT DO UPDATE, atómicas
+    frente a envíos simultáneos del mismo evaluado; el llamador hace el commit.
+    """
+    # Las respuestas deben estar en la base para el INSERT ... SELECT
+    db.flush()
+
+    key = {
+        "evaluatee_id": evaluation.evaluatee_id,
+        "cycle": cycle_of(evaluation.completed_at),
+        "survey_id": evaluation.survey_id,
+    }
+    score = evaluation.total_score
+
+    summary = insert(ScoreRollup).values(
+        **key,
+        evaluation_count=1,
+        score_count=0 if score is None else 1,
+        score_sum=score or 0,
+        score_sq_sum=(score or 0) * (score or 0),
+        min_score=score,
+        max_score=score,
+    )
+    db.execute(summary.on_conflict_do_update(
+        index_elements=ROLLUP_KEY,
+        set_={
+            "evaluation_count": ScoreRollup.evaluation_count + summary.excluded.evaluation_count,
+            "score_count": ScoreRollup.score_count + summary.excluded.score_count,
+            "score_sum": ScoreRollup.score_sum + summary.excluded.score_sum,
+            "score_sq_sum": ScoreRollup.score_sq_sum + summary.excluded.score_sq_sum,
+            # least/greatest ignoran NULL
+            "min_score": func.least(ScoreRollup.min_score, summary.excluded.min_score),
+            "max_score": func.greatest(ScoreRollup.max_score, summary.excluded.max_score),
+            "updated_at": func.now(),
+        }
+    ))
+
+    by_question = insert(QuestionScoreRollup).from_select(
+        [*ROLLUP_KEY, "bank_id", "answer_count", "answer_sum", "answer_sq_sum"],
+        select(
+            literal(key["evaluatee_id"], QuestionScoreRollup.evaluatee_id.type),
+            literal(key["cycle"], QuestionScoreRollup.cycle.type),
+            literal(key["survey_id"], QuestionScoreRollup.survey_id.type),
+            Question.bank_id,
+            func.count(),
+            func.sum(Answer.answer_value),
+            func.sum(Answer.answer_value * Answer.answer_value),
+        ).join(
+            Question, Answer.question_id == Question.id
+        ).where(
+            Answer.evaluation_id == evaluation.id,
+            Answer.answer_value.between(SCALE_MIN, SCALE_MAX),
+            Question.bank_id.isnot(None),
+        ).group_by(Question.bank_id)
+    )
+    db.execute(by_question.on_conflict_do_update(
+        index_elements=[*ROLLUP_KEY, "bank_id"],
+        set_={
+            "answer_count": QuestionScoreRollup.answer_count + by_question.excluded.answer_count,
+            "answer_sum": QuestionScoreRollup.answer_sum + by_question.excluded.answer_sum,
+            "answer_sq_sum": QuestionScoreRollup.answer_sq_sum + by_question.excluded.answer_sq_sum,
+        }
+    ))
+
+
+def _moments(count, total, squares) -> tuple:
+    """Promedio y desviación estándar poblacional a partir de las sumas"""
+    if not count:
+        return None, None
+    mean = float(total) / count
+    std = math.sqrt(max(float(squares) / count - mean * mean, 0.0))
+    return round(mean, 2), round(std, 2)
+
+
+def score_trend(db: Session, user_id: str, survey_id: Optional[str] = None) -> dict:
+    """
+    Tendencia de un evaluado por ciclo, leída solo de las rollups: una fila
+    por ciclo y encuesta, y una por ciclo y pregunta del banco (sumadas entre
+    encuestas). El costo crece con los ciclos, no con las respuestas.
+    """
+    surveys = db.query(
+        ScoreRollup, Survey.title
+    ).join(
+        Survey, ScoreRollup.survey_id == Survey.id
+    ).filter(ScoreRollup.evaluatee_id == user_id)
+
+    questions = db.query(
+        QuestionScoreRollup.bank_id,
+        QuestionBank.question_text,
+        QuestionScoreRollup.cycle,
+        func.sum(QuestionScoreRollup.answer_count),
+        func.sum(QuestionScoreRollup.answer_sum),
+        func.sum(QuestionScoreRollup.answer_sq_sum),
+    ).join(
+        QuestionBank, QuestionScoreRollup.bank_id == QuestionBank.id
+    ).filter(QuestionScoreRollup.evaluatee_id == user_id)
+
+    if survey_id:
+        surveys = surveys.filter(ScoreRollup.survey_id == survey_id)
+        questions = questions.filter(QuestionScoreRollup.survey_id == survey_id)
+
+    cycles = []
+    for rollup, title in surveys.order_by(ScoreRollup.cycle, Survey.title):
+        average, deviation = _moments(rollup.score_count, rollup.score_sum, rollup.score_sq_sum)
+        cycles.append({
+            "cycle": rollup.cycle,
+            "survey_id": rollup.survey_id,
+            "survey_title": title,
+            "evaluation_count": rollup.evaluation_count,
+            "average_score": average,
+            "std_deviation": deviation,
+            "min_score": rollup.min_score,
+            "max_score": rollup.max_score,
+        })
+
+    series = {}
+    for bank_id, text, cycle, count, total, squares in questions.group_by(
+        QuestionScoreRollup.bank_id, QuestionBank.question_text, QuestionScoreRollup.cycle
+    ).order_by(QuestionBank.question_text, QuestionScoreRollup.cycle):
+        average, deviation = _moments(count, total, squares)
+        series.setdefault(bank_id, {"bank_id": bank_id, "question_text": text, "points": []})["points"].append({
+            "cycle": cycle,
+            "response_count": int(count),
+            "average_score": average,
+            "std_deviation": deviation,
+        })
+
+    return {"user_id": user_id, "cycles": cycles, "questions": list(series.values())}
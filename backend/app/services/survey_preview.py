@@ -0,0 +1,170 @@
+import asyncio
+import logging
+import math
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Sequence, Tuple
+
+from sqlalchemy import func
+from starlette.concurrency import run_in_threadpool
+
+from app.core.database import SessionLocal
+from app.models.user import Evaluation, Question, Survey
+
+logger = logging.getLogger(__name__)
+
+# Modelo base (segundos) antes de calibrar: lectura a ~180 palabras por
+# minuto más el tiempo de contestar según el tipo de pregunta
+READING_CHARS_PER_SECOND = 15.0
+BASE_SECONDS = 20.0
+ANSWER_SECONDS = {
+    "scale": 4.0,
+    "rating": 4.0,
+    "yes_no": 3.0,
+    "multiple_choice": 6.0,
+    "text": 45.0,
+}
+DEFAULT_ANSWER_SECONDS = 5.0
+
+# Duraciones fuera de este rango (sin started_at del cliente, pestañas
+# olvidadas) no sirven para calibrar
+MIN_DURATION_SECONDS = 10
+MAX_DURATION_SECONDS = 2 * 60 * 60
+CALIBRATION_WINDOW_DAYS = 180
+MIN_CALIBRATION_SAMPLES = 20
+SCALE_BOUNDS = (0.25, 4.0)
+
+
+class TimeModel:
+    """
+    Estimación del tiempo de respuesta de una encuesta. El modelo base se
+    multiplica por un factor calibrado con las duraciones reales
+    (completed_at - started_at) de las evaluaciones completadas.
+    """
+
+    def __init__(self, scale: float = 1.0, samples: int = 0):
+        self.scale = scale
+        self.samples = samples
+
+    @staticmethod
+    def base_seconds(instructions: Optional[str], questions: Sequence[Tuple[str, int]]) -> float:
+        """questions: (question_type, largo del texto) por pregunta"""
+        chars = len(instructions or "") + sum(length for _, length in questions)
+        answering = sum(ANSWER_SECONDS.get(kind, DEFAULT_ANSWER_SECONDS) for kind, _ in questions)
+        return BASE_SECONDS + chars / READING_CHARS_PER_SECOND + answering
+
+    def estimate_minutes(self, instructions: Optional[str], questions: Sequence[Tuple[str, int]]) -> int:
+        seconds = self.base_seconds(instructions, questions) * self.scale
+        return max(1, math.ceil(seconds / 60))
+
+
+def calibrate() -> TimeModel:
+    """
+    Factor de escala = mediana ponderada de (duración real / estimación base)
+    por encuesta. Dos consultas agregadas; se ejecuta fuera del request.
+    """
+    db = SessionLocal()
+    try:
+        duration = func.extract("epoch", Evaluation.completed_at - Evaluation.started_at)
+        durations = db.query(
+            Evaluation.survey_id,
+            func.percentile_cont(0.5).within_group(duration),
+            func.count(Evaluation.id),
+        ).filter(
+            Evaluation.status == "completed",
+            Evaluation.completed_at >= func.now() - func.make_interval(0, 0, 0, CALIBRATION_WINDOW_DAYS),
+            duration.between(MIN_DURATION_SECONDS, MAX_DURATION_SECONDS),
+        ).group_by(Evaluation.survey_id).all()
+
+        if sum(count for _, _, count in durations) < MIN_CALIBRATION_SAMPLES:
+            return TimeModel()
+
+        survey_ids = [survey_id for survey_id, _, _ in durations]
+        features: Dict[object, list] = {survey_id: [] for survey_id in survey_ids}
+        for survey_id, kind, length, count in db.query(
+            Question.survey_id, Question.question_type,
+            func.sum(func.length(Question.question_text)), func.count(Question.id),
+        ).filter(Question.survey_id.in_(survey_ids)).group_by(Question.survey_id, Question.question_type):
+            # Agregado por tipo: el largo total se reparte entre sus preguntas
+            features[survey_id].extend([(kind, length / count)] * count)
+        instructions = dict(
+            db.query(Survey.id, Survey.instructions).filter(Survey.id.in_(survey_ids)).all()
+        )
+    finally:
+        db.close()
+
+    ratios = sorted(
+        (median / TimeModel.base_seconds(instructions.get(survey_id), features[survey_id]), count)
+        for survey_id, median, count in durations if features[survey_id]
+    )
+    total = sum(count for _, count in ratios)
+    if total < MIN_CALIBRATION_SAMPLES:
+        return TimeModel()
+
+    accumulated = 0
+    for ratio, count in ratios:
+        accumulated += count
+        if accumulated * 2 >= total:
+            break
+    return TimeModel(scale=min(max(ratio, SCALE_BOUNDS[0]), SCALE_BOUNDS[1]), samples=total)
+
+
+class PreviewCache:
+    """
+    Previews ya armados (preguntas y estimación), por encuesta y versión: el
+    hash del contenido si la encuesta tiene versión vigente, si no updated_at
+    (que cambia también al editar preguntas). Se vacía al recalibrar el
+    modelo de tiempo.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.model = TimeModel()
+        self._entries: "OrderedDict[Tuple[str, object], dict]" = OrderedDict()
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def get(self, survey_id: str, version) -> Optional[dict]:
+        key = (survey_id, version)
+        with self._lock:
+            preview = self._entries.get(key)
+            if preview is not None:
+                self._entries.move_to_end(key)
+            return preview
+
+    def put(self, survey_id: str, version, preview: dict) -> None:
+        with self._lock:
+            self._entries[(survey_id, version)] = preview
+            self._entries.move_to_end((survey_id, version))
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def recalibrate(self) -> None:
+        model = calibrate()
+        with self._lock:
+            self.model = model
+            self._entries.clear()
+
+    async def _run(self, interval: float) -> None:
+        while True:
+            try:
+                await run_in_threadpool(self.recalibrate)
+            except Exception:
+                logger.exception("Error calibrando el modelo de tiempo de encuestas")
+            await asyncio.sleep(interval)
+
+    def start(self, interval: float) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run(interval))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+preview_cache = PreviewCache()
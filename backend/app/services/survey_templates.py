@@ -0,0 +1,164 @@
+import asyncio
+import logging
+import threading
+import uuid
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.core.http_cache import make_etag
+from app.core.permissions import Principal
+from app.models.user import SurveyTemplate
+from app.schemas.survey import SurveyCreate
+from app.services.events import notify
+from app.services.survey_writer import insert_survey
+
+logger = logging.getLogger(__name__)
+
+# Canal de NOTIFY cuando se agrega un template
+TEMPLATE_CHANNEL = "survey_templates"
+
+
+class LoadedTemplate:
+    """Template ya validado, con sus preguntas listas para el INSERT"""
+
+    __slots__ = ("id", "name", "description", "category", "is_public", "created_by", "created_at",
+                 "survey", "questions", "summary")
+
+    def __init__(self, row: SurveyTemplate):
+        data = SurveyCreate.model_validate(row.template_data)
+        self.id = str(row.id)
+        self.name = row.name
+        self.description = row.description
+        self.category = row.category
+        self.is_public = row.is_public
+        self.created_by = str(row.created_by) if row.created_by else None
+        self.created_at = row.created_at
+        self.survey = {
+            "title": data.title,
+            "description": data.description,
+            "instructions": data.instructions,
+            "is_active": data.is_active,
+        }
+        self.questions = tuple(
+            {
+                "question_text": question.question_text,
+                "question_type": question.question_type,
+                "order_number": number,
+                "is_required": question.is_required,
+                "min_value": question.min_value,
+                "max_value": question.max_value,
+                "options": question.options,
+            }
+            for number, question in enumerate(data.questions or [], 1)
+        )
+        self.summary = {
+            "id": self.id,
+            "name": self.name,
+            "description": self.description,
+            "category": self.category,
+            "is_public": self.is_public,
+            "created_at": self.created_at,
+        }
+
+    def visible_to(self, principal: Principal) -> bool:
+        """Públicos para todos; privados solo para su autor y admin"""
+        return self.is_public or principal.is_admin or self.created_by == principal.id
+
+
+class TemplateLibrary:
+    """
+    Índice en memoria de los templates, por id y por categoría. Se carga al
+    arrancar y al (re)conectar el LISTEN, y se recarga con cada alta.
+    """
+
+    def __init__(self):
+        self._by_id: Mapping[str, LoadedTemplate] = MappingProxyType({})
+        self._by_category: Mapping[str, Tuple[LoadedTemplate, ...]] = MappingProxyType({})
+        self._etag: Optional[str] = None
+        self._lock = threading.Lock()
+
+    @property
+    def etag(self) -> str:
+        if self._etag is None:
+            self.load()
+        return self._etag
+
+    def load(self) -> None:
+        db = SessionLocal()
+        try:
+            rows = db.query(SurveyTemplate).order_by(SurveyTemplate.name).all()
+        finally:
+            db.close()
+
+        templates: List[LoadedTemplate] = []
+        for row in rows:
+            try:
+                templates.append(LoadedTemplate(row))
+            except ValueError:
+                logger.exception("Template %s con template_data inválido; se omite", row.id)
+
+        by_category: Dict[str, List[LoadedTemplate]] = {}
+        for template in templates:
+            by_category.setdefault(template.category, []).append(template)
+
+        # Los templates no se editan: conteo y último alta bastan como versión
+        latest = max((t.created_at for t in templates if t.created_at), default=None)
+        with self._lock:
+            self._by_id = MappingProxyType({t.id: t for t in templates})
+            self._by_category = MappingProxyType({k: tuple(v) for k, v in by_category.items()})
+            self._etag = make_etag("templates", len(templates), latest)
+
+    def on_notify(self, data: dict) -> None:
+        """Handler del canal: recargar fuera del event loop"""
+        asyncio.get_running_loop().run_in_executor(None, self.load)
+
+    def get(self, template_id: str) -> Optional[LoadedTemplate]:
+        if self._etag is None:
+            self.load()
+        return self._by_id.get(template_id)
+
+    def list(self, principal: Principal, category: Optional[str] = None) -> List[dict]:
+        if self._etag is None:
+            self.load()
+        if category:
+            templates = self._by_category.get(category, ())
+        else:
+            templates = self._by_id.values()
+        return [t.summary for t in templates if t.visible_to(principal)]
+
+    def create(self, db: Session, name: str, description: str, category: str,
+               template_data: SurveyCreate, is_public: bool, created_by: str) -> SurveyTemplate:
+        """Guardar un template y avisar a los workers al confirmar"""
+        template = SurveyTemplate(
+            name=name,
+            description=description,
+            category=category,
+            template_data=template_data.model_dump(mode="json"),
+            is_public=is_public,
+            created_by=uuid.UUID(created_by),
+        )
+        db.add(template)
+        db.flush()
+        notify(db, TEMPLATE_CHANNEL, {"id": str(template.id)})
+        return template
+
+    def instantiate(self, db: Session, template: LoadedTemplate, title: str,
+                    is_active: bool, created_by: str) -> dict:
+        """Crear la encuesta y todas sus preguntas en una sola sentencia"""
+        return insert_survey(
+            db,
+            {
+                "title": title,
+                "description": template.survey["description"],
+                "instructions": template.survey["instructions"],
+                "is_active": is_active,
+                "created_by": uuid.UUID(created_by),
+            },
+            template.questions,
+        )
+
+
+template_library = TemplateLibrary()
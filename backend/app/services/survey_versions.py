@@ -0,0 +1,125 @@
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Callable, Sequence
+
+import orjson
+from sqlalchemy.orm import Session
+
+from app.core.canonical import content_hash
+from app.models.user import Question, Survey, SurveyVersion
+
+# Campos de la pregunta que forman parte del contenido versionado
+QUESTION_CONTENT_FIELDS = (
+    "question_text", "question_type", "order_number", "is_required",
+    "min_value", "max_value", "options",
+)
+
+
+def version_content(survey: Survey, questions: Sequence[Question]) -> dict:
+    """Contenido de una versión: textos de la encuesta y sus preguntas en orden"""
+    return {
+        "title": survey.title,
+        "description": survey.description,
+        "instructions": survey.instructions,
+        "questions": [
+            {"id": str(question.id), **{field: getattr(question, field) for field in QUESTION_CONTENT_FIELDS}}
+            for question in sorted(questions, key=lambda q: q.order_number)
+        ],
+    }
+
+
+def ensure_version(db: Session, survey: Survey) -> uuid.UUID:
+    """
+    Versión vigente de la encuesta, creándola si hubo cambios desde la última.
+
+    Bloquea la fila de la encuesta para que dos envíos simultáneos no creen la
+    misma versión dos veces. Al crearla congela las preguntas vigentes
+    (survey_version_id): desde ese momento editar su contenido genera una copia. Si el
+    contenido coincide con la última versión (p. ej. un cambio revertido) se
+    reutiliza esa. El llamador hace el commit.
+    """
+    if survey.current_version_id is not None:
+        return survey.current_version_id
+
+    survey = db.query(Survey).filter(Survey.id == survey.id).with_for_update().populate_existing().one()
+    if survey.current_version_id is not None:
+        return survey.current_version_id
+
+    questions = db.query(Question).filter(Question.survey_id == survey.id).all()
+    content = version_content(survey, questions)
+    digest = content_hash(content)
+
+    latest = db.query(SurveyVersion.id, SurveyVersion.version_number, SurveyVersion.content_hash).filter(
+        SurveyVersion.survey_id == survey.id
+    ).order_by(SurveyVersion.version_number.desc()).first()
+
+    if latest is not None and latest.content_hash == digest:
+        version_id = latest.id
+    else:
+        version = SurveyVersion(
+            survey_id=survey.id,
+            version_number=(latest.version_number if latest else 0) + 1,
+            content_hash=digest,
+            content=content,
+        )
+        db.add(version)
+        db.flush()
+        version_id = version.id
+
+    db.query(Question).filter(
+        Question.survey_id == survey.id,
+        Question.survey_version_id.is_(None)
+    ).update({Question.survey_version_id: version_id}, synchronize_session=False)
+    survey.current_version_id = version_id
+    return version_id
+
+
+def thaw_question(db: Session, question: Question) -> Question:
+    """
+    Pregunta editable en lugar de una congelada (copy-on-write).
+
+    Si la pregunta pertenece a una versión se crea una copia viva con un id
+    nuevo y la original se separa de la encuesta (survey_id NULL): las
+    respuestas ya dadas siguen apuntando al texto que se respondió.
+    """
+    if question.survey_version_id is None:
+        return question
+
+    copy = Question(
+        id=uuid.uuid4(),
+        survey_id=question.survey_id,
+        **{field: getattr(question, field) for field in QUESTION_CONTENT_FIELDS},
+    )
+    question.survey_id = None
+    db.add(copy)
+    return copy
+
+
+class VersionPayloads:
+    """
+    Contenido serializado de las versiones, por hash. Una versión no cambia
+    nunca, así que las entradas no se invalidan: solo salen por LRU.
+    """
+
+    def __init__(self, max_entries: int = 512):
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+
+    def get(self, digest: str, load: Callable[[], dict]) -> bytes:
+        with self._lock:
+            payload = self._entries.get(digest)
+            if payload is not None:
+                self._entries.move_to_end(digest)
+                return payload
+
+        payload = orjson.dumps(load())
+        with self._lock:
+            self._entries[digest] = payload
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return payload
+
+
+version_payloads = VersionPayloads()
@@ -0,0 +1,89 @@
+import uuid
+from typing import Sequence
+
+from sqlalchemy import Boolean, Integer, String, Text, cast, column, func, insert, select, true, values
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Session
+
+from app.models.user import Question, Survey
+
+SURVEY_COLUMNS = (
+    Survey.id, Survey.title, Survey.description, Survey.instructions,
+    Survey.is_active, Survey.created_by, Survey.created_at, Survey.updated_at,
+)
+
+QUESTION_COLUMNS = (
+    Question.id, Question.question_text, Question.question_type, Question.order_number,
+    Question.is_required, Question.min_value, Question.max_value, Question.options,
+    Question.bank_id, Question.created_at,
+)
+
+
+def insert_survey(db: Session, survey: dict, questions: Sequence[dict]) -> dict:
+    """
+    Insertar una encuesta y todas sus preguntas en una sola sentencia: un CTE
+    INSERT ... RETURNING para la encuesta y un INSERT de varias filas (VALUES)
+    para las preguntas. Un solo viaje a la base y ninguna fila hidratada como
+    objeto ORM; el llamador hace el commit.
+
+    survey: title, description, instructions, is_active, created_by
+    questions: question_text, question_type, order_number, is_required,
+    min_value, max_value, options
+
+    Retorna la encuesta con sus preguntas (forma de SurveyWithQuestions).
+    """
+    new_survey = insert(Survey).values(id=uuid.uuid4(), **survey).returning(*SURVEY_COLUMNS).cte("new_survey")
+
+    if not questions:
+        row = db.execute(select(new_survey)).one()
+        return {**row._mapping, "questions": []}
+
+    rows = values(
+        column("question_text", Text),
+        column("question_type", String),
+        column("order_number", Integer),
+        column("is_required", Boolean),
+        column("min_value", Integer),
+        column("max_value", Integer),
+        column("options", JSONB(none_as_null=True)),
+        name="new_question_rows",
+    ).data([
+        (q["question_text"], q["question_type"], q["order_number"], q["is_required"],
+         q["min_value"], q["max_value"], q["options"])
+        for q in questions
+    ])
+
+    new_questions = insert(Question).from_select(
+        ["id", "survey_id", "question_text", "question_type", "order_number",
+         "is_required", "min_value", "max_value", "options"],
+        select(
+            func.uuid_generate_v4(),
+            new_survey.c.id,
+            rows.c.question_text,
+            rows.c.question_type,
+            # Los parámetros de VALUES llegan sin tipo: una columna con solo
+            # NULL se infiere como texto, así que se castean todas
+            cast(rows.c.order_number, Integer),
+            cast(rows.c.is_required, Boolean),
+            cast(rows.c.min_value, Integer),
+            cast(rows.c.max_value, Integer),
+            cast(rows.c.options, JSONB),
+        ).select_from(new_survey.join(rows, true())),
+        include_defaults=False
+    ).returning(*QUESTION_COLUMNS).cte("new_questions")
+
+    # Una fila por pregunta, con la encuesta repetida en cada una
+    result = db.execute(
+        select(
+            *new_survey.c,
+            *[new_questions.c[col.name].label(f"question_{col.name}") for col in QUESTION_COLUMNS],
+        ).select_from(new_survey.join(new_questions, true())).order_by(new_questions.c.order_number)
+    ).all()
+
+    prefix = len("question_")
+    created = {col.name: getattr(result[0], col.name) for col in SURVEY_COLUMNS}
+    created["questions"] = [
+        {key[prefix:]: value for key, value in row._mapping.items() if key.startswith("question_")}
+        for row in result
+    ]
+    return created
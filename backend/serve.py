@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+# backend/serve.py
+"""
+Lanzador de producción para Linux (pre-fork).
+
+- Importa la aplicación una sola vez en el proceso maestro (preload) y crea
+  N workers con fork(), todos aceptando conexiones del mismo socket.
+- Cada worker abre su pool de conexiones a la base antes de recibir tráfico.
+- Cada worker se recicla tras WORKER_MAX_REQUESTS peticiones (más un jitter
+  aleatorio) para acotar el crecimiento de memoria; el maestro lo reemplaza.
+- SIGHUP: reinicio escalonado. Se levanta un worker nuevo, se espera a que
+  esté listo y solo entonces se detiene con gracia uno viejo, de uno en uno.
+- SIGTERM / SIGINT: apagado ordenado de todos los workers.
+
+Como la aplicación está precargada, el reinicio escalonado renueva procesos
+(memoria, conexiones) pero no recarga código; para desplegar código nuevo se
+reinicia el maestro.
+
+Uso:
+    cd backend
+    python serve.py                  # configuración desde Settings / .env
+    python serve.py --workers 4 --port 8000
+    kill -HUP <pid del maestro>      # reinicio escalonado sin cortar conexiones
+"""
+
+import argparse
+import logging
+import os
+import random
+import select
+import signal
+import socket
+import sys
+import time
+
+import uvicorn
+
+from app.core.config import settings
+
+logger = logging.getLogger("serve")
+
+READY_TIMEOUT = 60  # Segundos que se espera a que un worker nuevo esté listo
+
+
+class WorkerServer(uvicorn.Server):
+    """Servidor uvicorn que avisa al maestro cuando terminó de arrancar"""
+
+    def __init__(self, config: uvicorn.Config, ready_fd: int):
+        super().__init__(config)
+        self.ready_fd = ready_fd
+
+    async def startup(self, sockets=None) -> None:
+        await super().startup(sockets=sockets)
+        try:
+            if self.started:
+                os.write(self.ready_fd, b"1")
+        except BrokenPipeError:  # El maestro no esperaba el aviso (reemplazo tras reciclaje)
+            pass
+        os.close(self.ready_fd)
+
+
+def run_worker(app, sock: socket.socket, ready_fd: int, max_requests: int) -> None:
+    """Cuerpo del proceso hijo. No retorna"""
+    for sig in (signal.SIGHUP, signal.SIGCHLD, signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, signal.SIG_DFL)
+
+    from app.core.database import engine, warm_pool
+
+    # Las conexiones heredadas del maestro no se comparten entre procesos
+    engine.dispose(close=False)
+    try:
+        warm_pool()
+    except Exception:
+        logger.exception("No se pudo precalentar el pool de la base de datos")
+
+    config = uvicorn.Config(
+        app,
+        limit_max_requests=max_requests or None,
+        timeout_graceful_shutdown=settings.WORKER_GRACEFUL_TIMEOUT,
+        proxy_headers=True,
+        log_level="info",
+    )
+    WorkerServer(config, ready_fd).run(sockets=[sock])
+    os._exit(0)
+
+
+class Master:
+    """Proceso maestro: crea, vigila y reemplaza workers"""
+
+    def __init__(self, app, sock: socket.socket, workers: int):
+        self.app = app
+        self.sock = sock
+        self.workers = workers
+        self.children = {}  # pid -> instante de arranque
+        self.signals = []
+        self.stopping = False
+
+    def spawn(self) -> tuple:
+        """Crear un worker. Retorna (pid, fd de lectura del aviso de listo)"""
+        max_requests = settings.WORKER_MAX_REQUESTS
+        if max_requests:
+            max_requests += random.randint(0, settings.WORKER_MAX_REQUESTS_JITTER)
+
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            try:
+                run_worker(self.app, self.sock, write_fd, max_requests)
+            finally:
+                os._exit(1)
+
+        os.close(write_fd)
+        self.children[pid] = time.monotonic()
+        logger.info("Worker %s iniciado (max_requests=%s)", pid, max_requests or "sin límite")
+        return pid, read_fd
+
+    def wait_ready(self, pid: int, read_fd: int) -> bool:
+        try:
+            ready, _, _ = select.select([read_fd], [], [], READY_TIMEOUT)
+            return bool(ready) and os.read(read_fd, 1) == b"1"
+        except InterruptedError:
+            return False
+        finally:
+            os.close(read_fd)
+
+    def stop_worker(self, pid: int, timeout: float) -> None:
+        """SIGTERM (cierre ordenado de uvicorn) y SIGKILL si no termina a tiempo"""
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+        self.wait_exit(pid, timeout)
+
+    def wait_exit(self, pid: int, timeout: float) -> None:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                done, _ = os.waitpid(pid, os.WNOHANG)
+            except ChildProcessError:
+                done = pid
+            if done:
+                self.children.pop(pid, None)
+                return
+            time.sleep(0.1)
+        logger.warning("Worker %s no terminó a tiempo; forzando cierre", pid)
+        try:
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+        except (ProcessLookupError, ChildProcessError):
+            pass
+        self.children.pop(pid, None)
+
+    def reap(self) -> None:
+        """Recoger workers terminados (reciclados por max_requests o caídos) y reemplazarlos"""
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if not pid:
+                return
+            started = self.children.pop(pid, None)
+            if started is None or self.stopping:
+                continue
+            code = os.waitstatus_to_exitcode(status)
+            logger.info("Worker %s terminó (código %s); reemplazándolo", pid, code)
+            # Evitar un ciclo de reinicios si el worker falla al arrancar
+            if time.monotonic() - started < 1:
+                time.sleep(1)
+            _, read_fd = self.spawn()
+            os.close(read_fd)
+
+    def rolling_restart(self) -> None:
+        logger.info("Reinicio escalonado de %s workers", len(self.children))
+        for old_pid in list(self.children):
+            pid, read_fd = self.spawn()
+            if not self.wait_ready(pid, read_fd):
+                logger.error("El worker %s no quedó listo; se cancela el reinicio", pid)
+                return
+            self.stop_worker(old_pid, settings.WORKER_GRACEFUL_TIMEOUT)
+
+    def shutdown(self) -> None:
+        self.stopping = True
+        logger.info("Deteniendo %s workers", len(self.children))
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in list(self.children):
+            self.wait_exit(pid, settings.WORKER_GRACEFUL_TIMEOUT)
+
+    def run(self) -> None:
+        for sig in (signal.SIGHUP, signal.SIGTERM, signal.SIGINT, signal.SIGCHLD):
+            signal.signal(sig, lambda signum, frame: self.signals.append(signum))
+
+        for _ in range(self.workers):
+            pid, read_fd = self.spawn()
+            if not self.wait_ready(pid, read_fd):
+                logger.warning("El worker %s no confirmó su arranque", pid)
+        logger.info("Maestro %s atendiendo con %s workers", os.getpid(), self.workers)
+
+        while True:
+            while self.signals:
+                signum = self.signals.pop(0)
+                if signum in (signal.SIGTERM, signal.SIGINT):
+                    self.shutdown()
+                    return
+                if signum == signal.SIGHUP:
+                    self.rolling_restart()
+            self.reap()
+            time.sleep(0.5)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor de producción con múltiples workers (Linux)")
+    parser.add_argument("--host", default=settings.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    parser.add_argument("--workers", type=int, default=settings.WEB_WORKERS,
+                        help="Cantidad de workers (0 = uno por núcleo de CPU)")
+    args = parser.parse_args(argv)
+
+    if not hasattr(os, "fork"):
+        sys.exit("serve.py requiere Linux; en Windows use iniciar_sistema.bat")
+
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s [%(process)d] %(levelname)s %(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    workers = args.workers or os.cpu_count() or 1
+
+    # Socket compartido: se crea antes del fork y todos los workers aceptan de él
+    sock = socket.create_server((args.host, args.port), backlog=2048)
+    sock.set_inheritable(True)
+
+    # Precarga: la aplicación se importa una vez y los workers la heredan
+    from app.main import app
+
+    logger.info("Escuchando en http://%s:%s", args.host, args.port)
+    Master(app, sock, workers).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+import pytest
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.core.database import engine
+
+
+@pytest.fixture
+def db():
+    """
+    Sesión sobre la base configurada, dentro de una transacción que se deshace
+    al terminar (los commits del código probado quedan como savepoints). Sin
+    base disponible la prueba se omite.
+    """
+    try:
+        connection = engine.connect()
+    except OperationalError:
+        pytest.skip("Base de datos no disponible")
+    transaction = connection.begin()
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
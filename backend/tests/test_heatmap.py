@@ -0,0 +1,60 @@
+import uuid
+from decimal import Decimal
+from types import SimpleNamespace
+
+import numpy as np
+
+from app.core.permissions import auth_versions
+from app.services import heatmap as heatmap_module
+from app.services.heatmap import HeatmapCache, assemble_matrix
+
+
+def test_assemble_matrix_ordena_departamentos_y_deja_huecos_en_nan():
+    q1, q2, q3 = (uuid.uuid4() for _ in range(3))
+    column_index = {str(q1): 0, str(q2): 1, str(q3): 2}
+    rows = [
+        (7, q2, Decimal("8.5"), 10),
+        (3, q1, Decimal("6.25"), 4),
+        (7, q1, Decimal("9"), 2),
+    ]
+
+    department_ids, means, counts = assemble_matrix(rows, column_index)
+
+    assert department_ids == [3, 7]
+    np.testing.assert_array_equal(means, [[6.25, np.nan, np.nan], [9.0, 8.5, np.nan]])
+    assert counts.tolist() == [[4, 0, 0], [2, 10, 0]]
+
+
+def test_assemble_matrix_descarta_preguntas_fuera_de_las_columnas():
+    q1, other = uuid.uuid4(), uuid.uuid4()
+
+    department_ids, means, counts = assemble_matrix([(1, other, 5.0, 3), (2, q1, 7.0, 1)], {str(q1): 0})
+
+    assert department_ids == [2]
+    assert means.tolist() == [[7.0]]
+    assert counts.tolist() == [[1]]
+
+
+def test_assemble_matrix_sin_filas():
+    department_ids, means, counts = assemble_matrix([], {"a": 0, "b": 1})
+
+    assert department_ids == []
+    assert means.shape == (0, 2)
+    assert counts.shape == (0, 2)
+
+
+def test_cache_de_ciclo_cerrado_se_invalida_al_cambiar_el_departamento_de_un_usuario(monkeypatch):
+    calls = []
+    monkeypatch.setattr(heatmap_module, "survey_watermark", lambda db, survey_id: calls.append("watermark"))
+    monkeypatch.setattr(heatmap_module, "department_heatmap", lambda db, survey_id, version, cycle: calls.append("heatmap") or {})
+    cache = HeatmapCache()
+    survey = SimpleNamespace(id="s1", updated_at="2025-01-01")
+
+    cache.get(None, survey, None, "2020-1")
+    cache.get(None, survey, None, "2020-1")
+    # Ciclo cerrado: ni recálculo ni consulta de la marca de agua
+    assert calls == ["heatmap"]
+
+    auth_versions.apply({"user_id": "u1", "version": 2})
+    cache.get(None, survey, None, "2020-1")
+    assert calls == ["heatmap", "heatmap"]
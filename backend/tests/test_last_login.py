@@ -0,0 +1,28 @@
+import uuid
+from datetime import datetime
+
+from app.models.user import Role, User
+from app.services import last_login as last_login_module
+from app.services.last_login import LastLoginBuffer
+
+
+def test_flush_escribe_last_login_sin_tocar_updated_at(db, monkeypatch):
+    role_id = db.query(Role.id).filter(Role.name == "maestro").scalar()
+    user = User(email=f"login.{uuid.uuid4().hex[:8]}@prueba.local", hashed_password="x",
+                first_name="Login", last_name="Prueba", role_id=role_id,
+                # Fecha fija: now() no avanza dentro de la transacción de la prueba
+                updated_at=datetime(2020, 1, 1))
+    db.add(user)
+    db.commit()
+    user_id = user.id
+
+    # flush() abre su propia sesión; se usa la de la prueba para deshacer al final
+    monkeypatch.setattr(last_login_module, "SessionLocal", lambda: db)
+    buffer = LastLoginBuffer()
+    when = datetime(2026, 5, 4, 12, 30)
+    buffer.record(user_id, when)
+
+    assert buffer.flush() == 1
+    last_login, updated_at = db.query(User.last_login, User.updated_at).filter(User.id == user_id).one()
+    assert last_login == when
+    assert updated_at == datetime(2020, 1, 1)
@@ -0,0 +1,35 @@
+from app.api.api_v1.endpoints.evaluations import progress_filter
+from app.core.permissions import ROLE_PERMISSIONS, Principal
+
+EVENTS = [
+    {"survey_id": "s1", "department_id": 1},
+    {"survey_id": "s1", "department_id": 2},
+    {"survey_id": "s2", "department_id": None},
+]
+
+
+def principal(role: str, department_id=None) -> Principal:
+    return Principal("u1", "u1@example.com", role, department_id, int(ROLE_PERMISSIONS[role]), 1)
+
+
+def delivered(matches) -> list:
+    return [event for event in EVENTS if matches(event)]
+
+
+def test_coordinador_sin_departamento_solo_recibe_eventos_sin_departamento():
+    matches = progress_filter(principal("coordinador"), None, None)
+    assert delivered(matches) == [EVENTS[2]]
+
+
+def test_coordinador_no_puede_pedir_otro_departamento():
+    matches = progress_filter(principal("coordinador", 1), None, 2)
+    assert delivered(matches) == [EVENTS[0]]
+
+
+def test_admin_sin_filtro_recibe_todo():
+    assert delivered(progress_filter(principal("admin"), None, None)) == EVENTS
+
+
+def test_admin_filtra_por_departamento_y_encuesta():
+    assert delivered(progress_filter(principal("admin"), None, 2)) == [EVENTS[1]]
+    assert delivered(progress_filter(principal("admin"), "s2", None)) == [EVENTS[2]]
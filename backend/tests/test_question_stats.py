@@ -0,0 +1,48 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from app.core.permissions import auth_versions
+from app.services import question_stats as question_stats_module
+from app.services.question_stats import SCALE_MAX, SCALE_MIN, QuestionStatsCache, pivot_histogram
+
+
+def test_pivot_histogram_ubica_cada_conteo_en_su_celda():
+    rows = [("b", 10, 4), ("a", 1, 2), ("a", 7, 5), ("b", 3, 1)]
+
+    counts = pivot_histogram(rows, ["a", "b", "c"])
+
+    assert counts.shape == (3, SCALE_MAX - SCALE_MIN + 1)
+    assert counts.dtype == np.int64
+    assert counts[0].tolist() == [2, 0, 0, 0, 0, 0, 5, 0, 0, 0]
+    assert counts[1].tolist() == [0, 0, 1, 0, 0, 0, 0, 0, 0, 4]
+    # Pregunta sin respuestas: fila en cero
+    assert counts[2].tolist() == [0] * 10
+
+
+def test_pivot_histogram_sin_filas():
+    counts = pivot_histogram([], ["a", "b"])
+    assert counts.shape == (2, 10)
+    assert not counts.any()
+
+
+def test_pivot_histogram_conteos_grandes_sin_perdida():
+    counts = pivot_histogram([("a", 5, 3_000_000_001)], ["a"])
+    assert counts[0, 5 - SCALE_MIN] == 3_000_000_001
+
+
+def test_cache_se_invalida_al_cambiar_el_departamento_de_un_usuario(monkeypatch):
+    calls = []
+    monkeypatch.setattr(question_stats_module, "survey_watermark", lambda db, survey_id: (10, "2025-03-10"))
+    monkeypatch.setattr(question_stats_module, "question_stats", lambda db, survey_id, **filters: calls.append(filters) or [])
+    cache = QuestionStatsCache()
+    survey = SimpleNamespace(id="s1", updated_at="2025-01-01")
+
+    cache.get(None, survey, department_id=3)
+    cache.get(None, survey, department_id=3)
+    assert len(calls) == 1
+
+    # NOTIFY de bump_auth_version (p. ej. el evaluado cambió de departamento)
+    auth_versions.apply({"user_id": "u1", "version": 2})
+    cache.get(None, survey, department_id=3)
+    assert len(calls) == 2
@@ -0,0 +1,162 @@
+import math
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.api_v1.api import api_router
+from app.core.config import settings
+from app.core.database import get_db
+from app.core.permissions import ROLE_PERMISSIONS
+from app.core.security import create_access_token
+from app.models.user import (
+    Answer, Department, Evaluation, Question, QuestionScoreRollup, Role, ScoreRollup, Survey, User,
+)
+from app.services.score_rollups import _moments, record_evaluation
+
+
+def test_moments_sin_datos():
+    assert _moments(0, 0, 0) == (None, None)
+    assert _moments(None, None, None) == (None, None)
+
+
+def test_moments_coincide_con_el_calculo_directo():
+    values = [6, 9, 7, 10, 3]
+    mean = sum(values) / len(values)
+    std = math.sqrt(sum((v - mean) ** 2 for v in values) / len(values))
+
+    assert _moments(len(values), sum(values), sum(v * v for v in values)) == (round(mean, 2), round(std, 2))
+
+
+def test_moments_acepta_decimal_de_la_base():
+    # score_sum/score_sq_sum llegan como Decimal desde NUMERIC (puntajes 7.5 y 8)
+    assert _moments(2, Decimal("15.50"), Decimal("120.25")) == (7.75, 0.25)
+
+
+def test_moments_no_devuelve_varianza_negativa_por_redondeo():
+    # E[x²] - E[x]² puede quedar apenas bajo cero con valores iguales
+    average, deviation = _moments(3, 3 * 8.1, 3 * 8.1 * 8.1 - 1e-9)
+    assert average == pytest.approx(8.1)
+    assert deviation == 0.0
+
+
+# ----- Con base de datos -----
+
+@pytest.fixture
+def school(db):
+    """Dos departamentos con un coordinador y un maestro cada uno, y una encuesta de escala"""
+    roles = {name: role_id for role_id, name in db.query(Role.id, Role.name)}
+    departments = [Department(name=f"Depto prueba {uuid.uuid4().hex[:8]}") for _ in range(2)]
+    db.add_all(departments)
+    db.flush()
+
+    def user(role, department):
+        tag = uuid.uuid4().hex[:8]
+        return User(
+            email=f"{role}.{tag}@prueba.local", hashed_password="x", first_name=role,
+            last_name=tag, role_id=roles[role], department_id=department.id,
+        )
+
+    users = {
+        "coord_a": user("coordinador", departments[0]),
+        "teacher_a": user("maestro", departments[0]),
+        "coord_b": user("coordinador", departments[1]),
+        "teacher_b": user("maestro", departments[1]),
+    }
+    db.add_all(users.values())
+
+    survey = Survey(title=f"Rollups {uuid.uuid4().hex[:8]}")
+    db.add(survey)
+    db.flush()
+    questions = [
+        Question(survey_id=survey.id, question_text=f"Pregunta de prueba {uuid.uuid4().hex} {n}",
+                 question_type="scale", order_number=n)
+        for n in (1, 2)
+    ]
+    db.add_all(questions)
+    db.flush()
+    for question in questions:
+        db.refresh(question)  # bank_id lo asigna el trigger
+    return {"survey": survey, "questions": questions, **users}
+
+
+def submit(db, school, evaluatee, values, total_score, completed_at):
+    evaluation = Evaluation(
+        evaluator_id=school["coord_a"].id, evaluatee_id=evaluatee.id, survey_id=school["survey"].id,
+        status="completed", completed_at=completed_at, total_score=total_score,
+    )
+    db.add(evaluation)
+    db.flush()
+    db.add_all([
+        Answer(evaluation_id=evaluation.id, question_id=question.id, answer_value=value)
+        for question, value in zip(school["questions"], values)
+    ])
+    record_evaluation(db, evaluation)
+    return evaluation
+
+
+def test_record_evaluation_acumula_en_la_misma_fila(db, school):
+    teacher = school["teacher_a"]
+    submit(db, school, teacher, [7, 8], Decimal("7.50"), datetime(2025, 3, 10))
+    submit(db, school, teacher, [9, 9], Decimal("9.00"), datetime(2025, 5, 2))
+    submit(db, school, teacher, [6, 4], None, datetime(2025, 6, 30))
+    submit(db, school, teacher, [10, 10], Decimal("10.00"), datetime(2025, 8, 1))
+
+    first = db.query(ScoreRollup).filter_by(
+        evaluatee_id=teacher.id, cycle="2025-1", survey_id=school["survey"].id
+    ).one()
+    db.refresh(first)
+    assert first.evaluation_count == 3
+    # La evaluación sin total_score cuenta como evaluación pero no como puntaje
+    assert first.score_count == 2
+    assert first.score_sum == Decimal("16.50")
+    assert first.score_sq_sum == Decimal("137.25")
+    assert (first.min_score, first.max_score) == (Decimal("7.50"), Decimal("9.00"))
+
+    second = db.query(ScoreRollup).filter_by(evaluatee_id=teacher.id, cycle="2025-2").one()
+    assert (second.evaluation_count, second.score_sum) == (1, Decimal("10.00"))
+
+    by_question = {
+        row.bank_id: (row.answer_count, row.answer_sum, row.answer_sq_sum)
+        for row in db.query(QuestionScoreRollup).filter_by(evaluatee_id=teacher.id, cycle="2025-1")
+    }
+    q1, q2 = (question.bank_id for question in school["questions"])
+    assert by_question == {q1: (3, 22, 166), q2: (3, 21, 161)}
+
+
+def token_for(user, role: str) -> dict:
+    claims = {
+        "sub": str(user.id), "email": user.email, "role": role, "dept": user.department_id,
+        "perm": int(ROLE_PERMISSIONS[role]), "ver": 1,
+    }
+    return {"Authorization": f"Bearer {create_access_token(claims, timedelta(minutes=5))}"}
+
+
+@pytest.fixture
+def client(db):
+    app = FastAPI()
+    app.include_router(api_router, prefix=settings.API_V1_STR)
+    app.dependency_overrides[get_db] = lambda: db
+    return TestClient(app)
+
+
+def test_score_trend_respeta_el_alcance_del_usuario(db, school, client):
+    teacher = school["teacher_a"]
+    submit(db, school, teacher, [7, 8], Decimal("7.50"), datetime(2025, 3, 10))
+    url = f"{settings.API_V1_STR}/users/{teacher.id}/score-trend"
+
+    own = client.get(url, headers=token_for(teacher, "maestro"))
+    assert own.status_code == 200
+    assert [c["cycle"] for c in own.json()["cycles"]] == ["2025-1"]
+    assert own.json()["cycles"][0]["average_score"] == 7.5
+
+    assert client.get(url, headers=token_for(school["coord_a"], "coordinador")).status_code == 200
+    assert client.get(url, headers=token_for(school["teacher_b"], "maestro")).status_code == 403
+    assert client.get(url, headers=token_for(school["coord_b"], "coordinador")).status_code == 403
+    assert client.get(url).status_code == 401
+
+    missing = f"{settings.API_V1_STR}/users/{uuid.uuid4()}/score-trend"
+    assert client.get(missing, headers=token_for(school["coord_a"], "admin")).status_code == 404
@@ -0,0 +1,56 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.api_v1.api import api_router
+from app.core.config import settings
+from app.core.static import mount_frontend
+
+INDEX = b"<!doctype html><html><body><div id=root></div></body></html>"
+
+
+@pytest.fixture
+def client(tmp_path):
+    (tmp_path / "index.html").write_bytes(INDEX)
+    (tmp_path / "manifest.json").write_text('{"name": "evaluacion"}')
+    (tmp_path / "static" / "css").mkdir(parents=True)
+    (tmp_path / "static" / "css" / "main.3f2a1b4c.css").write_text("body { margin: 0; }")
+
+    app = FastAPI()
+    app.include_router(api_router, prefix=settings.API_V1_STR)
+    mount_frontend(app, str(tmp_path), api_prefix=settings.API_V1_STR)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("method", ["GET", "POST"])
+def test_api_sin_barra_final_redirige(client, method):
+    # api.js llama /users, /surveys... sin la barra final
+    response = client.request(method, "/api/v1/users", follow_redirects=False)
+    assert response.status_code == 307
+    assert response.headers["location"].endswith("/api/v1/users/")
+
+
+def test_api_inexistente_es_404_json(client):
+    response = client.get("/api/v1/no-existe")
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Not Found"}
+
+
+def test_rutas_de_la_spa_sirven_index(client):
+    response = client.get("/evaluaciones/123")
+    assert response.status_code == 200
+    assert response.content == INDEX
+    assert response.headers["content-type"] == "text/html; charset=utf-8"
+
+
+def test_archivos_de_la_raiz_del_build(client):
+    assert client.get("/manifest.json").json() == {"name": "evaluacion"}
+    assert client.get("/no-existe.js").status_code == 404
+
+
+def test_assets_con_hash(client):
+    response = client.get("/static/css/main.3f2a1b4c.css")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "text/css; charset=utf-8"
+    assert "immutable" in response.headers["cache-control"]
+    assert client.get("/static/css/otro.css").status_code == 404
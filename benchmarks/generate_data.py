@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+Generador de datos sinteticos de alto volumen para benchmarks.
+
+Crea una institucion realista sobre una base ya inicializada (schema + seeds):
+departamentos, coordinadores y maestros, encuestas con preguntas, y por cada
+ciclo (semestre) las asignaciones de autoevaluacion y evaluacion del
+coordinador con sus evaluaciones y respuestas.
+
+Todo se carga con COPY en una sola transaccion y es determinista para una
+semilla dada (los UUID se derivan de la semilla y de un contador). Los valores
+por defecto producen ~1M de respuestas.
+
+Uso:
+    python benchmarks/generate_data.py
+    python benchmarks/generate_data.py --departments 50 --users 2500 --cycles 10 --seed 7
+    python benchmarks/generate_data.py --seed 7 --replace   # regenerar la misma semilla
+"""
+
+import argparse
+import io
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Iterable, List
+
+import psycopg2
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend")
+sys.path.insert(0, BACKEND_DIR)
+
+from app.core.config import settings  # noqa: E402
+
+# Hash bcrypt de "admin123" (el mismo que usa el instalador)
+DEFAULT_PASSWORD_HASH = "$2b$12$LQv3c1yqBWVHxkd0LHAkCOYz6TtxMQJqhN8/LewUQcSKbBfN8Ujmm"
+
+# Tipos de entidad codificados en los UUID deterministas
+KIND_USER, KIND_SURVEY, KIND_QUESTION, KIND_ASSIGNMENT, KIND_EVALUATION, KIND_ANSWER = range(1, 7)
+
+DEPARTMENT_NAMES = [
+    "Matematicas", "Ciencias", "Humanidades", "Ingles", "Educacion Fisica", "Artes",
+    "Tecnologia", "Administracion", "Historia", "Quimica", "Fisica", "Biologia",
+    "Literatura", "Filosofia", "Musica", "Orientacion",
+]
+
+FIRST_NAMES = [
+    "Maria", "Jose", "Juan", "Guadalupe", "Francisco", "Ana", "Luis", "Laura", "Carlos",
+    "Patricia", "Jorge", "Rosa", "Miguel", "Elena", "Pedro", "Sofia", "Alejandro",
+    "Fernanda", "Ricardo", "Monica", "Eduardo", "Veronica", "Javier", "Adriana",
+]
+
+LAST_NAMES = [
+    "Hernandez", "Garcia", "Martinez", "Lopez", "Gonzalez", "Perez", "Rodriguez",
+    "Sanchez", "Ramirez", "Cruz", "Flores", "Gomez", "Morales", "Vazquez", "Reyes",
+    "Jimenez", "Torres", "Diaz", "Gutierrez", "Ruiz", "Mendoza", "Aguilar", "Ortiz",
+]
+
+QUESTION_BANK = [
+    "Dominio del contenido de la materia",
+    "Claridad en la explicacion de conceptos",
+    "Puntualidad y asistencia",
+    "Preparacion de clases",
+    "Uso de recursos didacticos",
+    "Atencion a estudiantes",
+    "Evaluacion justa y objetiva",
+    "Fomento de la participacion estudiantil",
+    "Actualizacion profesional",
+    "Trabajo en equipo con colegas",
+    "Cumplimiento del programa de estudios",
+    "Retroalimentacion oportuna de tareas y examenes",
+    "Manejo del grupo y disciplina en el aula",
+    "Uso de tecnologias de la informacion",
+    "Planeacion didactica por competencias",
+    "Comunicacion con padres de familia",
+    "Promocion de valores y respeto",
+    "Adaptacion a estilos de aprendizaje diversos",
+    "Participacion en academias y reuniones",
+    "Entrega puntual de calificaciones",
+    "Innovacion en estrategias de ensenanza",
+    "Vinculacion de contenidos con la vida real",
+    "Seguimiento a estudiantes en riesgo",
+    "Claridad en los criterios de evaluacion",
+]
+
+TEXT_QUESTION = "Comentarios y sugerencias de mejora"
+
+
+# Fecha de referencia fija: la misma semilla genera siempre los mismos datos
+# (fechas incluidas), sin importar el dia en que se ejecute
+DEFAULT_AS_OF = datetime(2025, 3, 3)
+
+
+def semester_start(year: int, half: int) -> datetime:
+    return datetime(year, 1 if half == 1 else 7, 15, 8, 0)
+
+
+def cycle_starts(cycles: int, today: datetime) -> List[datetime]:
+    """Inicio de los ultimos N semestres, del mas antiguo al actual"""
+    year, half = today.year, 1 if today.month < 7 else 2
+    starts = []
+    for _ in range(cycles):
+        starts.append(semester_start(year, half))
+        year, half = (year, 1) if half == 2 else (year - 1, 2)
+    return list(reversed(starts))
+
+
+def fmt(value) -> str:
+    """Formatear un valor para COPY en modo texto"""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    return str(value).replace("\\", "\\\\").replace("\t", " ").replace("\n", " ")
+
+
+class Generator:
+    def __init__(self, args):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.seed_tag = args.seed & 0xFFFFFFFF
+        self.counters = {}
+
+    def uid(self, kind: int) -> str:
+        n = self.counters.get(kind, 0) + 1
+        self.counters[kind] = n
+        return f"{self.seed_tag:08x}-{kind:04x}-4000-8000-{n:012x}"
+
+    @property
+    def id_prefix(self) -> str:
+        return f"{self.seed_tag:08x}-"
+
+    def copy(self, cur, table: str, columns: Iterable[str], rows: Iterable[tuple], chunk: int = 200_000) -> int:
+        """Cargar filas con COPY en bloques para acotar la memoria"""
+        sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN"
+        total = 0
+        buffer: List[str] = []
+        for row in rows:
+            # Las filas pueden venir ya formateadas para las tablas mas grandes
+            buffer.append(row if isinstance(row, str) else "\t".join(map(fmt, row)))
+            if len(buffer) >= chunk:
+                cur.copy_expert(sql, io.StringIO("\n".join(buffer) + "\n"))
+                total += len(buffer)
+                buffer.clear()
+        if buffer:
+            cur.copy_expert(sql, io.StringIO("\n".join(buffer) + "\n"))
+            total += len(buffer)
+        return total
+
+    def clear_previous(self, cur) -> None:
+        """Eliminar los datos generados previamente con la misma semilla"""
+        prefix = self.id_prefix + "%"
+        # Las preguntas, asignaciones, evaluaciones y respuestas caen en cascada
+        cur.execute("DELETE FROM surveys WHERE id::text LIKE %s", (prefix,))
+        cur.execute("DELETE FROM users WHERE id::text LIKE %s", (prefix,))
+        cur.execute("DELETE FROM departments WHERE description = %s", (self.department_tag,))
+
+    @property
+    def department_tag(self) -> str:
+        return f"Generado para benchmark (seed={self.args.seed})"
+
+    def run(self, conn) -> dict:
+        args, rng = self.args, self.rng
+        counts = {}
+        cur = conn.cursor()
+        cur.execute("SET LOCAL synchronous_commit = off")
+
+        if args.replace:
+            self.clear_previous(cur)
+
+        cur.execute("SELECT name, id FROM roles")
+        roles = dict(cur.fetchall())
+        missing = {"admin", "coordinador", "maestro"} - set(roles)
+        if missing:
+            raise SystemExit(f"Faltan roles en la base de datos: {', '.join(sorted(missing))}")
+
+        # Departamentos (ids seriales asignados por la base)
+        department_ids = []
+        for i in range(args.departments):
+            base = DEPARTMENT_NAMES[i % len(DEPARTMENT_NAMES)]
+            name = f"{base} {i // len(DEPARTMENT_NAMES) + 1}" if i >= len(DEPARTMENT_NAMES) else base
+            cur.execute(
+                "INSERT INTO departments (name, description) VALUES (%s, %s) RETURNING id",
+                (name, self.department_tag),
+            )
+            department_ids.append(cur.fetchone()[0])
+        counts["departments"] = len(department_ids)
+
+        # Usuarios: coordinadores por departamento y maestros repartidos
+        created_at = args.as_of - timedelta(days=183 * args.cycles)
+        users, teachers, coordinator_of = [], [], {}
+        for n in range(args.users):
+            department_id = department_ids[n % len(department_ids)]
+            is_coordinator = department_id not in coordinator_of
+            user_id = self.uid(KIND_USER)
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            users.append((
+                user_id, f"{first.lower()}.{last.lower()}.{n}.s{args.seed}@bench.local",
+                DEFAULT_PASSWORD_HASH, first, f"{last} {rng.choice(LAST_NAMES)}",
+                f"S{args.seed}-{n:06d}", None,
+                roles["coordinador" if is_coordinator else "maestro"], department_id,
+                True, created_at,
+            ))
+            if is_coordinator:
+                coordinator_of[department_id] = user_id
+            else:
+                # Calidad latente del maestro: centra la distribucion de sus puntajes
+                teachers.append((user_id, department_id, rng.gauss(7.6, 1.0)))
+        counts["users"] = self.copy(cur, "users", (
+            "id", "email", "hashed_password", "first_name", "last_name", "employee_code",
+            "phone", "role_id", "department_id", "is_active", "created_at",
+        ), users)
+        del users
+
+        # Encuestas y preguntas
+        surveys = []
+        survey_rows, question_rows = [], []
+        for s in range(args.surveys):
+            survey_id = self.uid(KIND_SURVEY)
+            texts = rng.sample(QUESTION_BANK, min(args.questions, len(QUESTION_BANK)))
+            while len(texts) < args.questions:
+                texts.append(f"{rng.choice(QUESTION_BANK)} ({len(texts) + 1})")
+            questions = []
+            for order, text in enumerate(texts, start=1):
+                question_id = self.uid(KIND_QUESTION)
+                # Dificultad del reactivo: algunos aspectos se califican mas bajo
+                questions.append((question_id, "scale", rng.gauss(0, 0.6)))
+                question_rows.append((question_id, survey_id, text, "scale", order, True, 1, 10, created_at))
+            if args.text_question:
+                question_id = self.uid(KIND_QUESTION)
+                questions.append((question_id, "text", 0.0))
+                question_rows.append((
+                    question_id, survey_id, TEXT_QUESTION, "text", len(texts) + 1, False, None, None, created_at,
+                ))
+            survey_rows.append((
+                survey_id, f"Evaluacion Docente {s + 1} (seed {args.seed})",
+                "Evaluacion integral del desempeno docente",
+                "Califique cada aspecto del 1 al 10, donde 1 es deficiente y 10 es excelente",
+                s == args.surveys - 1, None, created_at, created_at,
+            ))
+            surveys.append((survey_id, questions))
+        counts["surveys"] = self.copy(cur, "surveys", (
+            "id", "title", "description", "instructions", "is_active", "created_by", "created_at", "updated_at",
+        ), survey_rows)
+        counts["questions"] = self.copy(cur, "questions", (
+            "id", "survey_id", "question_text", "question_type", "order_number", "is_required",
+            "min_value", "max_value", "created_at",
+        ), question_rows)
+
+        # Ciclos: asignaciones, evaluaciones y respuestas
+        assignment_rows, evaluation_rows, evaluation_answers = [], [], []
+        starts = cycle_starts(args.cycles, args.as_of)
+        for cycle_index, start in enumerate(starts):
+            survey_id, questions = surveys[cycle_index % len(surveys)]
+            due = start + timedelta(days=90)
+            is_current = cycle_index == len(starts) - 1
+            completion_rate = args.current_completion if is_current else 0.98
+
+            for teacher_id, department_id, quality in teachers:
+                coordinator_id = coordinator_of[department_id]
+                for assignment_type, evaluator_id, bias in (
+                    ("autoevaluacion", teacher_id, 0.5),
+                    ("coordinador", coordinator_id, 0.0),
+                ):
+                    assignment_id = self.uid(KIND_ASSIGNMENT)
+                    assigned_at = start + timedelta(days=rng.randint(0, 5))
+                    completed = rng.random() < completion_rate
+                    if not completed:
+                        assignment_rows.append((
+                            assignment_id, survey_id, evaluator_id, teacher_id, assignment_type,
+                            "pending", due, None, assigned_at, None, None,
+                        ))
+                        continue
+
+                    completed_at = assigned_at + timedelta(minutes=rng.randint(60, 60 * 24 * 60))
+                    # Duracion de llenado: ~15-40 s por reactivo con cola larga
+                    seconds = len(questions) * rng.lognormvariate(3.2, 0.35)
+                    started_at = completed_at - timedelta(seconds=seconds)
+                    assignment_rows.append((
+                        assignment_id, survey_id, evaluator_id, teacher_id, assignment_type,
+                        "completed", due, None, assigned_at, started_at, completed_at,
+                    ))
+
+                    values = []
+                    for question_id, question_type, difficulty in questions:
+                        if question_type == "text":
+                            values.append(None)
+                            continue
+                        score = round(rng.gauss(quality + bias + difficulty, 1.1))
+                        values.append(10 if score > 10 else 1 if score < 1 else score)
+                    scored = [v for v in values if v is not None]
+                    evaluation_id = self.uid(KIND_EVALUATION)
+                    evaluation_rows.append((
+                        evaluation_id, assignment_id, evaluator_id, teacher_id, survey_id, "completed",
+                        started_at, completed_at, round(sum(scored) / len(scored), 2) if scored else None, None,
+                    ))
+                    evaluation_answers.append((evaluation_id, questions, bytes(v or 0 for v in values), completed_at))
+
+        counts["survey_assignments"] = self.copy(cur, "survey_assignments", (
+            "id", "survey_id", "evaluator_id", "evaluatee_id", "assignment_type", "status", "due_date",
+            "assigned_by", "assigned_at", "started_at", "completed_at",
+        ), assignment_rows)
+        del assignment_rows
+        counts["evaluations"] = self.copy(cur, "evaluations", (
+            "id", "assignment_id", "evaluator_id", "evaluatee_id", "survey_id", "status",
+            "started_at", "completed_at", "total_score", "comments",
+        ), evaluation_rows)
+        del evaluation_rows
+
+        def answer_rows():
+            answer_prefix = f"{self.seed_tag:08x}-{KIND_ANSWER:04x}-4000-8000-"
+            n = self.counters.get(KIND_ANSWER, 0)
+            for evaluation_id, questions, values, completed_at in evaluation_answers:
+                created = fmt(completed_at)
+                for (question_id, question_type, _), value in zip(questions, values):
+                    if question_type == "text":
+                        if rng.random() < 0.3:
+                            n += 1
+                            yield (f"{answer_prefix}{n:012x}\t{evaluation_id}\t{question_id}"
+                                   f"\t\\N\tBuen desempeno en general\t{created}")
+                        continue
+                    n += 1
+                    yield f"{answer_prefix}{n:012x}\t{evaluation_id}\t{question_id}\t{value}\t\\N\t{created}"
+            self.counters[KIND_ANSWER] = n
+
+        counts["answers"] = self.copy(cur, "answers", (
+            "id", "evaluation_id", "question_id", "answer_value", "answer_text", "created_at",
+        ), answer_rows())
+
+        if not args.skip_analyze:
+            for table in ("users", "surveys", "questions", "survey_assignments", "evaluations", "answers"):
+                cur.execute(f"ANALYZE {table}")
+        return counts
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generador de datos sinteticos para benchmarks")
+    parser.add_argument("--dsn", default=settings.database_url, help="Cadena de conexion de PostgreSQL")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--departments", type=int, default=50)
+    parser.add_argument("--users", type=int, default=2500, help="Coordinadores + maestros")
+    parser.add_argument("--surveys", type=int, default=6)
+    parser.add_argument("--questions", type=int, default=20, help="Preguntas de escala por encuesta")
+    parser.add_argument("--cycles", type=int, default=10, help="Semestres de historial")
+    parser.add_argument("--current-completion", type=float, default=0.6,
+                        help="Fraccion de asignaciones completadas en el ciclo actual")
+    parser.add_argument("--no-text-question", dest="text_question", action="store_false",
+                        help="No agregar la pregunta abierta de comentarios")
+    parser.add_argument("--as-of", type=lambda v: datetime.strptime(v, "%Y-%m-%d"),
+                        default=DEFAULT_AS_OF,
+                        help=f"Fecha de referencia YYYY-MM-DD (por defecto {DEFAULT_AS_OF:%Y-%m-%d})")
+    parser.add_argument("--replace", action="store_true",
+                        help="Borrar antes los datos generados con la misma semilla")
+    parser.add_argument("--skip-analyze", action="store_true")
+    args = parser.parse_args(argv)
+    if args.departments < 1 or args.users <= args.departments:
+        parser.error("Se requiere al menos un departamento y mas usuarios que departamentos")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    start = time.perf_counter()
+
+    conn = psycopg2.connect(args.dsn)
+    try:
+        with conn:
+            counts = Generator(args).run(conn)
+    finally:
+        conn.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"Datos generados (seed={args.seed}) en {elapsed:.1f}s")
+    for table, count in counts.items():
+        print(f"  {table:<20}{count:>12,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Prueba de carga asincrona para el Sistema de Evaluacion Docente.
+
+Simula maestros y coordinadores concurrentes ejecutando flujos reales
+contra un backend local con base de datos sembrada:
+
+    login           POST /auth/login
+    active_survey   GET  /surveys/{id}
+    list_users      GET  /users/            (coordinador)
+    search          GET  /users/?search=... (coordinador)
+    submit_answers  POST /evaluations/      (autoevaluacion del maestro)
+
+Reporta p50/p95/p99 y throughput por flujo y guarda los resultados en JSON
+para comparar corridas entre commits.
+
+Uso:
+    python benchmarks/load_test.py --users 50 --duration 60
+    python benchmarks/load_test.py --compare benchmarks/results/anterior.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import httpx
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+SEARCH_TERMS = ["a", "mar", "jose", "lopez", "garcia", "mat", "@", "doc"]
+
+# Peso relativo de cada flujo por perfil (el login se mide una vez por sesion)
+TEACHER_FLOWS = {"active_survey": 6, "submit_answers": 1}
+COORDINATOR_FLOWS = {"list_users": 4, "search": 3, "active_survey": 2}
+
+
+class FlowStats:
+    """Latencias y errores acumulados de un flujo"""
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.errors = 0
+        self.status_codes: Dict[int, int] = {}
+
+    def record(self, elapsed: float, status_code: int, ok: bool) -> None:
+        self.status_codes[status_code] = self.status_codes.get(status_code, 0) + 1
+        if ok:
+            self.latencies.append(elapsed)
+        else:
+            self.errors += 1
+
+    def summary(self, wall_time: float) -> dict:
+        data = sorted(self.latencies)
+        count = len(data)
+
+        def percentile(p: float) -> Optional[float]:
+            if not data:
+                return None
+            index = min(count - 1, max(0, math.ceil(p / 100 * count) - 1))
+            return round(data[index] * 1000, 2)
+
+        return {
+            "count": count,
+            "errors": self.errors,
+            "throughput_rps": round(count / wall_time, 2) if wall_time else 0.0,
+            "mean_ms": round(sum(data) / count * 1000, 2) if count else None,
+            "p50_ms": percentile(50),
+            "p95_ms": percentile(95),
+            "p99_ms": percentile(99),
+            "max_ms": round(data[-1] * 1000, 2) if data else None,
+            "status_codes": {str(code): n for code, n in sorted(self.status_codes.items())},
+        }
+
+
+class LoadTest:
+    def __init__(self, args):
+        self.args = args
+        self.api = args.base_url.rstrip("/") + args.api_prefix
+        self.stats: Dict[str, FlowStats] = {}
+        self.survey: Optional[dict] = None
+        self.teachers: List[str] = []
+        self.coordinators: List[str] = []
+
+    def stats_for(self, flow: str) -> FlowStats:
+        if flow not in self.stats:
+            self.stats[flow] = FlowStats()
+        return self.stats[flow]
+
+    async def timed(self, flow: str, request) -> Optional[httpx.Response]:
+        start = time.perf_counter()
+        try:
+            response = await request
+        except httpx.HTTPError:
+            self.stats_for(flow).record(time.perf_counter() - start, 0, False)
+            return None
+        elapsed = time.perf_counter() - start
+        self.stats_for(flow).record(elapsed, response.status_code, response.status_code < 400)
+        return response
+
+    async def login(self, client: httpx.AsyncClient, email: str, record: bool = True) -> Optional[str]:
+        request = client.post(
+            f"{self.api}/auth/login",
+            data={"username": email, "password": self.args.password},
+        )
+        response = await (self.timed("login", request) if record else request)
+        if response is None or response.status_code != 200:
+            return None
+        return response.json()["access_token"]
+
+    async def setup(self, client: httpx.AsyncClient) -> None:
+        """Descubrir encuesta activa y cuentas de prueba usando al admin"""
+        token = await self.login(client, self.args.admin_email, record=False)
+        if not token:
+            sys.exit(f"No se pudo iniciar sesion como {self.args.admin_email}")
+        headers = {"Authorization": f"Bearer {token}"}
+
+        response = await client.get(
+            f"{self.api}/surveys/", params={"is_active": True, "limit": 1}, headers=headers
+        )
+        response.raise_for_status()
+        surveys = response.json()["surveys"]
+        if not surveys:
+            sys.exit("No hay encuestas activas en la base de datos")
+        response = await client.get(f"{self.api}/surveys/{surveys[0]['id']}", headers=headers)
+        response.raise_for_status()
+        self.survey = response.json()
+
+        for role, target in (("maestro", self.teachers), ("coordinador", self.coordinators)):
+            response = await client.get(
+                f"{self.api}/users/",
+                params={"role": role, "is_active": True, "limit": 100},
+                headers=headers,
+            )
+            response.raise_for_status()
+            target.extend(user["email"] for user in response.json()["users"])
+
+        # Sin cuentas sembradas se usa al admin para todos los perfiles
+        self.teachers = self.teachers or [self.args.admin_email]
+        self.coordinators = self.coordinators or [self.args.admin_email]
+
+    def answers_payload(self) -> dict:
+        answers = []
+        for question in self.survey.get("questions", []):
+            if question["question_type"] in ("scale", "rating"):
+                low = question.get("min_value") or 1
+                high = question.get("max_value") or 10
+                value = min(high, max(low, int(random.gauss((low + high) * 0.65, 1.5))))
+                answers.append({"question_id": question["id"], "answer_value": value})
+            else:
+                answers.append({"question_id": question["id"], "answer_text": "Respuesta de prueba"})
+        return {"survey_id": self.survey["id"], "answers": answers}
+
+    async def run_flow(self, client: httpx.AsyncClient, flow: str, headers: dict) -> None:
+        if flow == "active_survey":
+            await self.timed(flow, client.get(f"{self.api}/surveys/{self.survey['id']}", headers=headers))
+        elif flow == "list_users":
+            params = {"skip": random.randint(0, 5) * 20, "limit": 20}
+            await self.timed(flow, client.get(f"{self.api}/users/", params=params, headers=headers))
+        elif flow == "search":
+            params = {"search": random.choice(SEARCH_TERMS), "limit": 20}
+            await self.timed(flow, client.get(f"{self.api}/users/", params=params, headers=headers))
+        elif flow == "submit_answers":
+            await self.timed(flow, client.post(
+                f"{self.api}/evaluations/", json=self.answers_payload(), headers=headers
+            ))
+
+    async def virtual_user(self, index: int, deadline: float) -> None:
+        is_coordinator = index < self.args.users * self.args.coordinator_ratio
+        accounts = self.coordinators if is_coordinator else self.teachers
+        flows = COORDINATOR_FLOWS if is_coordinator else TEACHER_FLOWS
+        names, weights = list(flows), list(flows.values())
+
+        limits = httpx.Limits(max_connections=1, max_keepalive_connections=1)
+        async with httpx.AsyncClient(timeout=self.args.timeout, limits=limits) as client:
+            token = await self.login(client, accounts[index % len(accounts)])
+            if not token:
+                return
+            headers = {"Authorization": f"Bearer {token}"}
+
+            while time.perf_counter() < deadline:
+                await self.run_flow(client, random.choices(names, weights)[0], headers)
+                if self.args.think_time:
+                    await asyncio.sleep(random.expovariate(1 / self.args.think_time))
+
+    async def run(self) -> dict:
+        async with httpx.AsyncClient(timeout=self.args.timeout) as client:
+            await self.setup(client)
+
+        # Arranque escalonado para no medir solo la tormenta de logins
+        start = time.perf_counter()
+        deadline = start + self.args.ramp_up + self.args.duration
+        tasks = []
+        for index in range(self.args.users):
+            tasks.append(asyncio.create_task(self.virtual_user(index, deadline)))
+            if self.args.ramp_up:
+                await asyncio.sleep(self.args.ramp_up / self.args.users)
+        await asyncio.gather(*tasks)
+        wall_time = time.perf_counter() - start
+
+        return {
+            "meta": {
+                "timestamp": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+                "commit": git_commit(),
+                "base_url": self.args.base_url,
+                "users": self.args.users,
+                "duration_s": self.args.duration,
+                "ramp_up_s": self.args.ramp_up,
+                "think_time_s": self.args.think_time,
+                "wall_time_s": round(wall_time, 2),
+                "seed": self.args.seed,
+            },
+            "flows": {flow: stats.summary(wall_time) for flow, stats in sorted(self.stats.items())},
+        }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(results: dict, baseline: Optional[dict] = None) -> None:
+    meta = results["meta"]
+    print(f"\nCommit {meta['commit']} | {meta['users']} usuarios | {meta['wall_time_s']}s")
+    header = f"{'flujo':<16}{'n':>8}{'err':>6}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}"
+    if baseline:
+        header += f"{'Δp95':>9}{'Δrps':>9}"
+    print(header)
+    print("-" * len(header))
+    for flow, data in results["flows"].items():
+        line = (
+            f"{flow:<16}{data['count']:>8}{data['errors']:>6}{data['throughput_rps']:>9}"
+            f"{str(data['p50_ms']):>9}{str(data['p95_ms']):>9}{str(data['p99_ms']):>9}"
+        )
+        previous = (baseline or {}).get("flows", {}).get(flow)
+        if previous and previous.get("p95_ms") and data["p95_ms"]:
+            p95_delta = (data["p95_ms"] - previous["p95_ms"]) / previous["p95_ms"] * 100
+            rps_delta = (
+                (data["throughput_rps"] - previous["throughput_rps"]) / previous["throughput_rps"] * 100
+                if previous["throughput_rps"] else 0.0
+            )
+            line += f"{p95_delta:>+8.1f}%{rps_delta:>+8.1f}%"
+        print(line)
+    print()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Prueba de carga del backend de evaluacion")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--api-prefix", default="/api/v1")
+    parser.add_argument("--users", type=int, default=20, help="Usuarios virtuales concurrentes")
+    parser.add_argument("--duration", type=float, default=30, help="Duracion de la medicion (s)")
+    parser.add_argument("--ramp-up", type=float, default=5, help="Tiempo para arrancar a todos (s)")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Pausa media entre peticiones (s)")
+    parser.add_argument("--coordinator-ratio", type=float, default=0.2)
+    parser.add_argument("--admin-email", default=os.getenv("ADMIN_EMAIL", "admin@institucion.local"))
+    parser.add_argument("--password", default=os.getenv("BENCH_PASSWORD", "admin123"))
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Archivo JSON de salida (por defecto benchmarks/results/)")
+    parser.add_argument("--compare", help="JSON de una corrida anterior para comparar")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    random.seed(args.seed)
+
+    results = asyncio.run(LoadTest(args).run())
+
+    output = args.output
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S")
+        output = os.path.join(RESULTS_DIR, f"load_{stamp}_{results['meta']['commit'] or 'nogit'}.json")
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    print_report(results, baseline)
+    print(f"Resultados guardados en {output}")
+
+
+if __name__ == "__main__":
+    main()
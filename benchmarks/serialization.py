@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark de serializacion de respuestas (UserList y SurveyWithQuestions).
+
+Compara el camino anterior (schemas con @validator estilo v1 por campo y por
+fila + JSONResponse) contra el actual (schemas v2 compilados con AliasPath /
+UUID nativo + ORJSONResponse), midiendo validacion desde objetos ORM y
+renderizado a bytes JSON, que es lo que hace FastAPI con cada respuesta.
+
+Uso:
+    python benchmarks/serialization.py --rows 100 --repeat 200
+"""
+
+import argparse
+import os
+import sys
+import time
+import uuid
+import warnings
+from datetime import datetime
+from typing import List, Optional
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend")
+sys.path.insert(0, BACKEND_DIR)
+
+from fastapi.responses import JSONResponse, ORJSONResponse  # noqa: E402
+from pydantic import BaseModel, validator  # noqa: E402
+
+from app.models.user import User, Role, Department, Survey, Question  # noqa: E402
+from app.schemas.user import UserList  # noqa: E402
+from app.schemas.survey import SurveyWithQuestions  # noqa: E402
+
+warnings.filterwarnings("ignore", category=DeprecationWarning)
+
+
+# ===== Schemas anteriores (copia de referencia para la linea base) =====
+
+class LegacyUserResponse(BaseModel):
+    id: str
+    email: str
+    first_name: str
+    last_name: str
+    employee_code: Optional[str] = None
+    phone: Optional[str] = None
+    role: str
+    department: Optional[str] = None
+    is_active: bool
+    last_login: Optional[datetime] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+    @validator('id', pre=True)
+    def convert_uuid_to_string(cls, v):
+        if isinstance(v, uuid.UUID):
+            return str(v)
+        return v
+
+    @validator('role', pre=True)
+    def extract_role_name(cls, v):
+        if hasattr(v, 'name'):
+            return v.name
+        return v
+
+    @validator('department', pre=True)
+    def extract_department_name(cls, v):
+        if v and hasattr(v, 'name'):
+            return v.name
+        return v
+
+
+class LegacyUserList(BaseModel):
+    users: List[LegacyUserResponse]
+    total: int
+    skip: int
+    limit: int
+    has_more: bool
+
+
+class LegacyQuestionResponse(BaseModel):
+    id: str
+    question_text: str
+    question_type: str
+    order_number: int
+    is_required: bool
+    min_value: Optional[int] = None
+    max_value: Optional[int] = None
+    options: Optional[dict] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+    @validator('id', pre=True)
+    def convert_uuid_to_string(cls, v):
+        if isinstance(v, uuid.UUID):
+            return str(v)
+        return v
+
+
+class LegacySurveyWithQuestions(BaseModel):
+    id: str
+    title: str
+    description: Optional[str] = None
+    instructions: Optional[str] = None
+    is_active: bool
+    created_by: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    questions: List[LegacyQuestionResponse] = []
+
+    class Config:
+        from_attributes = True
+
+    @validator('id', 'created_by', pre=True)
+    def convert_uuids_to_string(cls, v):
+        if isinstance(v, uuid.UUID):
+            return str(v)
+        return v
+
+
+# ===== Datos de prueba (objetos ORM transitorios, sin base de datos) =====
+
+def build_users(rows: int) -> dict:
+    now = datetime(2026, 1, 15, 8, 0)
+    roles = [Role(id=i, name=name) for i, name in enumerate(("admin", "coordinador", "maestro"), 1)]
+    departments = [Department(id=i, name=f"Departamento {i}") for i in range(1, 9)]
+    users = []
+    for n in range(rows):
+        users.append(User(
+            id=uuid.uuid4(), email=f"docente{n}@institucion.local", first_name="Maria",
+            last_name="Hernandez Lopez", employee_code=f"EMP{n:05d}", phone="5551234567",
+            role=roles[n % 3], department=departments[n % 8] if n % 10 else None,
+            is_active=True, last_login=now, created_at=now,
+        ))
+    return {"users": users, "total": rows * 5, "skip": 0, "limit": rows}
+
+
+def build_survey(rows: int) -> Survey:
+    now = datetime(2026, 1, 15, 8, 0)
+    survey = Survey(
+        id=uuid.uuid4(), title="Evaluacion Docente Estandar",
+        description="Evaluacion integral del desempeno docente",
+        instructions="Califique cada aspecto del 1 al 10", is_active=True,
+        created_by=uuid.uuid4(), created_at=now, updated_at=now,
+    )
+    survey.questions = [
+        Question(
+            id=uuid.uuid4(), question_text=f"Dominio del contenido de la materia {n}",
+            question_type="scale", order_number=n + 1, is_required=True,
+            min_value=1, max_value=10, created_at=now,
+        )
+        for n in range(rows)
+    ]
+    return survey
+
+
+def bench(label: str, fn, repeat: int, rows: int) -> float:
+    fn()  # calentamiento
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    elapsed = time.perf_counter() - start
+    per_call = elapsed / repeat
+    print(f"  {label:<10}{per_call * 1e6:>10.1f} us/resp{rows / per_call:>14,.0f} filas/s")
+    return per_call
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Micro-benchmark de serializacion de respuestas")
+    parser.add_argument("--rows", type=int, default=100, help="Usuarios / preguntas por respuesta")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    users_payload = build_users(args.rows)
+    legacy_users_payload = {**users_payload, "has_more": True}
+    survey = build_survey(args.rows)
+
+    cases = [
+        (
+            "UserList",
+            lambda: JSONResponse(LegacyUserList.model_validate(legacy_users_payload).model_dump(mode="json")).body,
+            lambda: ORJSONResponse(UserList.model_validate(users_payload).model_dump(mode="json")).body,
+        ),
+        (
+            "SurveyWithQuestions",
+            lambda: JSONResponse(LegacySurveyWithQuestions.model_validate(survey).model_dump(mode="json")).body,
+            lambda: ORJSONResponse(SurveyWithQuestions.model_validate(survey).model_dump(mode="json")).body,
+        ),
+    ]
+
+    for name, before, after in cases:
+        print(f"{name} ({args.rows} filas, {args.repeat} repeticiones)")
+        t_before = bench("antes", before, args.repeat, args.rows)
+        t_after = bench("despues", after, args.repeat, args.rows)
+        print(f"  mejora    {t_before / t_after:>10.2f}x\n")
+
+
+if __name__ == "__main__":
+    main()
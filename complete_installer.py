@@ -520,67 +520,40 @@ httpx==0.25.2"""
         db_name = f"evaluacion_{self.config['institution_short']}"
         
         try:
-            # 1. Crear base de datos
-            self.print_step("4A", f"Creando base de datos: {db_name}")
-            create_cmd = ['createdb', '-h', self.config['db_host'], '-p', self.config['db_port'],
-                         '-U', self.config['db_user'], db_name]
-            
-            result = self.run_pg_command(create_cmd)
-            if result.returncode == 0:
-                print(f"✅ Base de datos '{db_name}' creada")
-            else:
-                if "already exists" in result.stderr:
-                    print(f"⚠️  Base de datos '{db_name}' ya existe")
+            # Schema, datos iniciales y admin en una sola conexión y transacción
+            sys.path.insert(0, str(self.project_root / "database"))
+            from bootstrap import bootstrap_database, hash_password
+            
+            self.print_step("4A", f"Inicializando base de datos: {db_name}")
+            conn_params = {
+                'host': self.config['db_host'],
+                'port': self.config['db_port'],
+                'user': self.config['db_user'],
+                'password': self.config['db_password'],
+            }
+            admin = {
+                'email': self.config['admin_email'],
+                'hashed_password': hash_password(self.config['admin_password']),
+                'first_name': self.config['admin_first_name'],
+                'last_name': self.config['admin_last_name'],
+            }
+            
+            applied, admin_created = bootstrap_database(conn_params, db_name, admin)
+            if applied:
+                print(f"✅ Base de datos '{db_name}' lista ({len(applied)} scripts aplicados)")
+                if admin_created:
+                    print("✅ Usuario administrador creado")
                 else:
-                    print(f"❌ Error creando BD: {result.stderr}")
-                    return False
-            
-            # 2. Ejecutar schema
-            self.print_step("4B", "Creando tablas...")
-            schema_cmd = ['psql', '-h', self.config['db_host'], '-p', self.config['db_port'],
-                         '-U', self.config['db_user'], '-d', db_name, '-f', 'database/01_create_schema.sql']
-            
-            result = self.run_pg_command(schema_cmd)
-            if result.returncode == 0:
-                print("✅ Tablas creadas")
-            else:
-                print(f"❌ Error creando tablas: {result.stderr}")
-                return False
-            
-            # 3. Insertar datos iniciales
-            self.print_step("4C", "Insertando datos iniciales...")
-            seeds_cmd = ['psql', '-h', self.config['db_host'], '-p', self.config['db_port'],
-                        '-U', self.config['db_user'], '-d', db_name, '-f', 'database/02_insert_seeds.sql']
-            
-            result = self.run_pg_command(seeds_cmd)
-            if result.returncode == 0:
-                print("✅ Datos iniciales insertados")
+                    print(f"ℹ️  El usuario administrador {admin['email']} ya existía")
             else:
-                print(f"❌ Error insertando datos: {result.stderr}")
-                return False
-            
-            # 4. Crear usuario administrador
-            self.print_step("4D", "Creando usuario administrador...")
-            admin_sql = f"""
-            INSERT INTO users (email, hashed_password, first_name, last_name, employee_code, role_id, department_id) 
-            VALUES ('{self.config['admin_email']}', '$2b$12$LQv3c1yqBWVHxkd0LHAkCOYz6TtxMQJqhN8/LewUQcSKbBfN8Ujmm', 
-                    '{self.config['admin_first_name']}', '{self.config['admin_last_name']}', 'ADM001', 
-                    (SELECT id FROM roles WHERE name = 'admin'), 
-                    (SELECT id FROM departments WHERE name = 'Administracion'))
-            ON CONFLICT (email) DO NOTHING;
-            """
-            
-            admin_cmd = ['psql', '-h', self.config['db_host'], '-p', self.config['db_port'],
-                        '-U', self.config['db_user'], '-d', db_name, '-c', admin_sql]
-            
-            result = self.run_pg_command(admin_cmd)
-            if result.returncode == 0:
-                print("✅ Usuario administrador creado")
-            else:
-                print(f"⚠️  Error o admin ya existe: {result.stderr}")
+                print(f"⚠️  Base de datos '{db_name}' ya estaba inicializada")
             
             return True
             
+        except ImportError as e:
+            print(f"❌ Falta una dependencia para configurar la BD: {e}")
+            print("💡 Ejecuta: pip install psycopg2-binary passlib[bcrypt]")
+            return False
         except Exception as e:
             print(f"❌ Error configurando BD: {e}")
             return False
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Inicializacion de base de datos en una sola conexion y una sola transaccion.
+
+Reemplaza la secuencia createdb + psql (schema) + psql (seeds) + psql (admin):
+crea la base si no existe y aplica schema, datos iniciales, migraciones
+(database/migrations/*.sql), pasos de datos en Python (PYTHON_STEPS) y el
+usuario administrador de forma atomica.
+Cada script aplicado queda registrado con su checksum en schema_migrations,
+por lo que volver a ejecutar el bootstrap sin cambios no hace nada.
+
+Uso:
+    python database/bootstrap.py
+    python database/bootstrap.py --institutions prepa25,cbtis12,conalep3 --jobs 3
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import psycopg2
+from psycopg2 import sql
+
+DATABASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.join(DATABASE_DIR, "..", "backend")
+
+BASE_SCRIPTS = ["01_create_schema.sql", "02_insert_seeds.sql"]
+MIGRATIONS_DIR = os.path.join(DATABASE_DIR, "migrations")
+
+# Identificador arbitrario para serializar bootstraps concurrentes de la misma base
+BOOTSTRAP_LOCK_ID = 0x45564131
+
+MIGRATIONS_TABLE = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    filename VARCHAR(255) PRIMARY KEY,
+    checksum CHAR(64) NOT NULL,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+ADMIN_SQL = """
+INSERT INTO users (email, hashed_password, first_name, last_name, employee_code, role_id, department_id)
+VALUES (%s, %s, %s, %s, 'ADM001',
+        (SELECT id FROM roles WHERE name = 'admin'),
+        (SELECT id FROM departments WHERE name = 'Administracion'))
+ON CONFLICT (email) DO NOTHING
+RETURNING id
+"""
+
+
+class BootstrapError(Exception):
+    pass
+
+
+class BootstrapResult(NamedTuple):
+    """Scripts aplicados y si se creo el admin (None: no se intento, la base ya estaba al dia)"""
+    applied: List[str]
+    admin_created: Optional[bool]
+
+
+def rehash_survey_versions(cur) -> None:
+    """
+    Recalcular content_hash de las versiones con la forma canónica de la
+    aplicacion. El backfill de 005 lo calculó en SQL sobre jsonb::text, que no
+    coincide con ella, y ensure_version no reconocia esas versiones.
+    """
+    if BACKEND_DIR not in sys.path:
+        sys.path.insert(0, BACKEND_DIR)
+    from app.core.canonical import content_hash
+
+    cur.execute("SELECT id, content, content_hash FROM survey_versions")
+    updates = []
+    for version_id, content, current in cur.fetchall():
+        digest = content_hash(content)
+        if digest != current:
+            updates.append((digest, version_id))
+    cur.executemany("UPDATE survey_versions SET content_hash = %s WHERE id = %s", updates)
+
+
+# Pasos en Python, despues de los scripts SQL. Se registran en
+# schema_migrations igual que un script (una sola vez por base)
+PYTHON_STEPS = [
+    ("migrations/005_survey_versions.rehash", rehash_survey_versions),
+]
+
+
+def load_scripts() -> List[Tuple[str, str, str]]:
+    """Scripts en orden de aplicacion: (nombre, contenido, sha256)"""
+    paths = [os.path.join(DATABASE_DIR, name) for name in BASE_SCRIPTS]
+    if os.path.isdir(MIGRATIONS_DIR):
+        paths += sorted(
+            os.path.join(MIGRATIONS_DIR, name)
+            for name in os.listdir(MIGRATIONS_DIR) if name.endswith(".sql")
+        )
+
+    scripts = []
+    for path in paths:
+        with open(path, "rb") as f:
+            raw = f.read()
+        name = os.path.relpath(path, DATABASE_DIR).replace(os.sep, "/")
+        scripts.append((name, raw.decode("utf-8"), hashlib.sha256(raw).hexdigest()))
+    return scripts
+
+
+def ensure_database(conn_params: Dict, db_name: str) -> bool:
+    """Crear la base si no existe. Retorna True si fue creada"""
+    conn = psycopg2.connect(dbname="postgres", **conn_params)
+    try:
+        conn.autocommit = True  # CREATE DATABASE no puede ir dentro de una transaccion
+        with conn.cursor() as cur:
+            cur.execute("SELECT 1 FROM pg_database WHERE datname = %s", (db_name,))
+            if cur.fetchone():
+                return False
+            cur.execute(sql.SQL("CREATE DATABASE {}").format(sql.Identifier(db_name)))
+            return True
+    finally:
+        conn.close()
+
+
+def bootstrap_database(
+    conn_params: Dict,
+    db_name: str,
+    admin: Optional[Dict] = None,
+    scripts: Optional[List[Tuple[str, str, str]]] = None,
+) -> BootstrapResult:
+    """
+    Aplicar los scripts pendientes y el admin en una sola transaccion.
+    Retorna los scripts aplicados (vacio si ya estaba al dia) y si el admin se
+    creo o ya existia.
+    """
+    scripts = scripts if scripts is not None else load_scripts()
+    ensure_database(conn_params, db_name)
+
+    conn = psycopg2.connect(dbname=db_name, **conn_params)
+    try:
+        with conn, conn.cursor() as cur:
+            cur.execute("SELECT pg_advisory_xact_lock(%s)", (BOOTSTRAP_LOCK_ID,))
+            cur.execute(MIGRATIONS_TABLE)
+            cur.execute("SELECT filename, checksum FROM schema_migrations")
+            applied = dict(cur.fetchall())
+
+            # Bases creadas con el instalador anterior (psql) ya tienen schema y seeds
+            if not applied:
+                cur.execute("SELECT to_regclass('public.roles') IS NOT NULL")
+                if cur.fetchone()[0]:
+                    for name, _, checksum in scripts:
+                        if name in BASE_SCRIPTS:
+                            cur.execute(
+                                "INSERT INTO schema_migrations (filename, checksum) VALUES (%s, %s)",
+                                (name, checksum),
+                            )
+                            applied[name] = checksum
+
+            pending = []
+            for name, content, checksum in scripts:
+                if name not in applied:
+                    pending.append((name, content, checksum))
+                elif applied[name] != checksum:
+                    raise BootstrapError(
+                        f"{db_name}: {name} cambio despues de aplicarse; "
+                        f"agrega una migracion nueva en lugar de editarlo"
+                    )
+
+            for name, content, checksum in pending:
+                cur.execute(content)
+                cur.execute(
+                    "INSERT INTO schema_migrations (filename, checksum) VALUES (%s, %s)",
+                    (name, checksum),
+                )
+
+            for name, step in PYTHON_STEPS:
+                if name not in applied:
+                    step(cur)
+                    cur.execute(
+                        "INSERT INTO schema_migrations (filename, checksum) VALUES (%s, %s)",
+                        (name, hashlib.sha256(name.encode("utf-8")).hexdigest()),
+                    )
+                    pending.append((name, None, None))
+
+            admin_created = None
+            if admin and pending:
+                cur.execute(ADMIN_SQL, (
+                    admin["email"], admin["hashed_password"],
+                    admin["first_name"], admin["last_name"],
+                ))
+                admin_created = cur.fetchone() is not None
+        return BootstrapResult([name for name, _, _ in pending], admin_created)
+    finally:
+        conn.close()
+
+
+def hash_password(password: str) -> str:
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto").hash(password)
+
+
+def parse_args(argv=None):
+    sys.path.insert(0, BACKEND_DIR)
+    from app.core.config import settings
+
+    parser = argparse.ArgumentParser(description="Inicializar bases de datos del sistema de evaluacion")
+    parser.add_argument("--host", default=settings.DB_HOST)
+    parser.add_argument("--port", type=int, default=settings.DB_PORT)
+    parser.add_argument("--user", default=settings.DB_USER)
+    parser.add_argument("--password", default=settings.DB_PASSWORD)
+    parser.add_argument("--db-name", default=settings.DB_NAME, help="Base a inicializar (sin --institutions)")
+    parser.add_argument("--institutions", help="Nombres cortos separados por coma; crea evaluacion_<nombre> para cada uno")
+    parser.add_argument("--jobs", type=int, default=4, help="Bases a inicializar en paralelo")
+    parser.add_argument("--admin-email", default=settings.ADMIN_EMAIL)
+    parser.add_argument("--admin-password", default=settings.ADMIN_PASSWORD)
+    parser.add_argument("--admin-first-name", default=settings.ADMIN_FIRST_NAME)
+    parser.add_argument("--admin-last-name", default=settings.ADMIN_LAST_NAME)
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    conn_params = {"host": args.host, "port": args.port, "user": args.user, "password": args.password}
+
+    if args.institutions:
+        shorts = [s.strip().lower().replace(" ", "_") for s in args.institutions.split(",") if s.strip()]
+        db_names = [f"evaluacion_{short}" for short in shorts]
+    else:
+        db_names = [args.db_name]
+
+    scripts = load_scripts()
+    admin = {
+        "email": args.admin_email,
+        "hashed_password": hash_password(args.admin_password),
+        "first_name": args.admin_first_name,
+        "last_name": args.admin_last_name,
+    }
+
+    failures = 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, min(args.jobs, len(db_names)))) as pool:
+        futures = {
+            pool.submit(bootstrap_database, conn_params, db_name, admin, scripts): db_name
+            for db_name in db_names
+        }
+        for future in as_completed(futures):
+            db_name = futures[future]
+            try:
+                applied, admin_created = future.result()
+            except (BootstrapError, psycopg2.Error) as e:
+                failures += 1
+                print(f"❌ {db_name}: {e}")
+                continue
+            if applied:
+                print(f"✅ {db_name}: {len(applied)} scripts aplicados ({', '.join(applied)})")
+                if admin_created is not None:
+                    print(f"   {db_name}: administrador {'creado' if admin_created else 'ya existia'}")
+            else:
+                print(f"✅ {db_name}: ya estaba al dia")
+
+    print(f"Tiempo total: {time.perf_counter() - start:.2f}s")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,6 @@
+-- ===================================================
+-- Versión de autorización por usuario
+-- Se incrementa al cambiar rol, departamento o estado; los tokens emitidos con
+-- una versión anterior dejan de ser válidos.
+-- ===================================================
+ALTER TABLE users ADD COLUMN IF NOT EXISTS auth_version INTEGER NOT NULL DEFAULT 1;
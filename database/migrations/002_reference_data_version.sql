@@ -0,0 +1,11 @@
+-- ===================================================
+-- Versión de los datos de referencia (roles y departamentos)
+-- Se incrementa en cada alta/cambio/baja de departamento para que los
+-- workers recarguen su caché en memoria.
+-- ===================================================
+CREATE TABLE IF NOT EXISTS reference_data_version (
+    id SMALLINT PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    version BIGINT NOT NULL DEFAULT 1
+);
+
+INSERT INTO reference_data_version (id, version) VALUES (1, 1) ON CONFLICT (id) DO NOTHING;
@@ -0,0 +1,16 @@
+-- ===================================================
+-- Revocación de tokens
+-- Una fila con jti revoca ese token (logout); una fila sin jti revoca todos
+-- los tokens del usuario emitidos antes de created_at (cerrar todas las
+-- sesiones). Las filas se purgan al pasar expires_at, cuando los tokens que
+-- cubren ya expiraron de todas formas.
+-- ===================================================
+CREATE TABLE IF NOT EXISTS token_revocations (
+    id BIGSERIAL PRIMARY KEY,
+    jti VARCHAR(64) UNIQUE,
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_token_revocations_expires_at ON token_revocations(expires_at);
@@ -0,0 +1,17 @@
+-- ===================================================
+-- Biblioteca de templates de encuestas
+-- template_data guarda la encuesta completa (título, textos y preguntas) tal
+-- como la recibe POST /surveys/.
+-- ===================================================
+CREATE TABLE IF NOT EXISTS survey_templates (
+    id UUID DEFAULT uuid_generate_v4() PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    description TEXT NOT NULL,
+    category VARCHAR(50) NOT NULL,
+    template_data JSONB NOT NULL,
+    is_public BOOLEAN NOT NULL DEFAULT TRUE,
+    created_by UUID REFERENCES users(id),
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_survey_templates_category ON survey_templates(category);
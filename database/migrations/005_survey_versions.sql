@@ -0,0 +1,68 @@
+-- ===================================================
+-- Versiones inmutables de encuestas
+-- Una versión es la foto del contenido (textos y preguntas) con su hash. Las
+-- evaluaciones y asignaciones fijan la versión que se respondió; las
+-- preguntas congeladas en una versión ya no se modifican (copy-on-write).
+-- ===================================================
+CREATE TABLE IF NOT EXISTS survey_versions (
+    id UUID DEFAULT uuid_generate_v4() PRIMARY KEY,
+    survey_id UUID NOT NULL REFERENCES surveys(id) ON DELETE CASCADE,
+    version_number INTEGER NOT NULL,
+    content_hash CHAR(64) NOT NULL,
+    content JSONB NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    UNIQUE (survey_id, version_number)
+);
+
+CREATE INDEX IF NOT EXISTS idx_survey_versions_content_hash ON survey_versions(content_hash);
+
+ALTER TABLE surveys ADD COLUMN IF NOT EXISTS current_version_id UUID REFERENCES survey_versions(id);
+ALTER TABLE questions ADD COLUMN IF NOT EXISTS survey_version_id UUID REFERENCES survey_versions(id);
+ALTER TABLE evaluations ADD COLUMN IF NOT EXISTS survey_version_id UUID REFERENCES survey_versions(id);
+ALTER TABLE survey_assignments ADD COLUMN IF NOT EXISTS survey_version_id UUID REFERENCES survey_versions(id);
+
+CREATE INDEX IF NOT EXISTS idx_evaluations_survey_version ON evaluations(survey_version_id);
+
+-- Encuestas que ya tienen evaluaciones: versión 1 con el contenido actual,
+-- para que sus preguntas queden congeladas desde ahora
+INSERT INTO survey_versions (survey_id, version_number, content_hash, content)
+SELECT s.id, 1, encode(sha256(convert_to(c.content::text, 'UTF8')), 'hex'), c.content
+FROM surveys s
+CROSS JOIN LATERAL (
+    SELECT jsonb_build_object(
+        'title', s.title,
+        'description', s.description,
+        'instructions', s.instructions,
+        'questions', COALESCE((
+            SELECT jsonb_agg(jsonb_build_object(
+                'id', q.id,
+                'question_text', q.question_text,
+                'question_type', q.question_type,
+                'order_number', q.order_number,
+                'is_required', q.is_required,
+                'min_value', q.min_value,
+                'max_value', q.max_value,
+                'options', q.options
+            ) ORDER BY q.order_number)
+            FROM questions q WHERE q.survey_id = s.id
+        ), '[]'::jsonb)
+    ) AS content
+) c
+WHERE EXISTS (SELECT 1 FROM evaluations e WHERE e.survey_id = s.id)
+  AND NOT EXISTS (SELECT 1 FROM survey_versions v WHERE v.survey_id = s.id);
+
+UPDATE surveys s SET current_version_id = v.id
+FROM survey_versions v
+WHERE v.survey_id = s.id AND v.version_number = 1 AND s.current_version_id IS NULL;
+
+UPDATE questions q SET survey_version_id = s.current_version_id
+FROM surveys s
+WHERE q.survey_id = s.id AND s.current_version_id IS NOT NULL AND q.survey_version_id IS NULL;
+
+UPDATE evaluations e SET survey_version_id = s.current_version_id
+FROM surveys s
+WHERE e.survey_id = s.id AND s.current_version_id IS NOT NULL AND e.survey_version_id IS NULL;
+
+UPDATE survey_assignments a SET survey_version_id = s.current_version_id
+FROM surveys s
+WHERE a.survey_id = s.id AND s.current_version_id IS NOT NULL AND a.survey_version_id IS NULL;
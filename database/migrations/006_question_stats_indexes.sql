@@ -0,0 +1,9 @@
+-- ===================================================
+-- Índices para las estadísticas por pregunta
+-- Las evaluaciones completadas de una encuesta (y su marca de agua: conteo y
+-- último completed_at) y sus respuestas se leen con index-only scans: el
+-- GROUP BY question_id, answer_value no toca el heap de answers.
+-- ===================================================
+CREATE INDEX IF NOT EXISTS idx_evaluations_survey_status ON evaluations(survey_id, status, completed_at);
+
+CREATE INDEX IF NOT EXISTS idx_answers_evaluation_value ON answers(evaluation_id) INCLUDE (question_id, answer_value);
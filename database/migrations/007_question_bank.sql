@@ -0,0 +1,59 @@
+-- ===================================================
+-- Banco de preguntas
+-- Cada texto de pregunta distinto (normalizado: NFKC, minúsculas, espacios
+-- colapsados, sin signos al inicio ni al final) se guarda una sola vez. Las
+-- filas de questions apuntan a su entrada del banco, asignada por trigger en
+-- todos los caminos de escritura (INSERT ... SELECT incluidos).
+-- ===================================================
+CREATE OR REPLACE FUNCTION normalize_question_text(t TEXT)
+RETURNS TEXT
+LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+    SELECT regexp_replace(
+        regexp_replace(lower(normalize(t, NFKC)), '[[:space:]]+', ' ', 'g'),
+        '^[[:space:][:punct:]¿¡]+|[[:space:][:punct:]¿¡]+$', '', 'g'
+    )
+$$;
+
+CREATE TABLE IF NOT EXISTS question_bank (
+    id UUID DEFAULT uuid_generate_v4() PRIMARY KEY,
+    question_text TEXT NOT NULL,
+    text_hash CHAR(32) GENERATED ALWAYS AS (md5(normalize_question_text(question_text))) STORED,
+    search_vector TSVECTOR GENERATED ALWAYS AS (to_tsvector('spanish', question_text)) STORED,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_question_bank_text_hash ON question_bank(text_hash);
+CREATE INDEX IF NOT EXISTS idx_question_bank_search ON question_bank USING GIN (search_vector);
+
+ALTER TABLE questions ADD COLUMN IF NOT EXISTS bank_id UUID REFERENCES question_bank(id);
+CREATE INDEX IF NOT EXISTS idx_questions_bank ON questions(bank_id);
+
+-- Preguntas existentes: la redacción más antigua queda como texto del banco
+INSERT INTO question_bank (question_text)
+SELECT DISTINCT ON (md5(normalize_question_text(question_text))) question_text
+FROM questions
+ORDER BY md5(normalize_question_text(question_text)), created_at
+ON CONFLICT (text_hash) DO NOTHING;
+
+UPDATE questions q SET bank_id = b.id
+FROM question_bank b
+WHERE q.bank_id IS NULL AND b.text_hash = md5(normalize_question_text(q.question_text));
+
+CREATE OR REPLACE FUNCTION link_question_bank()
+RETURNS TRIGGER AS $$
+DECLARE
+    key CHAR(32) := md5(normalize_question_text(NEW.question_text));
+BEGIN
+    SELECT id INTO NEW.bank_id FROM question_bank WHERE text_hash = key;
+    IF NEW.bank_id IS NULL THEN
+        INSERT INTO question_bank (question_text) VALUES (NEW.question_text)
+        ON CONFLICT (text_hash) DO NOTHING;
+        SELECT id INTO NEW.bank_id FROM question_bank WHERE text_hash = key;
+    END IF;
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS questions_link_bank ON questions;
+CREATE TRIGGER questions_link_bank BEFORE INSERT OR UPDATE OF question_text ON questions
+    FOR EACH ROW EXECUTE FUNCTION link_question_bank();
@@ -0,0 +1,66 @@
+-- ===================================================
+-- Rollups de calificaciones por evaluado, ciclo y encuesta
+-- Se actualizan de forma incremental al completar cada evaluación; la
+-- tendencia histórica de un maestro lee solo estas tablas (una fila por
+-- ciclo y encuesta, y por pregunta del banco), nunca evaluations ni answers.
+-- ===================================================
+
+-- Ciclo escolar semestral de una fecha: "2026-1" (enero-junio), "2026-2"
+-- (julio-diciembre). Debe coincidir con app/core/cycles.py
+CREATE OR REPLACE FUNCTION evaluation_cycle(moment TIMESTAMP)
+RETURNS VARCHAR
+LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+    SELECT extract(year FROM moment)::int || '-' || CASE WHEN extract(month FROM moment) <= 6 THEN 1 ELSE 2 END
+$$;
+
+CREATE TABLE IF NOT EXISTS score_rollups (
+    evaluatee_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    cycle VARCHAR(7) NOT NULL,
+    survey_id UUID NOT NULL REFERENCES surveys(id) ON DELETE CASCADE,
+    evaluation_count INTEGER NOT NULL DEFAULT 0,
+    -- Solo evaluaciones con total_score (alguna respuesta de escala)
+    score_count INTEGER NOT NULL DEFAULT 0,
+    score_sum NUMERIC(14,2) NOT NULL DEFAULT 0,
+    score_sq_sum NUMERIC(18,4) NOT NULL DEFAULT 0,
+    min_score DECIMAL(5,2),
+    max_score DECIMAL(5,2),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (evaluatee_id, cycle, survey_id)
+);
+
+CREATE TABLE IF NOT EXISTS question_score_rollups (
+    evaluatee_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    cycle VARCHAR(7) NOT NULL,
+    survey_id UUID NOT NULL REFERENCES surveys(id) ON DELETE CASCADE,
+    -- Por entrada del banco: la misma pregunta en encuestas duplicadas por
+    -- ciclo o editada (copy-on-write) cae en la misma serie
+    bank_id UUID NOT NULL REFERENCES question_bank(id),
+    answer_count INTEGER NOT NULL DEFAULT 0,
+    answer_sum BIGINT NOT NULL DEFAULT 0,
+    answer_sq_sum BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (evaluatee_id, cycle, survey_id, bank_id)
+);
+
+-- Historial existente
+INSERT INTO score_rollups (evaluatee_id, cycle, survey_id, evaluation_count, score_count,
+                           score_sum, score_sq_sum, min_score, max_score)
+SELECT evaluatee_id, evaluation_cycle(completed_at), survey_id, count(*), count(total_score),
+       COALESCE(sum(total_score), 0), COALESCE(sum(total_score * total_score), 0),
+       min(total_score), max(total_score)
+FROM evaluations
+WHERE status = 'completed' AND evaluatee_id IS NOT NULL AND survey_id IS NOT NULL AND completed_at IS NOT NULL
+GROUP BY evaluatee_id, evaluation_cycle(completed_at), survey_id
+ON CONFLICT DO NOTHING;
+
+INSERT INTO question_score_rollups (evaluatee_id, cycle, survey_id, bank_id,
+                                    answer_count, answer_sum, answer_sq_sum)
+SELECT e.evaluatee_id, evaluation_cycle(e.completed_at), e.survey_id, q.bank_id,
+       count(*), sum(a.answer_value), sum(a.answer_value * a.answer_value)
+FROM answers a
+JOIN evaluations e ON e.id = a.evaluation_id
+JOIN questions q ON q.id = a.question_id
+WHERE e.status = 'completed' AND e.evaluatee_id IS NOT NULL AND e.survey_id IS NOT NULL
+  AND e.completed_at IS NOT NULL AND q.bank_id IS NOT NULL
+  AND a.answer_value BETWEEN 1 AND 10
+GROUP BY e.evaluatee_id, evaluation_cycle(e.completed_at), e.survey_id, q.bank_id
+ON CONFLICT DO NOTHING;
@@ -0,0 +1,19 @@
+-- ===================================================
+-- users.updated_at no cambia con un login
+-- El flush de last_login (UPDATE de solo esa columna) disparaba
+-- update_users_updated_at y cambiaba updated_at, que es parte de los ETags de
+-- la lista y el detalle de usuarios. La marca solo avanza si cambió alguna
+-- columna además de last_login.
+-- ===================================================
+CREATE OR REPLACE FUNCTION update_users_updated_at_column()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF to_jsonb(NEW) - 'last_login' - 'updated_at' IS DISTINCT FROM to_jsonb(OLD) - 'last_login' - 'updated_at' THEN
+        NEW.updated_at = CURRENT_TIMESTAMP;
+    END IF;
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS update_users_updated_at ON users;
+CREATE TRIGGER update_users_updated_at BEFORE UPDATE ON users FOR EACH ROW EXECUTE FUNCTION update_users_updated_at_column();